@@ -257,7 +257,8 @@ class TTS(nn.Module):
                 supported by `XTTS` model.
             speaker_wav (str, optional):
                 Path to a reference wav file to use for voice cloning with supporting models like YourTTS.
-                Defaults to None.
+                XTTS caches the conditioning latents of the reference files, so later calls with the same files
+                skip computing them. Defaults to None.
             emotion (str, optional):
                 Emotion to use for 🐸Coqui Studio models. If None, Studio models use "Neutral". Defaults to None.
             speed (float, optional):
@@ -0,0 +1,59 @@
+"""Measure the decoding speed of the Bark GPT models"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.tts.layers.bark.model import GPT, GPTConfig
+
+
+def generate(model, idx, num_tokens, static_cache):
+    """Greedy decoding with the concatenated or the static KV cache."""
+    kv_cache = model.new_kv_cache(batch_size=idx.shape[0]) if static_cache else None
+    logits, kv_cache = model(idx, merge_context=True, use_cache=True, past_kv=kv_cache)
+    for _ in range(num_tokens - 1):
+        logits, kv_cache = model(logits.argmax(-1), use_cache=True, past_kv=kv_cache)
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Measure the decoding speed in tokens per second of a Bark GPT model with the concatenated and the static KV caches.\n\n"""
+        """The model has random weights and the shape of the semantic model by default, the prompt is a merged text and history context as in `generate_text_semantic()`.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_bark.py --num_tokens 256
+    python TTS/bin/benchmark_bark.py --n_layer 24 --n_embd 1024 --n_head 16 --use_cuda
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--num_tokens", type=int, help="Number of generated tokens.", default=256)
+    parser.add_argument("--batch_size", type=int, help="Number of generated sequences.", default=1)
+    parser.add_argument("--n_layer", type=int, help="Number of layers of the model.", default=12)
+    parser.add_argument("--n_head", type=int, help="Number of attention heads of the model.", default=12)
+    parser.add_argument("--n_embd", type=int, help="Embedding dimension of the model.", default=768)
+    parser.add_argument("--use_cuda", action="store_true", help="Run the model on GPU.")
+    args = parser.parse_args()
+
+    config = GPTConfig(n_layer=args.n_layer, n_head=args.n_head, n_embd=args.n_embd)
+    model = GPT(config).eval()
+    if args.use_cuda:
+        model.cuda()
+    device = next(model.parameters()).device
+    idx = torch.randint(0, config.input_vocab_size, (args.batch_size, 256 + 256 + 1), device=device)
+
+    with torch.inference_mode():
+        generate(model, idx, 2, static_cache=True)  # warm up
+        for static_cache in [False, True]:
+            start = time.time()
+            generate(model, idx, args.num_tokens, static_cache)
+            if args.use_cuda:
+                torch.cuda.synchronize()
+            tokens_per_second = args.num_tokens * args.batch_size / (time.time() - start)
+            print(f" > static cache: {static_cache} -- tokens/sec: {tokens_per_second:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the resident libespeak-ng backend with the espeak-ng command line"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+from TTS.tts.utils.text.phonemizers import ESpeak
+from TTS.tts.utils.text.phonemizers.espeak_wrapper import get_espeak_library
+
+DEFAULT_SENTENCES = [
+    "Printing, in the only sense with which we are at present concerned, differs from most if not from all the arts.",
+    "Hello, how are you?",
+    "The quick brown fox jumps over the lazy dog; it costs 1,234.5 dollars.",
+    "Yes.",
+]
+
+
+def run(phonemizer, texts):
+    start = time.time()
+    outputs = [phonemizer.phonemize(text, separator="|") for text in texts]
+    return outputs, time.time() - start
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Phonemize the same sentences with the resident libespeak-ng backend and the espeak-ng command line.\n\n"""
+        """Checks that both backends return the same phonemes and prints the time per sentence.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_espeak.py --language en-us
+    python TTS/bin/benchmark_espeak.py --language en-us --text_file metadata.txt --num_sentences 500
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--language", type=str, help="espeak-ng voice to use.", default="en-us")
+    parser.add_argument(
+        "--text_file", type=str, help="File with one sentence per line. Defaults to a few example sentences."
+    )
+    parser.add_argument("--num_sentences", type=int, help="Maximum number of sentences to use.", default=200)
+    parser.add_argument("--repeats", type=int, help="Number of times each backend phonemizes the sentences.", default=3)
+    args = parser.parse_args()
+
+    if get_espeak_library() is None:
+        raise RuntimeError(" [!] libespeak-ng not found. Set `ESPEAK_NG_LIBRARY` to the path of the shared library.")
+
+    if args.text_file is not None:
+        with open(args.text_file, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = DEFAULT_SENTENCES
+    texts = texts[: args.num_sentences]
+    print(f" > Number of sentences: {len(texts)}")
+
+    library_phonemizer = ESpeak(args.language, backend="espeak-ng", use_library=True)
+    command_phonemizer = ESpeak(args.language, backend="espeak-ng", use_library=False)
+    # load the voice before timing
+    library_phonemizer.phonemize(texts[0])
+
+    library_time = command_time = 0
+    for _ in range(args.repeats):
+        library_outputs, duration = run(library_phonemizer, texts)
+        library_time += duration
+        command_outputs, duration = run(command_phonemizer, texts)
+        command_time += duration
+
+    mismatches = [(text, a, b) for text, a, b in zip(texts, library_outputs, command_outputs) if a != b]
+    for text, library_output, command_output in mismatches:
+        print(f" [!] Mismatch for {text!r}:\n    library: {library_output}\n    command: {command_output}")
+    print(f" > Mismatches: {len(mismatches)}/{len(texts)}")
+
+    num_calls = len(texts) * args.repeats
+    print(f" > libespeak-ng: {library_time / num_calls * 1000:.2f} ms per sentence")
+    print(f" > espeak-ng command line: {command_time / num_calls * 1000:.2f} ms per sentence")
+    print(f" > Speedup: {command_time / library_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
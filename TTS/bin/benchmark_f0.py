@@ -0,0 +1,64 @@
+"""Compare the pitch extractors of the AudioProcessor with pYIN"""
+import argparse
+import glob
+import os
+import time
+from argparse import RawTextHelpFormatter
+
+import numpy as np
+
+from TTS.config import BaseAudioConfig, load_config
+from TTS.utils.audio import AudioProcessor
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compute the pitch of wav files with pYIN and the vectorized YIN and report the run times and how much they agree.\n\n"""
+        """The voicing agreement is the ratio of frames that both call voiced or unvoiced, the gross pitch error the ratio of the frames voiced by both that differ by more than 20%.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_f0.py --input_path tests/data/ljspeech/wavs/ --pitch_fmin 65
+    python TTS/bin/benchmark_f0.py --input_path /data/LJSpeech-1.1/wavs/ --config_path config.json --num_files 100
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--input_path", type=str, help="Directory of the wav files.", required=True)
+    parser.add_argument("--config_path", type=str, help="Model config with the audio parameters.", default=None)
+    parser.add_argument("--pitch_fmin", type=float, help="Override the minimum pitch of the config.", default=None)
+    parser.add_argument("--pitch_fmax", type=float, help="Override the maximum pitch of the config.", default=None)
+    parser.add_argument("--num_files", type=int, help="Maximum number of wav files.", default=20)
+    parser.add_argument("--batch_size", type=int, help="Number of wav files processed together by YIN.", default=8)
+    args = parser.parse_args()
+
+    audio_config = load_config(args.config_path).audio if args.config_path else BaseAudioConfig()
+    if args.pitch_fmin is not None:
+        audio_config.pitch_fmin = args.pitch_fmin
+    if args.pitch_fmax is not None:
+        audio_config.pitch_fmax = args.pitch_fmax
+    ap = AudioProcessor(**audio_config, verbose=False)
+    wav_files = sorted(glob.glob(os.path.join(args.input_path, "**", "*.wav"), recursive=True))[: args.num_files]
+    wavs = [ap.load_wav(wav_file) for wav_file in wav_files]
+
+    f0s = {}
+    for pitch_extractor in ["pyin", "yin"]:
+        ap.pitch_extractor = pitch_extractor
+        start = time.time()
+        f0s[pitch_extractor] = []
+        for idx in range(0, len(wavs), args.batch_size):
+            f0s[pitch_extractor] += ap.compute_f0_batch(wavs[idx : idx + args.batch_size])
+        print(f" > {pitch_extractor}: {(time.time() - start) / len(wavs) * 1000:.1f} ms per file")
+
+    reference, f0 = np.concatenate(f0s["pyin"]), np.concatenate(f0s["yin"])
+    voiced = (reference > 0) & (f0 > 0)
+    cents = 1200 * np.abs(np.log2(f0[voiced] / reference[voiced]))
+    print(f" > voicing agreement: {np.mean((reference > 0) == (f0 > 0)):.3f}")
+    print(f" > voiced by pyin only: {np.mean((reference > 0) & (f0 == 0)):.3f}")
+    print(f" > voiced by yin only: {np.mean((reference == 0) & (f0 > 0)):.3f}")
+    print(f" > gross pitch error: {np.mean(np.abs(f0[voiced] / reference[voiced] - 1) > 0.2):.3f}")
+    print(f" > median pitch difference: {np.median(cents):.1f} cents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare the run times of the monotonic alignment search implementations"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.tts.utils.helpers import CYTHON, maximum_path_cython, maximum_path_numpy, maximum_path_torch, sequence_mask
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compare the run times of the Cython, numpy and torch monotonic alignment search (MAS) implementations.\n\n"""
+        """The inputs are random batches of the given shapes with the lengths sampled between half and the full size.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_mas.py
+    python TTS/bin/benchmark_mas.py --shapes 32,150,800 --use_cuda
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--shapes",
+        type=str,
+        nargs="+",
+        help="Batch size, number of input tokens and number of spectrogram frames of each benchmark.",
+        default=["16,60,300", "32,100,500", "32,150,800", "64,200,1000"],
+    )
+    parser.add_argument("--num_runs", type=int, help="Number of runs of each benchmark.", default=5)
+    parser.add_argument("--use_cuda", action="store_true", help="Put the inputs on the GPU.")
+    args = parser.parse_args()
+
+    device = "cuda" if args.use_cuda else "cpu"
+    methods = {"numpy": maximum_path_numpy, "torch": maximum_path_torch}
+    if CYTHON:
+        methods["cython"] = maximum_path_cython
+
+    for shape in args.shapes:
+        batch_size, t_x, t_y = [int(s) for s in shape.split(",")]
+        x_lengths = torch.randint(t_x // 2, t_x + 1, (batch_size,))
+        y_lengths = torch.randint(t_y // 2, t_y + 1, (batch_size,))
+        x_lengths[0], y_lengths[0] = t_x, t_y
+        mask = sequence_mask(x_lengths).unsqueeze(2) * sequence_mask(y_lengths).unsqueeze(1)
+        mask = mask.float().to(device)
+        value = torch.randn(batch_size, t_x, t_y, device=device)
+        print(f"\n > batch size: {batch_size} -- input tokens: {t_x} -- frames: {t_y}")
+        for name, method in methods.items():
+            method(value, mask)  # warm up
+            if args.use_cuda:
+                torch.cuda.synchronize()
+            start = time.time()
+            for _ in range(args.num_runs):
+                method(value, mask)
+            if args.use_cuda:
+                torch.cuda.synchronize()
+            print(f" | > {name}: {(time.time() - start) / args.num_runs * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
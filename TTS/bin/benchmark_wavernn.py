@@ -0,0 +1,58 @@
+"""Measure the real-time factor of WaveRNN inference"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.config import load_config
+from TTS.vocoder.configs import WavernnConfig
+from TTS.vocoder.models.wavernn import Wavernn
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Measure the real-time factor (RTF) of WaveRNN inference for the batched and the int8 modes.\n\n"""
+        """RTF is the generation time divided by the duration of the generated audio, values below 1 are faster than real time.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_wavernn.py --seconds 5
+    python TTS/bin/benchmark_wavernn.py --config_path config.json --model_path model.pth --use_cuda
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--config_path", type=str, help="Path to the model config. Defaults to `WavernnConfig()`.")
+    parser.add_argument("--model_path", type=str, help="Path to the model checkpoint. Defaults to random weights.")
+    parser.add_argument("--seconds", type=float, help="Duration of the generated audio.", default=5.0)
+    parser.add_argument("--use_cuda", action="store_true", help="Run the model on GPU.")
+    parser.add_argument("--num_threads", type=int, help="Number of CPU threads. Defaults to the torch default.")
+    args = parser.parse_args()
+
+    if args.num_threads is not None:
+        torch.set_num_threads(args.num_threads)
+    config = load_config(args.config_path) if args.config_path is not None else WavernnConfig()
+    model = Wavernn.init_from_config(config)
+    if args.model_path is not None:
+        model.load_checkpoint(config, args.model_path, eval=True)
+    if args.use_cuda:
+        model.cuda()
+
+    num_frames = int(args.seconds * config.audio.sample_rate / config.audio.hop_length) + 1
+    mel = torch.rand(config.model_args.feat_dims, num_frames)
+    duration = (num_frames - 1) * config.audio.hop_length / config.audio.sample_rate
+    print(f" > Generating {duration:.2f} seconds of audio.")
+
+    for batched in [False, True]:
+        for int8 in [False, True] if not args.use_cuda else [False]:
+            # warm up with a few frames so that the TorchScript compile of the sampler is not timed
+            model.inference(mel[:, :10], batched=batched, int8=int8)
+            start = time.time()
+            model.inference(mel, batched=batched, int8=int8)
+            rtf = (time.time() - start) / duration
+            print(f"\n > batched: {batched} -- int8: {int8} -- RTF: {rtf:.3f}")
+
+
+if __name__ == "__main__":
+    main()
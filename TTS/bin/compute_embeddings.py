@@ -1,5 +1,6 @@
 import argparse
 import os
+import time
 from argparse import RawTextHelpFormatter
 
 import torch
@@ -8,10 +9,45 @@ from tqdm import tqdm
 from TTS.config import load_config
 from TTS.config.shared_configs import BaseDatasetConfig
 from TTS.tts.datasets import load_tts_samples
-from TTS.tts.utils.managers import save_file
+from TTS.tts.datasets.audio_index import get_audio_lengths
+from TTS.tts.utils.managers import load_clip_features, load_file, save_file
 from TTS.tts.utils.speakers import SpeakerManager
 
 
+class ClipFeatureDataset(torch.utils.data.Dataset):
+    """Decode the audio files and compute the encoder inputs in the data loader workers."""
+
+    def __init__(self, audio_files, ap, use_torch_spec):
+        self.audio_files = audio_files
+        self.ap = ap
+        self.use_torch_spec = use_torch_spec
+
+    def __len__(self):
+        return len(self.audio_files)
+
+    def __getitem__(self, idx):
+        return load_clip_features(self.ap, self.audio_files[idx], self.use_torch_spec)
+
+
+def get_length_buckets(samples, batch_size):
+    """Split the sample indices into batches of similar audio lengths, read from the audio headers or approximated
+    by the file sizes for the formats without a supported header."""
+    try:
+        lengths = get_audio_lengths(samples)
+    except Exception:  # pylint: disable=broad-except
+        lengths = [os.path.getsize(sample["audio_file"]) for sample in samples]
+    order = sorted(range(len(samples)), key=lambda idx: lengths[idx])
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def save_mapping(speaker_mapping, mapping_file_path):
+    """Save the embeddings through a temporary file so an interrupted run never leaves a partial file."""
+    root, ext = os.path.splitext(mapping_file_path)
+    tmp_file_path = f"{root}.{os.getpid()}.tmp{ext}"
+    save_file(speaker_mapping, tmp_file_path)
+    os.replace(tmp_file_path, mapping_file_path)
+
+
 def compute_embeddings(
     model_path,
     config_path,
@@ -26,6 +62,10 @@ def compute_embeddings(
     meta_file_val=None,
     disable_cuda=False,
     no_eval=False,
+    batch_size=32,
+    num_workers=0,
+    checkpoint_interval=0,
+    resume=False,
 ):
     use_cuda = torch.cuda.is_available() and not disable_cuda
 
@@ -57,15 +97,28 @@ def compute_embeddings(
 
     class_name_key = encoder_manager.encoder_config.class_name_key
 
+    if os.path.isdir(output_path):
+        mapping_file_path = os.path.join(output_path, "speakers.pth")
+    else:
+        mapping_file_path = output_path
+
+    if os.path.dirname(mapping_file_path) != "":
+        os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
+
     # compute speaker embeddings
     if old_speakers_file is not None and old_append:
         speaker_mapping = encoder_manager.embeddings
     else:
         speaker_mapping = {}
 
-    for fields in tqdm(samples):
+    if resume and os.path.isfile(mapping_file_path):
+        # continue from the last checkpoint of an interrupted run
+        speaker_mapping.update(load_file(mapping_file_path))
+        print(f" > Resuming from {len(speaker_mapping)} embeddings in {mapping_file_path}")
+
+    new_samples = {}
+    for fields in samples:
         class_name = fields[class_name_key]
-        audio_file = fields["audio_file"]
         embedding_key = fields["audio_unique_name"]
 
         # Only update the speaker name when the embedding is already in the old file.
@@ -75,27 +128,51 @@ def compute_embeddings(
 
         if old_speakers_file is not None and embedding_key in encoder_manager.clip_ids:
             # get the embedding from the old file
-            embedd = encoder_manager.get_embedding_by_clip(embedding_key)
+            speaker_mapping[embedding_key] = {
+                "name": class_name,
+                "embedding": encoder_manager.get_embedding_by_clip(embedding_key),
+            }
         else:
-            # extract the embedding
-            embedd = encoder_manager.compute_embedding_from_clip(audio_file)
+            new_samples[embedding_key] = fields
 
-        # create speaker_mapping if target dataset is defined
-        speaker_mapping[embedding_key] = {}
-        speaker_mapping[embedding_key]["name"] = class_name
-        speaker_mapping[embedding_key]["embedding"] = embedd
+    if new_samples:
+        new_samples = list(new_samples.values())
+        # extract the embeddings of clips with similar lengths in batches
+        dataset = ClipFeatureDataset(
+            [fields["audio_file"] for fields in new_samples],
+            encoder_manager.encoder_ap,
+            encoder_manager.encoder_config.model_params.get("use_torch_spec", False),
+        )
+        loader = torch.utils.data.DataLoader(
+            dataset,
+            batch_sampler=get_length_buckets(new_samples, batch_size),
+            collate_fn=list,
+            num_workers=num_workers,
+        )
+        num_done = 0
+        next_checkpoint = checkpoint_interval
+        start = time.time()
+        pbar = tqdm(total=len(new_samples), unit="clip")
+        for idxs, feats in zip(loader.batch_sampler, loader):
+            if use_cuda:
+                feats = [feat.cuda() for feat in feats]
+            embeddings = encoder_manager.encoder.compute_embedding_batch([feat.unsqueeze(0) for feat in feats])
+            for idx, embedding in zip(idxs, embeddings.tolist()):
+                fields = new_samples[idx]
+                speaker_mapping[fields["audio_unique_name"]] = {"name": fields[class_name_key], "embedding": embedding}
+            num_done += len(idxs)
+            pbar.update(len(idxs))
+            if 0 < next_checkpoint <= num_done:
+                # save the embeddings computed so far to resume an interrupted run from them
+                save_mapping(speaker_mapping, mapping_file_path)
+                next_checkpoint = (num_done // checkpoint_interval + 1) * checkpoint_interval
+        pbar.close()
+        elapsed = time.time() - start
+        print(f" > Computed {num_done} embeddings in {elapsed:.1f}s -- clips/sec: {num_done / max(elapsed, 1e-6):.1f}")
 
     if speaker_mapping:
         # save speaker_mapping if target dataset is defined
-        if os.path.isdir(output_path):
-            mapping_file_path = os.path.join(output_path, "speakers.pth")
-        else:
-            mapping_file_path = output_path
-
-        if os.path.dirname(mapping_file_path) != "":
-            os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
-
-        save_file(speaker_mapping, mapping_file_path)
+        save_mapping(speaker_mapping, mapping_file_path)
         print("Speaker embeddings saved at:", mapping_file_path)
 
 
@@ -107,6 +184,8 @@ if __name__ == "__main__":
         python TTS/bin/compute_embeddings.py --model_path speaker_encoder_model.pth --config_path speaker_encoder_config.json  --config_dataset_path dataset_config.json
 
         python TTS/bin/compute_embeddings.py --model_path speaker_encoder_model.pth --config_path speaker_encoder_config.json  --formatter_name coqui --dataset_path /path/to/vctk/dataset --dataset_name my_vctk --meta_file_train /path/to/vctk/metafile_train.csv --meta_file_val /path/to/vctk/metafile_eval.csv
+
+        python TTS/bin/compute_embeddings.py --model_path speaker_encoder_model.pth --config_path speaker_encoder_config.json  --config_dataset_path dataset_config.json --num_workers 8 --batch_size 64 --checkpoint_interval 10000 --resume
         """,
         formatter_class=RawTextHelpFormatter,
     )
@@ -178,6 +257,30 @@ if __name__ == "__main__":
         help="Path to the evaluation meta file. If not set, dataset formatter uses the default metafile if it is defined in the formatter. You either need to provide this or `config_dataset_path`",
         default=None,
     )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        help="Number of clips of similar lengths whose embeddings are computed in a single model batch. Defaults to 32.",
+        default=32,
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        help="Number of data loader workers decoding the audio files and computing the features. Defaults to 0.",
+        default=0,
+    )
+    parser.add_argument(
+        "--checkpoint_interval",
+        type=int,
+        help="Save the embeddings computed so far to the output file every this many clips. Defaults to 0, only at the end.",
+        default=0,
+    )
+    parser.add_argument(
+        "--resume",
+        help="Load the embeddings already saved in the output file and only compute the missing ones. Default False",
+        default=False,
+        action="store_true",
+    )
     args = parser.parse_args()
 
     compute_embeddings(
@@ -194,4 +297,8 @@ if __name__ == "__main__":
         meta_file_val=args.meta_file_val,
         disable_cuda=args.disable_cuda,
         no_eval=args.no_eval,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        checkpoint_interval=args.checkpoint_interval,
+        resume=args.resume,
     )
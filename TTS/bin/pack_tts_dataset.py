@@ -0,0 +1,56 @@
+"""Pack the samples of the datasets of a TTS config into memory-mappable shard files"""
+import argparse
+from argparse import RawTextHelpFormatter
+
+from TTS.config import load_config
+from TTS.tts.datasets import TTSDataset, load_tts_samples, pack_tts_dataset
+from TTS.tts.utils.text.tokenizer import TTSTokenizer
+from TTS.utils.audio import AudioProcessor
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Pack the waveforms, token ids, pitch, energy and alignments of the training and evaluation samples of the datasets in a config.\n\n"""
+        """Set `packed_dataset_path` in the config to train from the pack.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/pack_tts_dataset.py --config_path config.json --output_path /data/ljspeech_pack/
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--config_path", type=str, help="Path to the model config.", required=True)
+    parser.add_argument("--output_path", type=str, help="Directory of the pack.", required=True)
+    parser.add_argument("--shard_size", type=int, help="Size of the shard files in MB.", default=1024)
+    parser.add_argument(
+        "--num_workers", type=int, help="Number of workers to precompute the phonemes, pitch and energy.", default=0
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config_path)
+    train_samples, eval_samples = load_tts_samples(
+        config.datasets,
+        eval_split=True,
+        eval_split_max_size=config.eval_split_max_size,
+        eval_split_size=config.eval_split_size,
+    )
+    ap = AudioProcessor.init_from_config(config)
+    tokenizer, config = TTSTokenizer.init_from_config(config)
+    dataset = TTSDataset(
+        ap=ap,
+        samples=train_samples + eval_samples,
+        tokenizer=tokenizer,
+        compute_f0=config.get("compute_f0", False),
+        f0_cache_path=config.get("f0_cache_path", None),
+        compute_energy=config.get("compute_energy", False),
+        energy_cache_path=config.get("energy_cache_path", None),
+        phoneme_cache_path=config.phoneme_cache_path,
+        precompute_num_workers=args.num_workers,
+    )
+    index = pack_tts_dataset(dataset, args.output_path, shard_size=args.shard_size * 2**20)
+    print(f" > Packed {len(index['samples'])} samples into {len(index['shards'])} shards.")
+
+
+if __name__ == "__main__":
+    main()
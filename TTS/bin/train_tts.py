@@ -49,6 +49,8 @@ def main():
         eval_split=True,
         eval_split_max_size=config.eval_split_max_size,
         eval_split_size=config.eval_split_size,
+        num_workers=config.get("precompute_num_workers", 0),
+        cache_path=config.get("samples_cache_path", None),
     )
 
     # init the model from config
@@ -64,6 +64,10 @@ class BaseAudioConfig(Coqpit):
         pitch_fmin (float, optional):
             Minimum frequency of the F0 frames. Defaults to ```1```.
 
+        pitch_extractor (str, optional):
+            Algorithm computing the F0 frames. ```pyin``` for librosa's pYIN or ```yin``` for a much faster vectorized
+            YIN without Viterbi smoothing. Defaults to ```pyin```.
+
         trim_db (int):
             Silence threshold used for silence trimming. Defaults to 45.
 
@@ -80,6 +84,13 @@ class BaseAudioConfig(Coqpit):
         griffin_lim_iters (int):
             Number of Griffing Lim iterations. Defaults to 60.
 
+        griffin_lim_backend (str):
+            Griffin Lim implementation, `numpy` for the original algorithm or `torch` for the batched fast Griffin Lim
+            algorithm with momentum that reaches a similar quality in a fraction of the iterations. Defaults to `numpy`.
+
+        griffin_lim_momentum (float):
+            Momentum of the `torch` Griffin Lim updates. Defaults to 0.99.
+
         num_mels (int):
             Number of mel-basis frames that defines the frame lengths of each mel-spectrogram frame. Defaults to 80.
 
@@ -135,6 +146,8 @@ class BaseAudioConfig(Coqpit):
     # griffin-lim params
     power: float = 1.5
     griffin_lim_iters: int = 60
+    griffin_lim_backend: str = "numpy"
+    griffin_lim_momentum: float = 0.99
     # mel-spec params
     num_mels: int = 80
     mel_fmin: float = 0.0
@@ -145,6 +158,7 @@ class BaseAudioConfig(Coqpit):
     # f0 params
     pitch_fmax: float = 640.0
     pitch_fmin: float = 1.0
+    pitch_extractor: str = "pyin"
     # normalization params
     signal_norm: bool = True
     min_level_db: int = -100
@@ -64,12 +64,9 @@ class BaseEncoder(nn.Module):
     def inference(self, x, l2_norm=True):
         return self.forward(x, l2_norm)
 
-    @torch.no_grad()
-    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
-        """
-        Generate embeddings for a batch of utterances
-        x: 1xTxD
-        """
+    def get_eval_frames(self, x, num_frames=250, num_eval=10):
+        """Cut `num_eval` evenly spaced windows of `num_frames` frames from a single utterance `x` (1xTxD), or copies
+        of the whole utterance if it is shorter."""
         # map to the waveform size
         if self.use_torch_spec:
             num_frames = num_frames * self.audio_config["hop_length"]
@@ -87,14 +84,51 @@ class BaseEncoder(nn.Module):
             end_offset = int(offset + num_frames)
             frames = x[:, offset:end_offset]
             frames_batch.append(frames)
+        return torch.cat(frames_batch, dim=0)
 
-        frames_batch = torch.cat(frames_batch, dim=0)
+    @torch.no_grad()
+    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+        """
+        Generate embeddings for a batch of utterances
+        x: 1xTxD
+        """
+        frames_batch = self.get_eval_frames(x, num_frames=num_frames, num_eval=num_eval)
         embeddings = self.inference(frames_batch, l2_norm=l2_norm)
 
         if return_mean:
             embeddings = torch.mean(embeddings, dim=0, keepdim=True)
         return embeddings
 
+    @torch.no_grad()
+    def compute_embedding_batch(self, xs, num_frames=250, num_eval=10, l2_norm=True):
+        """Compute the mean embeddings of several utterances as `compute_embedding()` does for each of them.
+
+        The evaluation windows of all the utterances that have the same shape, e.g. all the utterances longer than
+        `num_frames`, go through the model in a single batch. Sort the utterances by length to get fewer and larger
+        batches.
+
+        Args:
+            xs (List[torch.Tensor]): utterances of shape 1xTxD.
+            num_frames (int): number of frames of each window. Defaults to 250.
+            num_eval (int): number of windows of each utterance. Defaults to 10.
+            l2_norm (bool): normalize the embeddings of the windows. Defaults to True.
+
+        Returns:
+            torch.Tensor: embeddings of shape BxC in the order of `xs`.
+        """
+        groups = {}
+        for idx, x in enumerate(xs):
+            frames = self.get_eval_frames(x, num_frames=num_frames, num_eval=num_eval)
+            groups.setdefault(tuple(frames.shape[1:]), []).append((idx, frames))
+
+        embeddings = [None] * len(xs)
+        for group in groups.values():
+            frames_batch = torch.cat([frames for _, frames in group], dim=0)
+            group_embeddings = self.inference(frames_batch, l2_norm=l2_norm).view(len(group), num_eval, -1)
+            for (idx, _), embedding in zip(group, torch.mean(group_embeddings, dim=1)):
+                embeddings[idx] = embedding
+        return torch.stack(embeddings)
+
     def get_criterion(self, c: Coqpit, num_classes=None):
         if c.loss == "ge2e":
             criterion = GE2ELoss(loss_method="softmax")
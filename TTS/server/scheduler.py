@@ -0,0 +1,246 @@
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Tuple
+
+import numpy as np
+
+# every worker thread (or process) owns its own model replica.
+_worker_state = threading.local()
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request is submitted while the scheduler queue is full."""
+
+
+@dataclass
+class RequestTiming:
+    """Timing of a single synthesis request.
+
+    Args:
+        submitted (float): wall clock time when the request entered the queue.
+        started (float): wall clock time when a worker picked the request up.
+        finished (float): wall clock time when the worker returned the waveform.
+    """
+
+    submitted: float
+    started: float
+    finished: float
+
+    @property
+    def queue_time(self) -> float:
+        return self.started - self.submitted
+
+    @property
+    def process_time(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def total_time(self) -> float:
+        return self.finished - self.submitted
+
+
+def _init_worker(synthesizer_factory: Callable) -> None:
+    _worker_state.synthesizer = synthesizer_factory()
+
+
+def _warmup(barrier: threading.Barrier = None) -> None:
+    if barrier is not None:
+        barrier.wait()
+
+
+def _run_tts(submitted: float, tts_kwargs: Dict):
+    started = time.time()
+    wav = _worker_state.synthesizer.tts(**tts_kwargs)
+    # a float32 array is much cheaper to send back from a worker process than a list of floats.
+    wav = np.asarray(wav, dtype=np.float32)
+    return wav, RequestTiming(submitted=submitted, started=started, finished=time.time())
+
+
+def _run_tts_stream(submitted: float, chunk_queue, tts_kwargs: Dict):
+    started = time.time()
+    try:
+        for chunk in _worker_state.synthesizer.tts_stream(**tts_kwargs):
+            chunk_queue.put(np.asarray(chunk, dtype=np.float32))
+    finally:
+        # `None` marks the end of the stream, also when the synthesis failed.
+        chunk_queue.put(None)
+    return None, RequestTiming(submitted=submitted, started=started, finished=time.time())
+
+
+def _iter_chunks(chunk_queue, future: Future) -> Iterator[np.ndarray]:
+    while True:
+        chunk = chunk_queue.get()
+        if chunk is None:
+            break
+        yield chunk
+    # re-raise the exception of a failed synthesis
+    future.result()
+
+
+class SynthesisScheduler:
+    """Queue incoming synthesis requests and run them on a pool of `Synthesizer` workers.
+
+    Each worker builds its own model replica by calling `synthesizer_factory` once, so requests are no longer
+    serialized behind a single model. Requests beyond `num_workers` wait in a bounded queue and once
+    `max_queue_size` requests are waiting, `submit()` raises `QueueFullError` so the caller can shed load.
+
+    All the workers and their replicas are created in the constructor. Worker processes are forked, so create the
+    scheduler before starting any server threads.
+
+    Args:
+        synthesizer_factory (Callable): callable returning a new `Synthesizer` instance.
+        num_workers (int, optional): number of concurrent workers. Defaults to 1.
+        max_queue_size (int, optional): maximum number of requests waiting for a free worker. Defaults to 16.
+        use_processes (bool, optional): run the workers in processes instead of threads. Defaults to False.
+        stats_window (int, optional): number of latest requests used for the timing statistics. Defaults to 100.
+    """
+
+    def __init__(
+        self,
+        synthesizer_factory: Callable,
+        num_workers: int = 1,
+        max_queue_size: int = 16,
+        use_processes: bool = False,
+        stats_window: int = 100,
+    ):
+        assert num_workers > 0, " [!] `num_workers` must be a positive integer."
+        assert max_queue_size >= 0, " [!] `max_queue_size` must be a non-negative integer."
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.use_processes = use_processes
+
+        self._lock = threading.Lock()
+        self._num_pending = 0
+        self._num_completed = 0
+        self._num_failed = 0
+        self._num_rejected = 0
+        self._timings = deque(maxlen=stats_window)
+        self._manager = None
+
+        if use_processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(synthesizer_factory,),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=num_workers,
+                thread_name_prefix="tts_worker",
+                initializer=_init_worker,
+                initargs=(synthesizer_factory,),
+            )
+        self._start_workers()
+
+    def _start_workers(self) -> None:
+        """Start all the workers now instead of on demand, so no request waits for a replica to load."""
+        # threads are only spawned while all the others are busy, so hold them at a barrier.
+        barrier = None if self.use_processes else threading.Barrier(self.num_workers)
+        for future in [self._executor.submit(_warmup, barrier) for _ in range(self.num_workers)]:
+            future.result()
+
+    @property
+    def num_pending(self) -> int:
+        """Number of requests either waiting in the queue or being synthesized."""
+        return self._num_pending
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a free worker."""
+        return max(0, self._num_pending - self.num_workers)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._num_pending >= self.num_workers + self.max_queue_size:
+                self._num_rejected += 1
+                raise QueueFullError(f" [!] Synthesis queue is full ({self.max_queue_size} requests waiting).")
+            self._num_pending += 1
+        try:
+            future = self._executor.submit(fn, time.time(), *args)
+        except BaseException:
+            with self._lock:
+                self._num_pending -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def submit(self, **tts_kwargs) -> Future:
+        """Queue a request. The keyword arguments are passed to `Synthesizer.tts()`.
+
+        Returns:
+            Future: resolves to a tuple of the waveform as `np.ndarray` and its `RequestTiming`.
+
+        Raises:
+            QueueFullError: if `max_queue_size` requests are already waiting.
+        """
+        return self._submit(_run_tts, tts_kwargs)
+
+    def submit_stream(self, **tts_kwargs) -> Tuple[Iterator[np.ndarray], Future]:
+        """Queue a streaming request. The keyword arguments are passed to `Synthesizer.tts_stream()`.
+
+        The worker hands over each chunk as soon as it is synthesized, so the caller can send the first sentence
+        while the next ones are still being synthesized.
+
+        Returns:
+            Tuple[Iterator[np.ndarray], Future]: iterator over the waveform chunks and a future resolving to a tuple
+            of `None` and the `RequestTiming` of the request. The iterator raises the exception of a failed request.
+
+        Raises:
+            QueueFullError: if `max_queue_size` requests are already waiting.
+        """
+        if self.use_processes:
+            with self._lock:
+                if self._manager is None:
+                    self._manager = multiprocessing.Manager()
+            chunk_queue = self._manager.Queue()
+        else:
+            chunk_queue = queue.Queue()
+        future = self._submit(_run_tts_stream, chunk_queue, tts_kwargs)
+        return _iter_chunks(chunk_queue, future), future
+
+    def tts(self, **tts_kwargs):
+        """Queue a request and block until it is synthesized.
+
+        Returns:
+            Tuple[np.ndarray, RequestTiming]: waveform and timing of the request.
+        """
+        return self.submit(**tts_kwargs).result()
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._num_pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._num_failed += 1
+            else:
+                self._num_completed += 1
+                self._timings.append(future.result()[1])
+
+    def stats(self) -> Dict:
+        """Return the current queue state and the average timing of the latest requests."""
+        with self._lock:
+            timings = list(self._timings)
+            stats = {
+                "num_workers": self.num_workers,
+                "max_queue_size": self.max_queue_size,
+                "pending": self._num_pending,
+                "queue_depth": max(0, self._num_pending - self.num_workers),
+                "completed": self._num_completed,
+                "failed": self._num_failed,
+                "rejected": self._num_rejected,
+            }
+        for name in ["queue_time", "process_time", "total_time"]:
+            values = [getattr(timing, name) for timing in timings]
+            stats[f"avg_{name}"] = sum(values) / len(values) if values else None
+            stats[f"max_{name}"] = max(values) if values else None
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        if self._manager is not None:
+            self._manager.shutdown()
@@ -3,15 +3,27 @@ import argparse
 import io
 import json
 import os
+import struct
 import sys
+from functools import partial
 from pathlib import Path
-from threading import Lock
 from typing import Union
 from urllib.parse import parse_qs
 
-from flask import Flask, render_template, render_template_string, request, send_file
+import numpy as np
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    render_template,
+    render_template_string,
+    request,
+    send_file,
+    stream_with_context,
+)
 
 from TTS.config import load_config
+from TTS.server.scheduler import QueueFullError, SynthesisScheduler
 from TTS.utils.manage import ModelManager
 from TTS.utils.synthesizer import Synthesizer
 
@@ -57,6 +69,36 @@ def create_argparser():
     parser.add_argument("--use_cuda", type=convert_boolean, default=False, help="true to use CUDA.")
     parser.add_argument("--debug", type=convert_boolean, default=False, help="true to enable Flask debug mode.")
     parser.add_argument("--show_details", type=convert_boolean, default=False, help="Generate model detail page.")
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Number of synthesis workers. Each worker loads its own copy of the models.",
+    )
+    parser.add_argument(
+        "--max_queue_size",
+        type=int,
+        default=16,
+        help="Maximum number of requests waiting for a free worker. Further requests are rejected with 429.",
+    )
+    parser.add_argument(
+        "--max_batch_size",
+        type=int,
+        default=1,
+        help="Maximum number of sentences synthesized in one batch. Thread workers then share one copy of the models.",
+    )
+    parser.add_argument(
+        "--batch_timeout",
+        type=float,
+        default=0.01,
+        help="Seconds to wait for sentences of concurrent requests before running a batch.",
+    )
+    parser.add_argument(
+        "--use_process_pool",
+        type=convert_boolean,
+        default=False,
+        help="true to run the synthesis workers in separate processes instead of threads.",
+    )
     return parser
 
 
@@ -101,16 +143,40 @@ if args.vocoder_path is not None:
     vocoder_config_path = args.vocoder_config_path
 
 # load models
-synthesizer = Synthesizer(
-    tts_checkpoint=model_path,
-    tts_config_path=config_path,
-    tts_speakers_file=speakers_file_path,
-    tts_languages_file=None,
-    vocoder_checkpoint=vocoder_path,
-    vocoder_config=vocoder_config_path,
-    encoder_checkpoint="",
-    encoder_config="",
-    use_cuda=args.use_cuda,
+synthesizer_kwargs = {
+    "tts_checkpoint": model_path,
+    "tts_config_path": config_path,
+    "tts_speakers_file": speakers_file_path,
+    "tts_languages_file": None,
+    "vocoder_checkpoint": vocoder_path,
+    "vocoder_config": vocoder_config_path,
+    "encoder_checkpoint": "",
+    "encoder_config": "",
+    "use_cuda": args.use_cuda,
+    "max_batch_size": args.max_batch_size,
+    "batch_timeout": args.batch_timeout,
+}
+synthesizer = Synthesizer(**synthesizer_kwargs)
+_free_replicas = [] if args.use_process_pool else [synthesizer]
+
+
+def create_synthesizer() -> Synthesizer:
+    """Build a model replica for a synthesis worker. The first thread worker reuses the models loaded above.
+
+    With batching, all the thread workers share these models so that their sentences are batched together.
+    """
+    if args.max_batch_size > 1:
+        return synthesizer
+    if _free_replicas:
+        return _free_replicas.pop()
+    return Synthesizer(**synthesizer_kwargs)
+
+
+scheduler = SynthesisScheduler(
+    create_synthesizer if not args.use_process_pool else partial(Synthesizer, **synthesizer_kwargs),
+    num_workers=args.num_workers,
+    max_queue_size=args.max_queue_size,
+    use_processes=args.use_process_pool,
 )
 
 use_multi_speaker = hasattr(synthesizer.tts_model, "num_speakers") and (
@@ -185,25 +251,107 @@ def details():
     )
 
 
-lock = Lock()
+def queue_full_response(error: QueueFullError):
+    response = jsonify({"error": str(error), "queue_depth": scheduler.queue_depth})
+    response.status_code = 429
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+def wav_stream_header(sample_rate: int, num_channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """WAV header for a stream of unknown length. The RIFF and data chunk sizes are set to the maximum value, which
+    most players read as "until the end of the stream"."""
+    byte_rate = sample_rate * num_channels * bits_per_sample // 8
+    block_align = num_channels * bits_per_sample // 8
+    return (
+        b"RIFF"
+        + struct.pack("<I", 0xFFFFFFFF)
+        + b"WAVEfmt "
+        + struct.pack("<IHHIIHH", 16, 1, num_channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data"
+        + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def to_pcm16(wav: np.ndarray) -> bytes:
+    """Convert a float waveform to 16 bit PCM. Unlike `save_wav()` the peak of the whole waveform is not known while
+    streaming, so the chunk is clipped instead of normalized."""
+    return (np.clip(wav, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def synthesize_wav_response(**tts_kwargs):
+    """Run a request through the scheduler and return it as a wav file response.
+
+    Responds with 429 if the scheduler queue is full. The time the request waited in the queue and the
+    synthesis time are returned in the `X-Queue-Time` and `X-Process-Time` headers.
+    """
+    try:
+        wavs, timing = scheduler.tts(**tts_kwargs)
+    except QueueFullError as e:
+        return queue_full_response(e)
+    out = io.BytesIO()
+    synthesizer.save_wav(wavs, out)
+    response = send_file(out, mimetype="audio/wav")
+    response.headers["X-Queue-Time"] = f"{timing.queue_time:.3f}"
+    response.headers["X-Process-Time"] = f"{timing.process_time:.3f}"
+    return response
 
 
 @app.route("/api/tts", methods=["GET", "POST"])
 def tts():
-    with lock:
-        text = request.headers.get("text") or request.values.get("text", "")
-        speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
-        language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
-        style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
-        style_wav = style_wav_uri_to_dict(style_wav)
-
-        print(f" > Model input: {text}")
-        print(f" > Speaker Idx: {speaker_idx}")
-        print(f" > Language Idx: {language_idx}")
-        wavs = synthesizer.tts(text, speaker_name=speaker_idx, language_name=language_idx, style_wav=style_wav)
-        out = io.BytesIO()
-        synthesizer.save_wav(wavs, out)
-    return send_file(out, mimetype="audio/wav")
+    text = request.headers.get("text") or request.values.get("text", "")
+    speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
+    language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
+    style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
+    style_wav = style_wav_uri_to_dict(style_wav)
+
+    print(f" > Model input: {text}")
+    print(f" > Speaker Idx: {speaker_idx}")
+    print(f" > Language Idx: {language_idx}")
+    return synthesize_wav_response(text=text, speaker_name=speaker_idx, language_name=language_idx, style_wav=style_wav)
+
+
+@app.route("/api/tts-stream", methods=["GET", "POST"])
+def tts_stream():
+    """Stream the audio sentence by sentence with chunked transfer encoding, so playback can start as soon as the
+    first sentence is synthesized. XTTS models stream several chunks per sentence.
+
+    The `format` parameter selects a `wav` stream with an open-ended header (default) or headerless 16 bit mono
+    `pcm`. The sample rate is returned in the `X-Sample-Rate` header.
+    """
+    text = request.headers.get("text") or request.values.get("text", "")
+    speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
+    language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
+    audio_format = request.headers.get("format") or request.values.get("format", "wav")
+    if audio_format not in ["wav", "pcm"]:
+        return jsonify({"error": f" [!] Unknown audio format {audio_format}. Use `wav` or `pcm`."}), 400
+    if not text:
+        return jsonify({"error": " [!] `text` is not defined."}), 400
+
+    print(f" > Model input: {text}")
+    print(f" > Speaker Idx: {speaker_idx}")
+    print(f" > Language Idx: {language_idx}")
+    try:
+        chunks, _ = scheduler.submit_stream(text=text, speaker_name=speaker_idx, language_name=language_idx)
+    except QueueFullError as e:
+        return queue_full_response(e)
+
+    def generate():
+        if audio_format == "wav":
+            yield wav_stream_header(synthesizer.output_sample_rate)
+        for chunk in chunks:
+            yield to_pcm16(chunk)
+
+    mimetype = "audio/wav" if audio_format == "wav" else "audio/L16"
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers["X-Sample-Rate"] = str(synthesizer.output_sample_rate)
+    return response
+
+
+@app.route("/api/stats", methods=["GET"])
+def stats():
+    """Queue depth, request counters and timing of the latest requests."""
+    return jsonify(scheduler.stats())
 
 
 # Basic MaryTTS compatibility layer
@@ -236,22 +384,18 @@ def mary_tts_api_voices():
 @app.route("/process", methods=["GET", "POST"])
 def mary_tts_api_process():
     """MaryTTS-compatible /process endpoint"""
-    with lock:
-        if request.method == "POST":
-            data = parse_qs(request.get_data(as_text=True))
-            # NOTE: we ignore param. LOCALE and VOICE for now since we have only one active model
-            text = data.get("INPUT_TEXT", [""])[0]
-        else:
-            text = request.args.get("INPUT_TEXT", "")
-        print(f" > Model input: {text}")
-        wavs = synthesizer.tts(text)
-        out = io.BytesIO()
-        synthesizer.save_wav(wavs, out)
-    return send_file(out, mimetype="audio/wav")
+    if request.method == "POST":
+        data = parse_qs(request.get_data(as_text=True))
+        # NOTE: we ignore param. LOCALE and VOICE for now since we have only one active model
+        text = data.get("INPUT_TEXT", [""])[0]
+    else:
+        text = request.args.get("INPUT_TEXT", "")
+    print(f" > Model input: {text}")
+    return synthesize_wav_response(text=text)
 
 
 def main():
-    app.run(debug=args.debug, host="::", port=args.port)
+    app.run(debug=args.debug, host="::", port=args.port, threaded=True)
 
 
 if __name__ == "__main__":
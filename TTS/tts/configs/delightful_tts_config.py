@@ -52,7 +52,7 @@ class DelightfulTTSConfig(BaseTTSConfig):
         r (int): Value for the `r` override.
         compute_f0 (bool): Whether to compute F0 values.
         f0_cache_path (str): Path to the F0 cache.
-        attn_prior_cache_path (str): Path to the attention prior cache.
+        attn_prior_cache_path (str): Path to the attention prior cache. The priors are saved by the token and mel lengths.
         num_speakers (int): Number of speakers.
         use_speaker_embedding (bool): Whether to use speaker embedding.
         speakers_file (str): Path to the speaker file.
@@ -189,6 +189,14 @@ class BaseTTSConfig(BaseTrainingConfig):
         phoneme_cache_path (str):
             Path to the output folder caching the computed phonemes for each sample.
 
+        phonemizer_cache_size (int):
+            Number of phonemized text segments kept in an in-memory LRU cache, so repeated texts are phonemized once.
+            Set 0 to disable the cache. Defaults to 10000.
+
+        phonemizer_cache_path (str):
+            Path to an SQLite database persisting the phonemizer cache. It can be shared between processes. Defaults
+            to None.
+
         characters (CharactersConfig):
             Instance of a CharactersConfig class.
 
@@ -224,7 +232,26 @@ class BaseTTSConfig(BaseTrainingConfig):
             If True data loader computes and returns linear spectrograms alongside the other data.
 
         precompute_num_workers (int):
-            Number of workers to precompute features. Defaults to 0.
+            Number of workers to precompute features and to parse the metadata files of the datasets. Defaults to 0.
+
+        samples_cache_path (str):
+            Path to cache the samples parsed from the metadata files of the datasets, see `load_tts_samples()`.
+            Defaults to None.
+
+        packed_dataset_path (str):
+            Path to a dataset pack written by `TTS/bin/pack_tts_dataset.py`. If set, the data loader reads the
+            waveforms, token ids, pitch and energy of the samples from the pack instead of the audio files and the
+            feature caches. Only used by the models that load their data with `TTSDataset`, Vits, DelightfulTTS and
+            the XTTS GPT trainer raise an error if it is set. Defaults to None.
+
+        spectrogram_backend (str):
+            Where the spectrograms are computed. `numpy` computes them sample by sample in the data loader, `torch`
+            computes them for the whole batch with `BatchSpectrogram` in the data loader and `device` computes them
+            for the whole batch on the training device. Defaults to "numpy".
+
+        mel_cache_path (str):
+            Path to cache the melspectrograms of the samples. They are computed the first time a sample is loaded and
+            read from the cache afterwards, without noise augmentation. Defaults to None.
 
         use_noise_augment (bool):
             Augment the input audio with random noise.
@@ -303,6 +330,8 @@ class BaseTTSConfig(BaseTrainingConfig):
     enable_eos_bos_chars: bool = False
     test_sentences_file: str = ""
     phoneme_cache_path: str = None
+    phonemizer_cache_size: int = 10000
+    phonemizer_cache_path: str = None
     # vocabulary parameters
     characters: CharactersConfig = None
     add_blank: bool = False
@@ -318,6 +347,10 @@ class BaseTTSConfig(BaseTrainingConfig):
     compute_energy: bool = False
     compute_linear_spec: bool = False
     precompute_num_workers: int = 0
+    samples_cache_path: str = None
+    packed_dataset_path: str = None
+    spectrogram_backend: str = "numpy"
+    mel_cache_path: str = None
     use_noise_augment: bool = False
     start_by_longest: bool = False
     shuffle: bool = False
@@ -56,6 +56,14 @@ class XttsConfig(BaseTTSConfig):
         sound_norm_refs (bool):
             Whether to normalize the conditioning audio. Defaults to `False`.
 
+        latent_cache_size (int):
+            Number of conditioning latents of reference audios kept in memory, so requests cloning the same voice skip
+            computing them. Set to 0 to disable the cache. Defaults to `32`.
+
+        latent_cache_dir (str):
+            Directory to persist the cached conditioning latents to. Entries are only reused with the same checkpoint
+            file. Defaults to None.
+
     Note:
         Check :class:`TTS.tts.configs.shared_configs.BaseTTSConfig` for the inherited parameters.
 
@@ -105,3 +113,5 @@ class XttsConfig(BaseTTSConfig):
     gpt_cond_chunk_len: int = 4
     max_ref_len: int = 10
     sound_norm_refs: bool = False
+    latent_cache_size: int = 32
+    latent_cache_dir: str = None
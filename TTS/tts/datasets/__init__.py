@@ -1,6 +1,9 @@
+import hashlib
+import json
 import os
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Callable, Dict, List, Tuple, Union
 
@@ -8,6 +11,7 @@ import numpy as np
 
 from TTS.tts.datasets.dataset import *
 from TTS.tts.datasets.formatters import *
+from TTS.tts.datasets.packed_dataset import PackedTTSDataset, pack_tts_dataset
 
 
 def split_dataset(items, eval_split_max_size=None, eval_split_size=0.01):
@@ -67,12 +71,77 @@ def add_extra_keys(metadata, language, dataset_name):
     return metadata
 
 
+def load_metadata(
+    formatter: Callable, root_path: str, meta_file: str, ignored_speakers: List, language: str, dataset_name: str
+) -> List[Dict]:
+    """Parse a metadata file with a formatter and add the language and the unique audio names to its samples."""
+    metadata = formatter(root_path, meta_file, ignored_speakers=ignored_speakers)
+    return add_extra_keys(metadata, language, dataset_name)
+
+
+def _metadata_cache_file(cache_path: str, formatter: Callable, job: Tuple) -> str:
+    """Name the cache file of a metadata parse by the formatter, its arguments and the metadata file stats."""
+    root_path, meta_file = job[0], job[1]
+    settings = [f"{formatter.__module__}.{formatter.__qualname__}", os.path.abspath(root_path), *job[1:]]
+    meta_path = os.path.join(root_path, meta_file) if isinstance(meta_file, str) else None
+    if meta_path and os.path.isfile(meta_path):
+        stat = os.stat(meta_path)
+        settings += [stat.st_size, stat.st_mtime_ns]
+    key = hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return os.path.join(cache_path, f"samples_{key}.json")
+
+
+def _load_metadata_cache(cache_file: str) -> List[Dict]:
+    with open(cache_file, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    if "columns" not in cache:
+        return cache["samples"]
+    columns = cache["columns"]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def _save_metadata_cache(cache_file: str, samples: List[Dict]):
+    # store the samples column by column if they all have the same keys
+    keys = list(samples[0]) if samples else []
+    if all(list(item) == keys for item in samples):
+        cache = {"columns": {k: [item[k] for item in samples] for k in keys}}
+    else:
+        cache = {"samples": samples}
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    # write to a temporary file first so a concurrent process never reads a partial cache
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f, default=str)
+    os.replace(tmp_file, cache_file)
+
+
+def filter_missing_audio_files(samples: List[Dict]) -> List[Dict]:
+    """Drop the samples whose audio files do not exist. Every directory is listed once instead of checking every
+    file on its own."""
+    dir_files = {}
+    kept = []
+    missing = []
+    for item in samples:
+        dir_name, file_name = os.path.split(item["audio_file"])
+        if dir_name not in dir_files:
+            dir_files[dir_name] = set(os.listdir(dir_name)) if os.path.isdir(dir_name) else set()
+        (kept if file_name in dir_files[dir_name] else missing).append(item)
+    if missing:
+        print(
+            f" [!] {len(missing)} audio files are missing and their samples are skipped, e.g. {missing[0]['audio_file']}"
+        )
+    return kept
+
+
 def load_tts_samples(
     datasets: Union[List[Dict], Dict],
     eval_split=True,
     formatter: Callable = None,
     eval_split_max_size=None,
     eval_split_size=0.01,
+    num_workers: int = 0,
+    cache_path: str = None,
+    check_audio_files: bool = False,
 ) -> Tuple[List[List], List[List]]:
     """Parse the dataset from the datasets config, load the samples as a List and load the attention alignments if provided.
     If `formatter` is not None, apply the formatter to the samples else pick the formatter from the available ones based
@@ -97,6 +166,18 @@ def load_tts_samples(
             If between 0.0 and 1.0 represents the proportion of the dataset to include in the evaluation set.
             If > 1, represents the absolute number of evaluation samples. Defaults to 0.01 (1%).
 
+        num_workers (int):
+            Number of processes parsing the metadata files of the datasets concurrently. A custom `formatter` is
+            always run in the main process. Defaults to 0.
+
+        cache_path (str):
+            Directory to cache the parsed samples of each metadata file. The caches are keyed by the dataset config
+            and the size and modification time of the metadata file, so repeated runs skip the parsing. Defaults to
+            None.
+
+        check_audio_files (bool):
+            Skip the samples whose audio files do not exist. Defaults to False.
+
     Returns:
         Tuple[List[List], List[List]: training and evaluation splits of the dataset.
     """
@@ -104,30 +185,64 @@ def load_tts_samples(
     meta_data_eval_all = [] if eval_split else None
     if not isinstance(datasets, list):
         datasets = [datasets]
+
+    # collect the metadata files to parse, the custom formatter only applies to the first dataset
+    jobs = []
+    for idx, dataset in enumerate(datasets):
+        dataset_formatter = formatter if formatter is not None and idx == 0 else None
+        if dataset_formatter is None:
+            dataset_formatter = _get_formatter_by_name(dataset["formatter"])
+        meta_files = [dataset["meta_file_train"]]
+        if eval_split and dataset["meta_file_val"]:
+            meta_files.append(dataset["meta_file_val"])
+        for meta_file in meta_files:
+            args = (
+                dataset["path"],
+                meta_file,
+                dataset["ignored_speakers"],
+                dataset["language"],
+                dataset["dataset_name"],
+            )
+            jobs.append((dataset_formatter, args))
+
+    # load the cached samples and parse the other metadata files
+    metadata = [None] * len(jobs)
+    cache_files = [None] * len(jobs)
+    if cache_path is not None:
+        for idx, (job_formatter, args) in enumerate(jobs):
+            cache_files[idx] = _metadata_cache_file(cache_path, job_formatter, args)
+            if os.path.isfile(cache_files[idx]):
+                metadata[idx] = _load_metadata_cache(cache_files[idx])
+    missing = [idx for idx, samples in enumerate(metadata) if samples is None]
+    parallel = [idx for idx in missing if num_workers > 0 and jobs[idx][0] is not formatter]
+    if len(parallel) > 1:
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(parallel))) as executor:
+            futures = {idx: executor.submit(load_metadata, jobs[idx][0], *jobs[idx][1]) for idx in parallel}
+            for idx, future in futures.items():
+                metadata[idx] = future.result()
+    for idx in missing:
+        if metadata[idx] is None:
+            metadata[idx] = load_metadata(jobs[idx][0], *jobs[idx][1])
+        if cache_files[idx] is not None:
+            _save_metadata_cache(cache_files[idx], metadata[idx])
+    if check_audio_files:
+        metadata = [filter_missing_audio_files(samples) for samples in metadata]
+
+    metadata = iter(metadata)
     for dataset in datasets:
-        formatter_name = dataset["formatter"]
-        dataset_name = dataset["dataset_name"]
         root_path = dataset["path"]
         meta_file_train = dataset["meta_file_train"]
         meta_file_val = dataset["meta_file_val"]
-        ignored_speakers = dataset["ignored_speakers"]
-        language = dataset["language"]
 
-        # setup the right data processor
-        if formatter is None:
-            formatter = _get_formatter_by_name(formatter_name)
         # load train set
-        meta_data_train = formatter(root_path, meta_file_train, ignored_speakers=ignored_speakers)
+        meta_data_train = next(metadata)
         assert len(meta_data_train) > 0, f" [!] No training samples found in {root_path}/{meta_file_train}"
 
-        meta_data_train = add_extra_keys(meta_data_train, language, dataset_name)
-
         print(f" | > Found {len(meta_data_train)} files in {Path(root_path).resolve()}")
         # load evaluation split if set
         if eval_split:
             if meta_file_val:
-                meta_data_eval = formatter(root_path, meta_file_val, ignored_speakers=ignored_speakers)
-                meta_data_eval = add_extra_keys(meta_data_eval, language, dataset_name)
+                meta_data_eval = next(metadata)
             else:
                 eval_size_per_dataset = eval_split_max_size // len(datasets) if eval_split_max_size else None
                 meta_data_eval, meta_data_train = split_dataset(meta_data_train, eval_size_per_dataset, eval_split_size)
@@ -143,8 +258,6 @@ def load_tts_samples(
                 for idx, ins in enumerate(meta_data_eval_all):
                     attn_file = meta_data[ins["audio_file"]].strip()
                     meta_data_eval_all[idx].update({"alignment_file": attn_file})
-        # set none for the next iter
-        formatter = None
     return meta_data_train_all, meta_data_eval_all
 
 
@@ -0,0 +1,116 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import mutagen
+
+INDEX_FILE = ".tts_audio_index.json"
+INDEX_VERSION = 1
+# fields of an index entry after the file size and modification time
+HEADER_KEYS = ["num_samples", "sample_rate", "channels", "bits_per_sample"]
+
+
+def read_audio_header(audio_file: str) -> Dict:
+    """Read the number of samples, sample rate, number of channels and bit depth of an audio file from its header
+    without decoding it. The bit depth is None for compressed formats."""
+    extension = audio_file.rpartition(".")[-1].lower()
+    if extension not in {"mp3", "wav", "flac"}:
+        raise RuntimeError(
+            f"The audio format {extension} is not supported, please convert the audio files to mp3, flac, or wav format!"
+        )
+    info = mutagen.File(audio_file).info
+    return {
+        "num_samples": int(info.length * info.sample_rate),
+        "sample_rate": info.sample_rate,
+        "channels": info.channels,
+        "bits_per_sample": getattr(info, "bits_per_sample", None),
+    }
+
+
+class AudioIndex:
+    """Persistent index of the audio headers of the files under a dataset root, stored in `INDEX_FILE` next to the
+    metadata files.
+
+    An entry is reused as long as the size and the modification time of its file do not change, so only new or
+    modified files are opened. The missing headers are read by a thread pool. If the root is not writable, the index
+    is only kept in memory.
+
+    Args:
+        root_path (str): root of the dataset. The entries are keyed by the paths relative to it.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.index_file = os.path.join(root_path, INDEX_FILE)
+        self.entries = {}
+        self.changed = False
+        if os.path.isfile(self.index_file):
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION:
+                    self.entries = index["entries"]
+            except (OSError, ValueError):
+                # a corrupted index is rebuilt
+                pass
+
+    def lookup(self, audio_files: List[str], num_workers: int = 8) -> List[Dict]:
+        """Return the headers of the audio files, reading the ones missing from the index."""
+        keys = [os.path.relpath(audio_file, self.root_path) for audio_file in audio_files]
+        stats = [os.stat(audio_file) for audio_file in audio_files]
+        missing = [
+            i
+            for i, (key, stat) in enumerate(zip(keys, stats))
+            if self.entries.get(key, [None, None])[:2] != [stat.st_size, stat.st_mtime_ns]
+        ]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(num_workers, 1)) as executor:
+                headers = executor.map(read_audio_header, [audio_files[i] for i in missing])
+                for i, header in zip(missing, headers):
+                    self.entries[keys[i]] = [stats[i].st_size, stats[i].st_mtime_ns] + [header[k] for k in HEADER_KEYS]
+            self.changed = True
+        return [dict(zip(HEADER_KEYS, self.entries[key][2:])) for key in keys]
+
+    def save(self):
+        """Write the index if it changed."""
+        if not self.changed:
+            return
+        # write to a temporary file first so a concurrent process never reads a partial index
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "entries": self.entries}, f)
+            os.replace(tmp_file, self.index_file)
+            self.changed = False
+        except OSError as e:
+            print(f" [!] Cannot write the audio index {self.index_file}: {e}")
+
+
+def get_audio_headers(samples: List[Dict], num_workers: int = 8) -> List[Dict]:
+    """Read the audio headers of the samples through the `AudioIndex` of their dataset roots.
+
+    Args:
+        samples (List[Dict]): samples with `audio_file` and optionally `root_path` keys. The samples without a
+            `root_path` are indexed in the directory of their audio files.
+        num_workers (int): number of threads reading the missing headers. Defaults to 8.
+
+    Returns:
+        List[Dict]: `num_samples`, `sample_rate`, `channels` and `bits_per_sample` of each sample.
+    """
+    groups = {}
+    for idx, item in enumerate(samples):
+        root_path = item.get("root_path", None) or os.path.dirname(item["audio_file"])
+        groups.setdefault(root_path, []).append(idx)
+    headers = [None] * len(samples)
+    for root_path, idxs in groups.items():
+        index = AudioIndex(root_path)
+        for idx, header in zip(idxs, index.lookup([samples[idx]["audio_file"] for idx in idxs], num_workers)):
+            headers[idx] = header
+        index.save()
+    return headers
+
+
+def get_audio_lengths(samples: List[Dict], num_workers: int = 8) -> List[int]:
+    """Number of audio samples of each sample, see `get_audio_headers()`."""
+    return [header["num_samples"] for header in get_audio_headers(samples, num_workers)]
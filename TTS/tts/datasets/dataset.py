@@ -9,11 +9,11 @@ import torch
 import tqdm
 from torch.utils.data import Dataset
 
+from TTS.tts.datasets.audio_index import get_audio_lengths, read_audio_header
 from TTS.tts.utils.data import prepare_data, prepare_stop_target, prepare_tensor
 from TTS.utils.audio import AudioProcessor
 from TTS.utils.audio.numpy_transforms import compute_energy as calculate_energy
-
-import mutagen
+from TTS.utils.audio.torch_transforms import BatchSpectrogram
 
 # to prevent too many open files error as suggested here
 # https://github.com/pytorch/pytorch/issues/11201#issuecomment-421146936
@@ -44,13 +44,22 @@ def string2filename(string):
     return filename
 
 
-def get_audio_size(audiopath):
-    extension = audiopath.rpartition(".")[-1].lower()
-    if extension not in {"mp3", "wav", "flac"}:
-        raise RuntimeError(f"The audio format {extension} is not supported, please convert the audio files to mp3, flac, or wav format!")
+def pad_spectrogram(spec, length):
+    """Pad a `[B, C, T]` spectrogram batch with zeros to `length` frames and transpose it to `[B, T, C]`."""
+    spec = torch.nn.functional.pad(spec, (0, length - spec.shape[2]))
+    return spec.transpose(1, 2).contiguous()
+
+
+def save_array(file_path, array):
+    # write to a temporary file first so an interrupted computation does not leave a partial file
+    tmp_file = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_file, file_path)
+
 
-    audio_info = mutagen.File(audiopath).info
-    return int(audio_info.length * audio_info.sample_rate)
+def get_audio_size(audiopath):
+    return read_audio_header(audiopath)["num_samples"]
 
 
 class TTSDataset(Dataset):
@@ -78,6 +87,8 @@ class TTSDataset(Dataset):
         language_id_mapping: Dict = None,
         use_noise_augment: bool = False,
         start_by_longest: bool = False,
+        spectrogram_backend: str = "numpy",
+        mel_cache_path: str = None,
         verbose: bool = False,
     ):
         """Generic 📂 data loader for `tts` models. It is configurable for different outputs and needs.
@@ -137,6 +148,15 @@ class TTSDataset(Dataset):
 
             start_by_longest (bool): Start by longest sequence. It is especially useful to check OOM. Defaults to False.
 
+            spectrogram_backend (str): Where the spectrograms are computed. `numpy` computes them one by one with the
+                audio processor in `collate_fn()`, `torch` computes them for the whole batch with `BatchSpectrogram`
+                in `collate_fn()` and `device` returns the padded waveforms as `spec_waveform` so the model computes
+                them on the training device in `format_batch_on_device()`. Defaults to "numpy".
+
+            mel_cache_path (str): Path to cache the melspectrograms. It writes the melspectrogram of each sample to a
+                separate file the first time the sample is loaded and reads it afterwards. The cached
+                melspectrograms are computed without noise augmentation. Defaults to None.
+
             verbose (bool): Print diagnostic information. Defaults to false.
         """
         super().__init__()
@@ -160,36 +180,42 @@ class TTSDataset(Dataset):
         self.language_id_mapping = language_id_mapping
         self.use_noise_augment = use_noise_augment
         self.start_by_longest = start_by_longest
+        if spectrogram_backend not in ["numpy", "torch", "device"]:
+            raise ValueError(f" [!] Unknown spectrogram backend {spectrogram_backend}.")
+        self.spectrogram_backend = spectrogram_backend
+        self.mel_cache_path = mel_cache_path
+        self._batch_spectrogram = None
+        if mel_cache_path is not None:
+            os.makedirs(mel_cache_path, exist_ok=True)
 
         self.verbose = verbose
         self.rescue_item_idx = 1
         self.pitch_computed = False
         self.tokenizer = tokenizer
 
+        self.init_feature_datasets(precompute_num_workers)
+        if self.verbose:
+            self.print_logs()
+
+    def init_feature_datasets(self, precompute_num_workers: int = 0):
+        """Init the datasets that precompute and cache the phonemes, pitch and energy of the samples."""
         if self.tokenizer.use_phonemes:
             self.phoneme_dataset = PhonemeDataset(
-                self.samples, self.tokenizer, phoneme_cache_path, precompute_num_workers=precompute_num_workers
+                self.samples, self.tokenizer, self.phoneme_cache_path, precompute_num_workers=precompute_num_workers
             )
 
-        if compute_f0:
+        if self.compute_f0:
             self.f0_dataset = F0Dataset(
-                self.samples, self.ap, cache_path=f0_cache_path, precompute_num_workers=precompute_num_workers
+                self.samples, self.ap, cache_path=self.f0_cache_path, precompute_num_workers=precompute_num_workers
             )
-        if compute_energy:
+        if self.compute_energy:
             self.energy_dataset = EnergyDataset(
-                self.samples, self.ap, cache_path=energy_cache_path, precompute_num_workers=precompute_num_workers
+                self.samples, self.ap, cache_path=self.energy_cache_path, precompute_num_workers=precompute_num_workers
             )
-        if self.verbose:
-            self.print_logs()
 
     @property
     def lengths(self):
-        lens = []
-        for item in self.samples:
-            _, wav_file, *_ = _parse_sample(item)
-            audio_len = get_audio_size(wav_file)
-            lens.append(audio_len)
-        return lens
+        return get_audio_lengths(self.samples)
 
     @property
     def samples(self):
@@ -242,6 +268,23 @@ class TTSDataset(Dataset):
         assert item["audio_unique_name"] == out_dict["audio_unique_name"]
         return out_dict
 
+    @property
+    def batch_spectrogram(self) -> BatchSpectrogram:
+        # built lazily in the process that runs `collate_fn()`
+        if self._batch_spectrogram is None:
+            self._batch_spectrogram = BatchSpectrogram(self.ap)
+        return self._batch_spectrogram
+
+    def get_mel(self, idx, wav):
+        """Load the melspectrogram of a sample from `mel_cache_path` or compute and cache it."""
+        item = self.samples[idx]
+        mel_file = os.path.join(self.mel_cache_path, string2filename(item["audio_unique_name"]) + "_mel.npy")
+        if os.path.exists(mel_file):
+            return np.load(mel_file)
+        mel = self.ap.melspectrogram(wav).astype(np.float32)
+        save_array(mel_file, mel)
+        return mel
+
     @staticmethod
     def get_attn_mask(attn_file):
         return np.load(attn_file)
@@ -260,6 +303,11 @@ class TTSDataset(Dataset):
 
         wav = np.asarray(self.load_wav(item["audio_file"]), dtype=np.float32)
 
+        # get the cached melspectrogram
+        mel = None
+        if self.mel_cache_path is not None:
+            mel = self.get_mel(idx, wav)
+
         # apply noise for augmentation
         if self.use_noise_augment:
             wav = noise_augment_audio(wav)
@@ -291,6 +339,7 @@ class TTSDataset(Dataset):
             "raw_text": raw_text,
             "token_ids": token_ids,
             "wav": wav,
+            "mel": mel,
             "pitch": f0,
             "energy": energy,
             "attn": attn,
@@ -305,8 +354,9 @@ class TTSDataset(Dataset):
     @staticmethod
     def _compute_lengths(samples):
         new_samples = []
-        for item in samples:
-            audio_length = get_audio_size(item["audio_file"])
+        # the lengths are read from the audio headers once and cached in the audio index of each dataset
+        audio_lengths = get_audio_lengths(samples)
+        for item, audio_length in zip(samples, audio_lengths):
             text_lenght = len(item["text"])
             item["audio_length"] = audio_length
             item["text_length"] = text_lenght
@@ -450,17 +500,34 @@ class TTSDataset(Dataset):
             else:
                 speaker_ids = None
             # compute features
-            mel = [self.ap.melspectrogram(w).astype("float32") for w in batch["wav"]]
+            spec_waveform = None
+            spec_waveform_lengths = None
+            if self.spectrogram_backend != "numpy":
+                # the spectrograms are computed for the whole batch below or on the training device
+                spec_waveform = torch.nn.utils.rnn.pad_sequence(
+                    [torch.from_numpy(np.asarray(w, dtype=np.float32)) for w in batch["wav"]], batch_first=True
+                )
+                spec_waveform_lengths = torch.LongTensor([w.shape[0] for w in batch["wav"]])
 
-            mel_lengths = [m.shape[1] for m in mel]
+            mel = None
+            if batch.get("mel", [None])[0] is not None:
+                mel = batch["mel"]
+            elif self.spectrogram_backend == "numpy":
+                mel = [self.ap.melspectrogram(w).astype("float32") for w in batch["wav"]]
+
+            if mel is not None:
+                mel_lengths = [m.shape[1] for m in mel]
+            else:
+                mel_lengths = self.batch_spectrogram.spec_lengths(spec_waveform_lengths).tolist()
 
             # lengths adjusted by the reduction factor
             mel_lengths_adjusted = [
-                m.shape[1] + (self.outputs_per_step - (m.shape[1] % self.outputs_per_step))
-                if m.shape[1] % self.outputs_per_step
-                else m.shape[1]
-                for m in mel
+                mel_len + (self.outputs_per_step - (mel_len % self.outputs_per_step))
+                if mel_len % self.outputs_per_step
+                else mel_len
+                for mel_len in mel_lengths
             ]
+            max_mel_length = max(mel_lengths_adjusted)
 
             # compute 'stop token' targets
             stop_targets = [np.array([0.0] * (mel_len - 1) + [1.0]) for mel_len in mel_lengths]
@@ -472,15 +539,17 @@ class TTSDataset(Dataset):
             token_ids = prepare_data(batch["token_ids"]).astype(np.int32)
 
             # PAD features with longest instance
-            mel = prepare_tensor(mel, self.outputs_per_step)
-
-            # B x D x T --> B x T x D
-            mel = mel.transpose(0, 2, 1)
+            if mel is not None:
+                mel = prepare_tensor(mel, self.outputs_per_step)
+                # B x D x T --> B x T x D
+                mel = torch.FloatTensor(mel.transpose(0, 2, 1)).contiguous()
+            elif self.spectrogram_backend == "torch":
+                mel = self.batch_spectrogram.melspectrogram(spec_waveform, spec_waveform_lengths)
+                mel = pad_spectrogram(mel, max_mel_length)
 
             # convert things to pytorch
             token_ids_lengths = torch.LongTensor(token_ids_lengths)
             token_ids = torch.LongTensor(token_ids)
-            mel = torch.FloatTensor(mel).contiguous()
             mel_lengths = torch.LongTensor(mel_lengths)
             stop_targets = torch.FloatTensor(stop_targets)
 
@@ -496,18 +565,24 @@ class TTSDataset(Dataset):
 
             # compute linear spectrogram
             linear = None
-            if self.compute_linear_spec:
+            if self.compute_linear_spec and self.spectrogram_backend == "torch":
+                linear = self.batch_spectrogram.spectrogram(spec_waveform, spec_waveform_lengths)
+                linear = pad_spectrogram(linear, max_mel_length)
+            elif self.compute_linear_spec and self.spectrogram_backend == "numpy":
                 linear = [self.ap.spectrogram(w).astype("float32") for w in batch["wav"]]
                 linear = prepare_tensor(linear, self.outputs_per_step)
                 linear = linear.transpose(0, 2, 1)
                 assert mel.shape[1] == linear.shape[1]
                 linear = torch.FloatTensor(linear).contiguous()
+            if self.spectrogram_backend != "device":
+                spec_waveform = None
+                spec_waveform_lengths = None
 
             # format waveforms
             wav_padded = None
             if self.return_wav:
                 wav_lengths = [w.shape[0] for w in batch["wav"]]
-                max_wav_len = max(mel_lengths_adjusted) * self.ap.hop_length
+                max_wav_len = max_mel_length * self.ap.hop_length
                 wav_lengths = torch.LongTensor(wav_lengths)
                 wav_padded = torch.zeros(len(batch["wav"]), 1, max_wav_len)
                 for i, w in enumerate(batch["wav"]):
@@ -520,14 +595,14 @@ class TTSDataset(Dataset):
             # format F0
             if self.compute_f0:
                 pitch = prepare_data(batch["pitch"])
-                assert mel.shape[1] == pitch.shape[1], f"[!] {mel.shape} vs {pitch.shape}"
+                assert max_mel_length == pitch.shape[1], f"[!] {max_mel_length} vs {pitch.shape}"
                 pitch = torch.FloatTensor(pitch)[:, None, :].contiguous()  # B x 1 xT
             else:
                 pitch = None
             # format energy
             if self.compute_energy:
                 energy = prepare_data(batch["energy"])
-                assert mel.shape[1] == energy.shape[1], f"[!] {mel.shape} vs {energy.shape}"
+                assert max_mel_length == energy.shape[1], f"[!] {max_mel_length} vs {energy.shape}"
                 energy = torch.FloatTensor(energy)[:, None, :].contiguous()  # B x 1 xT
             else:
                 energy = None
@@ -536,7 +611,7 @@ class TTSDataset(Dataset):
             if batch["attn"][0] is not None:
                 attns = [batch["attn"][idx].T for idx in ids_sorted_decreasing]
                 for idx, attn in enumerate(attns):
-                    pad2 = mel.shape[1] - attn.shape[1]
+                    pad2 = max_mel_length - attn.shape[1]
                     pad1 = token_ids.shape[1] - attn.shape[0]
                     assert pad1 >= 0 and pad2 >= 0, f"[!] Negative padding - {pad1} and {pad2}"
                     attn = np.pad(attn, [[0, pad1], [0, pad2]])
@@ -551,6 +626,8 @@ class TTSDataset(Dataset):
                 "linear": linear,
                 "mel": mel,
                 "mel_lengths": mel_lengths,
+                "spec_waveform": spec_waveform,
+                "spec_waveform_lengths": spec_waveform_lengths,
                 "stop_targets": stop_targets,
                 "item_idxs": batch["item_idx"],
                 "d_vectors": d_vectors,
@@ -711,8 +788,10 @@ class F0Dataset:
         self.pad_id = 0.0
         self.mean = None
         self.std = None
-        if cache_path is not None and not os.path.exists(cache_path):
-            os.makedirs(cache_path)
+        # resume an interrupted pre-computation, that did not write the stats
+        stats_missing = normalize_f0 and not os.path.exists(os.path.join(cache_path or "", "pitch_stats.npy"))
+        if cache_path is not None and (not os.path.exists(cache_path) or stats_missing):
+            os.makedirs(cache_path, exist_ok=True)
             self.precompute(precompute_num_workers)
         if normalize_f0:
             self.load_stats(cache_path)
@@ -728,25 +807,24 @@ class F0Dataset:
     def __len__(self):
         return len(self.samples)
 
-    def precompute(self, num_workers=0):
+    def precompute(self, num_workers=0, batch_size=8):
+        """Compute the missing F0 values of the cache `batch_size` samples at a time in `num_workers` processes and
+        the F0 stats. The values already in the cache are loaded, so an interrupted pre-computation resumes."""
         print("[*] Pre-computing F0s...")
+        dataloader = torch.utils.data.DataLoader(
+            dataset=list(range(len(self))),
+            batch_size=batch_size,
+            shuffle=False,
+            num_workers=num_workers,
+            collate_fn=self.compute_or_load_batch,
+        )
+        computed_data = []
         with tqdm.tqdm(total=len(self)) as pbar:
-            batch_size = num_workers if num_workers > 0 else 1
-            # we do not normalize at preproessing
-            normalize_f0 = self.normalize_f0
-            self.normalize_f0 = False
-            dataloder = torch.utils.data.DataLoader(
-                batch_size=batch_size, dataset=self, shuffle=False, num_workers=num_workers, collate_fn=self.collate_fn
-            )
-            computed_data = []
-            for batch in dataloder:
-                f0 = batch["f0"]
-                computed_data.append(f for f in f0)
-                pbar.update(batch_size)
-            self.normalize_f0 = normalize_f0
+            for f0s in dataloader:
+                computed_data.extend(f0s)
+                pbar.update(len(f0s))
 
         if self.normalize_f0:
-            computed_data = [tensor for batch in computed_data for tensor in batch]  # flatten
             pitch_mean, pitch_std = self.compute_pitch_stats(computed_data)
             pitch_stats = {"mean": pitch_mean, "std": pitch_std}
             np.save(os.path.join(self.cache_path, "pitch_stats"), pitch_stats, allow_pickle=True)
@@ -759,12 +837,16 @@ class F0Dataset:
         pitch_file = os.path.join(cache_path, file_name + "_pitch.npy")
         return pitch_file
 
+    @staticmethod
+    def save_pitch(pitch_file, pitch):
+        save_array(pitch_file, pitch)
+
     @staticmethod
     def _compute_and_save_pitch(ap, wav_file, pitch_file=None):
         wav = ap.load_wav(wav_file)
         pitch = ap.compute_f0(wav)
         if pitch_file:
-            np.save(pitch_file, pitch)
+            F0Dataset.save_pitch(pitch_file, pitch)
         return pitch
 
     @staticmethod
@@ -804,6 +886,22 @@ class F0Dataset:
             pitch = np.load(pitch_file)
         return pitch.astype(np.float32)
 
+    def compute_or_load_batch(self, indices: List[int]) -> List[np.ndarray]:
+        """Load the pitch values of the samples from the cache and compute the missing ones together with
+        `AudioProcessor.compute_f0_batch()`."""
+        items = [self.samples[idx] for idx in indices]
+        pitch_files = [
+            self.create_pitch_file_path(string2filename(item["audio_unique_name"]), self.cache_path) for item in items
+        ]
+        pitches = [np.load(f) if os.path.exists(f) else None for f in pitch_files]
+        missing = [i for i, pitch in enumerate(pitches) if pitch is None]
+        if missing:
+            wavs = [self.ap.load_wav(items[i]["audio_file"]) for i in missing]
+            for i, pitch in zip(missing, self.ap.compute_f0_batch(wavs)):
+                self.save_pitch(pitch_files[i], pitch)
+                pitches[i] = pitch
+        return [pitch.astype(np.float32) for pitch in pitches]
+
     def collate_fn(self, batch):
         audio_unique_name = [item["audio_unique_name"] for item in batch]
         f0s = [item["f0"] for item in batch]
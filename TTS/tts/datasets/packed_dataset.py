@@ -0,0 +1,205 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+from tqdm import tqdm
+
+from TTS.tts.datasets.dataset import TTSDataset, noise_augment_audio
+
+PACK_VERSION = 1
+# arrays start at multiples of this many bytes so every dtype can be viewed in place
+ALIGNMENT = 64
+# keys of the samples that are kept in the index
+SAMPLE_KEYS = ["text", "audio_file", "speaker_name", "language", "audio_unique_name", "root_path"]
+
+
+def pack_tts_dataset(dataset: TTSDataset, output_path: str, shard_size: int = 2**30, verbose: bool = True) -> Dict:
+    """Write the waveforms, token ids, pitch, energy and alignments of all the samples of a `TTSDataset` to
+    memory-mappable shard files with a JSON index, to be read by `PackedTTSDataset`.
+
+    The arrays are written as computed by the dataset, so the waveforms are decoded and resampled by its audio
+    processor and the token ids, pitch and energy come from its tokenizer and feature caches. The pitch and energy are
+    only packed if `compute_f0` and `compute_energy` are enabled. The alignments are packed if the samples have
+    `alignment_file`s.
+
+    Args:
+        dataset (TTSDataset): dataset to pack.
+        output_path (str): directory of the shard files and `index.json`.
+        shard_size (int): size in bytes after which a new shard file is started. Defaults to 1GB.
+        verbose (bool): show a progress bar. Defaults to True.
+
+    Returns:
+        Dict: the index of the pack.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    # write to temporary files first so a reader never sees a partial pack
+    suffix = f".{os.getpid()}.tmp"
+    shards = []
+    samples = []
+    f = None
+    offset = 0
+    try:
+        for idx in tqdm(range(len(dataset)), desc=" > Packing samples", disable=not verbose):
+            item = dataset.samples[idx]
+            arrays = {
+                "wav": np.asarray(dataset.load_wav(item["audio_file"]), dtype=np.float32),
+                "token_ids": dataset.get_token_ids(idx, item["text"]),
+            }
+            if dataset.compute_f0:
+                arrays["pitch"] = np.asarray(dataset.get_f0(idx)["f0"], dtype=np.float32)
+            if dataset.compute_energy:
+                arrays["energy"] = np.asarray(dataset.get_energy(idx)["energy"], dtype=np.float32)
+            if "alignment_file" in item:
+                arrays["attn"] = np.asarray(dataset.get_attn_mask(item["alignment_file"]), dtype=np.float32)
+
+            if f is None or offset >= shard_size:
+                if f is not None:
+                    f.close()
+                shards.append(f"shard_{len(shards):05d}.bin")
+                f = open(os.path.join(output_path, shards[-1] + suffix), "wb")  # pylint: disable=consider-using-with
+                offset = 0
+            entry = {k: item[k] for k in SAMPLE_KEYS if k in item}
+            entry["audio_length"] = len(arrays["wav"])
+            entry["text_length"] = len(item["text"])
+            entry["shard"] = len(shards) - 1
+            entry["arrays"] = {}
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                entry["arrays"][name] = [offset, array.dtype.str, list(array.shape)]
+                f.write(array.tobytes())
+                offset += array.nbytes
+                padding = -offset % ALIGNMENT
+                f.write(b"\0" * padding)
+                offset += padding
+            samples.append(entry)
+    finally:
+        if f is not None:
+            f.close()
+
+    index = {
+        "version": PACK_VERSION,
+        "sample_rate": dataset.ap.sample_rate,
+        "vocab": list(dataset.tokenizer.characters.vocab),
+        "shards": shards,
+        "samples": samples,
+    }
+    with open(os.path.join(output_path, "index.json") + suffix, "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file)
+    for shard in shards:
+        os.replace(os.path.join(output_path, shard + suffix), os.path.join(output_path, shard))
+    os.replace(os.path.join(output_path, "index.json") + suffix, os.path.join(output_path, "index.json"))
+    return index
+
+
+class PackedTTSDataset(TTSDataset):
+    """`TTSDataset` that reads the samples from a pack written by `pack_tts_dataset()` instead of decoding the audio
+    files and loading the feature caches one by one.
+
+    The lengths of the samples are read from the index, so `preprocess_samples()` does not touch the audio files,
+    and the arrays of a sample are read from memory-mapped shard files with a single seek. Every data loader worker
+    maps the shards on its own. The spectrograms are still computed in `collate_fn()`.
+
+    Args:
+        pack_path (str): directory of the pack.
+        samples (List[Dict]): samples to use, looked up in the pack by `audio_unique_name`. Defaults to all the
+            samples of the pack.
+        **kwargs: the other `TTSDataset` arguments. `compute_f0` and `compute_energy` require the pitch and the
+            energy to be in the pack and the cache paths are ignored.
+    """
+
+    def __init__(self, pack_path: str, samples: List[Dict] = None, **kwargs):
+        self.pack_path = pack_path
+        with open(os.path.join(pack_path, "index.json"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["version"] != PACK_VERSION:
+            raise ValueError(f" [!] Unsupported pack version {index['version']} in {pack_path}.")
+        self.shards = index["shards"]
+        self._shard_data = {}
+
+        packed_samples = {entry["audio_unique_name"]: entry for entry in index["samples"]}
+        if samples is None:
+            samples = index["samples"]
+        else:
+            missing = [s["audio_unique_name"] for s in samples if s["audio_unique_name"] not in packed_samples]
+            if missing:
+                raise ValueError(f" [!] {len(missing)} samples are not in the pack {pack_path}, e.g. {missing[0]}.")
+            samples = [{**sample, **packed_samples[sample["audio_unique_name"]]} for sample in samples]
+        super().__init__(samples=samples, **kwargs)
+
+        if self.ap is not None and self.ap.sample_rate != index["sample_rate"]:
+            raise ValueError(
+                f" [!] The pack sample rate {index['sample_rate']} does not match the audio processor sample rate {self.ap.sample_rate}."
+            )
+        if list(self.tokenizer.characters.vocab) != index["vocab"]:
+            raise ValueError(" [!] The pack was written with a different tokenizer vocabulary.")
+        for name, flag in [("pitch", self.compute_f0), ("energy", self.compute_energy)]:
+            if flag and samples and name not in samples[0]["arrays"]:
+                raise ValueError(f" [!] The pack {pack_path} has no {name} values, pack it with them enabled.")
+
+    def init_feature_datasets(self, precompute_num_workers: int = 0):
+        # the features are read from the pack
+        pass
+
+    @property
+    def lengths(self):
+        return [item["audio_length"] for item in self.samples]
+
+    @staticmethod
+    def _compute_lengths(samples):
+        # the lengths are already in the index
+        return samples
+
+    def shard_data(self, shard: int) -> np.ndarray:
+        # map the shards lazily so every worker process maps them on its own
+        if shard not in self._shard_data:
+            self._shard_data[shard] = np.memmap(
+                os.path.join(self.pack_path, self.shards[shard]), dtype=np.uint8, mode="r"
+            )
+        return self._shard_data[shard]
+
+    def load_arrays(self, idx: int) -> Dict[str, np.ndarray]:
+        """Read the packed arrays of a sample."""
+        item = self.samples[idx]
+        data = self.shard_data(item["shard"])
+        arrays = {}
+        for name, (offset, dtype, shape) in item["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            # copy the values out of the read-only map
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+        return arrays
+
+    def load_data(self, idx):
+        item = self.samples[idx]
+        arrays = self.load_arrays(idx)
+
+        wav = arrays["wav"]
+        if self.use_noise_augment:
+            wav = noise_augment_audio(wav)
+        token_ids = arrays["token_ids"]
+
+        # after phonemization the text length may change, see `TTSDataset.load_data()`
+        if len(token_ids) > self.max_text_len or len(wav) < self.min_audio_len:
+            self.rescue_item_idx += 1
+            return self.load_data(self.rescue_item_idx)
+
+        return {
+            "raw_text": item["text"],
+            "token_ids": token_ids,
+            "wav": wav,
+            "pitch": arrays["pitch"] if self.compute_f0 else None,
+            "energy": arrays["energy"] if self.compute_energy else None,
+            "attn": arrays.get("attn", None),
+            "item_idx": item["audio_file"],
+            "speaker_name": item["speaker_name"],
+            "language_name": item["language"],
+            "wav_file_name": os.path.basename(item["audio_file"]),
+            "audio_unique_name": item["audio_unique_name"],
+        }
+
+    def __getstate__(self) -> Dict:
+        # do not pickle the mapped shards, workers map the files themselves
+        state = self.__dict__.copy()
+        state["_shard_data"] = {}
+        return state
@@ -149,41 +149,8 @@ def generate_voice(
     np.savez(output_path, fine_prompt=codes, coarse_prompt=codes[:2, :], semantic_prompt=semantic_tokens)
 
 
-def generate_text_semantic(
-    text,
-    model,
-    history_prompt=None,
-    temp=0.7,
-    top_k=None,
-    top_p=None,
-    silent=False,
-    min_eos_p=0.2,
-    max_gen_duration_s=None,
-    allow_early_stop=True,
-    base=None,
-    use_kv_caching=True,
-    **kwargs,  # pylint: disable=unused-argument
-):
-    """Generate semantic tokens from text.
-
-    Args:
-        text (str): The text to generate semantic tokens from.
-        model (BarkModel): The BarkModel to use for generating the semantic tokens.
-        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
-        temp (float): The temperature to use for the generation.
-        top_k (int): The number of top tokens to consider for the generation.
-        top_p (float): The cumulative probability to consider for the generation.
-        silent (bool): Whether to silence the tqdm progress bar.
-        min_eos_p (float): The minimum probability to consider for the end of sentence token.
-        max_gen_duration_s (float): The maximum duration in seconds to generate for.
-        allow_early_stop (bool): Whether to allow the generation to stop early.
-        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
-        use_kv_caching (bool): Whether to use key-value caching for the generation.
-        **kwargs: Additional keyword arguments. They are ignored.
-
-    Returns:
-        np.ndarray: The generated semantic tokens.
-    """
+def _prepare_semantic_input(text, model, history_prompt=None, base=None):
+    """Encode the text and the semantic history into the `256 + 256 + 1` tokens of the semantic model input."""
     assert isinstance(text, str)
     text = _normalize_whitespace(text)
     assert len(text.strip()) > 0
@@ -224,9 +191,45 @@ def generate_text_semantic(
         )
     else:
         semantic_history = np.array([model.config.SEMANTIC_PAD_TOKEN] * 256)
-    x = torch.from_numpy(
-        np.hstack([encoded_text, semantic_history, np.array([model.config.SEMANTIC_INFER_TOKEN])]).astype(np.int64)
-    )[None]
+    return np.hstack([encoded_text, semantic_history, np.array([model.config.SEMANTIC_INFER_TOKEN])]).astype(np.int64)
+
+
+def generate_text_semantic(
+    text,
+    model,
+    history_prompt=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    min_eos_p=0.2,
+    max_gen_duration_s=None,
+    allow_early_stop=True,
+    base=None,
+    use_kv_caching=True,
+    **kwargs,  # pylint: disable=unused-argument
+):
+    """Generate semantic tokens from text.
+
+    Args:
+        text (str): The text to generate semantic tokens from.
+        model (BarkModel): The BarkModel to use for generating the semantic tokens.
+        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        min_eos_p (float): The minimum probability to consider for the end of sentence token.
+        max_gen_duration_s (float): The maximum duration in seconds to generate for.
+        allow_early_stop (bool): Whether to allow the generation to stop early.
+        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+        **kwargs: Additional keyword arguments. They are ignored.
+
+    Returns:
+        np.ndarray: The generated semantic tokens.
+    """
+    x = torch.from_numpy(_prepare_semantic_input(text, model, history_prompt, base))[None]
     assert x.shape[1] == 256 + 256 + 1
     with inference_mode():
         x = x.to(model.device)
@@ -235,9 +238,9 @@ def generate_text_semantic(
         pbar = tqdm.tqdm(disable=silent, total=100)
         pbar_state = 0
         tot_generated_duration_s = 0
-        kv_cache = None
+        kv_cache = model.semantic_model.new_kv_cache() if use_kv_caching else None
         for n in range(n_tot_steps):
-            if use_kv_caching and kv_cache is not None:
+            if use_kv_caching and len(kv_cache) > 0:
                 x_input = x[:, [-1]]
             else:
                 x_input = x
@@ -304,36 +307,13 @@ def _flatten_codebooks(arr, offset_size):
     return flat_arr
 
 
-def generate_coarse(
-    x_semantic,
-    model,
-    history_prompt=None,
-    temp=0.7,
-    top_k=None,
-    top_p=None,
-    silent=False,
-    max_coarse_history=630,  # min 60 (faster), max 630 (more context)
-    sliding_window_len=60,
-    base=None,
-    use_kv_caching=True,
-):
-    """Generate coarse audio codes from semantic tokens.
-
-    Args:
-        x_semantic (np.ndarray): The semantic tokens to generate coarse audio codes from.
-        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
-        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
-        temp (float): The temperature to use for the generation.
-        top_k (int): The number of top tokens to consider for the generation.
-        top_p (float): The cumulative probability to consider for the generation.
-        silent (bool): Whether to silence the tqdm progress bar.
-        max_coarse_history (int): The maximum number of coarse audio codes to use as history.
-        sliding_window_len (int): The length of the sliding window to use for the generation.
-        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
-        use_kv_caching (bool): Whether to use key-value caching for the generation.
+def _prepare_coarse_input(x_semantic, model, history_prompt=None, base=None, max_coarse_history=630):
+    """Prepend the semantic and coarse histories to the semantic tokens and compute the number of coarse tokens to
+    generate.
 
     Returns:
-        np.ndarray: The generated coarse audio codes.
+        Tuple[np.ndarray, np.ndarray, int, int]: semantic tokens with their history, coarse history, index of the first
+        semantic token after the history and number of coarse tokens to generate.
     """
     assert (
         isinstance(x_semantic, np.ndarray)
@@ -342,8 +322,6 @@ def generate_coarse(
         and x_semantic.min() >= 0
         and x_semantic.max() <= model.config.SEMANTIC_VOCAB_SIZE - 1
     )
-    assert 60 <= max_coarse_history <= 630
-    assert max_coarse_history + sliding_window_len <= 1024 - 256
     semantic_to_coarse_ratio = (
         model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
     )
@@ -392,7 +370,7 @@ def generate_coarse(
     else:
         x_semantic_history = np.array([], dtype=np.int32)
         x_coarse_history = np.array([], dtype=np.int32)
-    # start loop
+    # number of coarse tokens to generate
     n_steps = int(
         round(
             np.floor(len(x_semantic) * semantic_to_coarse_ratio / model.config.N_COARSE_CODEBOOKS)
@@ -403,11 +381,56 @@ def generate_coarse(
     x_semantic = np.hstack([x_semantic_history, x_semantic]).astype(np.int32)
     x_coarse = x_coarse_history.astype(np.int32)
     base_semantic_idx = len(x_semantic_history)
+    return x_semantic, x_coarse, base_semantic_idx, n_steps
+
+
+def generate_coarse(
+    x_semantic,
+    model,
+    history_prompt=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    max_coarse_history=630,  # min 60 (faster), max 630 (more context)
+    sliding_window_len=60,
+    base=None,
+    use_kv_caching=True,
+):
+    """Generate coarse audio codes from semantic tokens.
+
+    Args:
+        x_semantic (np.ndarray): The semantic tokens to generate coarse audio codes from.
+        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
+        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        max_coarse_history (int): The maximum number of coarse audio codes to use as history.
+        sliding_window_len (int): The length of the sliding window to use for the generation.
+        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+
+    Returns:
+        np.ndarray: The generated coarse audio codes.
+    """
+    assert 60 <= max_coarse_history <= 630
+    assert max_coarse_history + sliding_window_len <= 1024 - 256
+    semantic_to_coarse_ratio = (
+        model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
+    )
+    max_semantic_history = int(np.floor(max_coarse_history / semantic_to_coarse_ratio))
+    x_semantic, x_coarse, base_semantic_idx, n_steps = _prepare_coarse_input(
+        x_semantic, model, history_prompt, base, max_coarse_history
+    )
     with inference_mode():
         x_semantic_in = torch.from_numpy(x_semantic)[None].to(model.device)
         x_coarse_in = torch.from_numpy(x_coarse)[None].to(model.device)
         n_window_steps = int(np.ceil(n_steps / sliding_window_len))
         n_step = 0
+        # the buffers are reused by all the windows
+        kv_cache = model.coarse_model.new_kv_cache() if use_kv_caching else None
         for _ in tqdm.tqdm(range(n_window_steps), total=n_window_steps, disable=silent):
             semantic_idx = base_semantic_idx + int(round(n_step / semantic_to_coarse_ratio))
             # pad from right side
@@ -426,13 +449,14 @@ def generate_coarse(
                     x_coarse_in[:, -max_coarse_history:],
                 ]
             )
-            kv_cache = None
+            if use_kv_caching:
+                kv_cache.reset()
             for _ in range(sliding_window_len):
                 if n_step >= n_steps:
                     continue
                 is_major_step = n_step % model.config.N_COARSE_CODEBOOKS == 0
 
-                if use_kv_caching and kv_cache is not None:
+                if use_kv_caching and len(kv_cache) > 0:
                     x_input = x_in[:, [-1]]
                 else:
                     x_input = x_in
@@ -469,7 +493,7 @@ def generate_coarse(
                 n_step += 1
             del x_in
         del x_semantic_in
-    gen_coarse_arr = x_coarse_in.detach().cpu().numpy().squeeze()[len(x_coarse_history) :]
+    gen_coarse_arr = x_coarse_in.detach().cpu().numpy().squeeze()[len(x_coarse) :]
     del x_coarse_in
     assert len(gen_coarse_arr) == n_steps
     gen_coarse_audio_arr = (
@@ -481,26 +505,12 @@ def generate_coarse(
     return gen_coarse_audio_arr
 
 
-def generate_fine(
-    x_coarse_gen,
-    model,
-    history_prompt=None,
-    temp=0.5,
-    silent=True,
-    base=None,
-):
-    """Generate full audio codes from coarse audio codes.
-
-    Args:
-        x_coarse_gen (np.ndarray): The coarse audio codes to generate full audio codes from.
-        model (BarkModel): The BarkModel to use for generating the full audio codes.
-        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
-        temp (float): The temperature to use for the generation.
-        silent (bool): Whether to silence the tqdm progress bar.
-        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+def _prepare_fine_input(x_coarse_gen, model, history_prompt=None, base=None):
+    """Pad the coarse codes with the fine codebooks and prepend the fine history.
 
     Returns:
-        np.ndarray: The generated full audio codes.
+        Tuple[np.ndarray, int, int, int]: input codes, length of the history, length of the padding at the end and
+        number of 1024 long windows to generate.
     """
     assert (
         isinstance(x_coarse_gen, np.ndarray)
@@ -559,6 +569,32 @@ def generate_fine(
         )
     # we can be lazy about fractional loop and just keep overwriting codebooks
     n_loops = np.max([0, int(np.ceil((x_coarse_gen.shape[1] - (1024 - n_history)) / 512))]) + 1
+    return in_arr, n_history, n_remove_from_end, n_loops
+
+
+def generate_fine(
+    x_coarse_gen,
+    model,
+    history_prompt=None,
+    temp=0.5,
+    silent=True,
+    base=None,
+):
+    """Generate full audio codes from coarse audio codes.
+
+    Args:
+        x_coarse_gen (np.ndarray): The coarse audio codes to generate full audio codes from.
+        model (BarkModel): The BarkModel to use for generating the full audio codes.
+        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
+        temp (float): The temperature to use for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+
+    Returns:
+        np.ndarray: The generated full audio codes.
+    """
+    n_coarse = x_coarse_gen.shape[0]
+    in_arr, n_history, n_remove_from_end, n_loops = _prepare_fine_input(x_coarse_gen, model, history_prompt, base)
     with inference_mode():
         in_arr = torch.tensor(in_arr.T).to(model.device)
         for n in tqdm.tqdm(range(n_loops), disable=silent):
@@ -595,6 +631,320 @@ def generate_fine(
     return gen_fine_arr
 
 
+def _sample_next_tokens(logits, temp, top_k=None, top_p=None):
+    """Sample the next tokens of a batch of sequences after top-p and top-k filtering of the logits.
+
+    Args:
+        logits (torch.Tensor): The logits of the next tokens of shape `(B, V)`.
+        temp (float): The temperature to use for the sampling.
+        top_k (int): The number of top tokens to consider for the sampling.
+        top_p (float): The cumulative probability to consider for the sampling.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]: The sampled tokens of shape `(B,)` and their distributions of shape `(B, V)`.
+    """
+    logits = logits.float()
+    if top_p is not None:
+        sorted_logits, sorted_indices = torch.sort(logits, dim=-1, descending=True)
+        cumulative_probs = torch.cumsum(F.softmax(sorted_logits, dim=-1), dim=-1)
+        sorted_indices_to_remove = cumulative_probs > top_p
+        # keep the token that crosses the threshold
+        sorted_indices_to_remove[:, 1:] = sorted_indices_to_remove[:, :-1].clone()
+        sorted_indices_to_remove[:, 0] = False
+        indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+        logits = logits.masked_fill(indices_to_remove, -float("Inf"))
+    if top_k is not None:
+        v, _ = torch.topk(logits, min(top_k, logits.size(-1)), dim=-1)
+        logits = logits.masked_fill(logits < v[:, [-1]], -float("Inf"))
+    probs = F.softmax(logits / temp, dim=-1)
+    return torch.multinomial(probs, num_samples=1).squeeze(1), probs
+
+
+def generate_text_semantic_batch(
+    texts,
+    model,
+    history_prompts=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    min_eos_p=0.2,
+    max_gen_duration_s=None,
+    allow_early_stop=True,
+    use_kv_caching=True,
+    **kwargs,  # pylint: disable=unused-argument
+):
+    """Generate the semantic tokens of a batch of texts together. See `generate_text_semantic()`.
+
+    All the inputs have the same length, so the batch is decoded without padding until every sequence has generated
+    its end of sentence token.
+
+    Args:
+        texts (List[str]): The texts to generate semantic tokens from.
+        model (BarkModel): The BarkModel to use for generating the semantic tokens.
+        history_prompts (List[tuple]): A (semantic_history, coarse_history, fine_history) prompt for each text.
+            Defaults to None.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        min_eos_p (float): The minimum probability to consider for the end of sentence token.
+        max_gen_duration_s (float): The maximum duration in seconds to generate for.
+        allow_early_stop (bool): Whether to allow the generation to stop early.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+        **kwargs: Additional keyword arguments. They are ignored.
+
+    Returns:
+        List[np.ndarray]: The generated semantic tokens of each text.
+    """
+    if history_prompts is None:
+        history_prompts = [(None, None, None)] * len(texts)
+    x = torch.from_numpy(np.stack([_prepare_semantic_input(t, model, h) for t, h in zip(texts, history_prompts)]))
+    batch_size = x.shape[0]
+    with inference_mode():
+        x = x.to(model.device)
+        n_tot_steps = 768
+        tot_generated_duration_s = 0
+        lengths = torch.zeros(batch_size, dtype=torch.long, device=model.device)
+        done = torch.zeros(batch_size, dtype=torch.bool, device=model.device)
+        kv_cache = model.semantic_model.new_kv_cache(batch_size=batch_size) if use_kv_caching else None
+        for _ in tqdm.tqdm(range(n_tot_steps), disable=silent):
+            if use_kv_caching and len(kv_cache) > 0:
+                x_input = x[:, [-1]]
+            else:
+                x_input = x
+            logits, kv_cache = model.semantic_model(
+                x_input, merge_context=True, use_cache=use_kv_caching, past_kv=kv_cache
+            )
+            relevant_logits = logits[:, 0, : model.config.SEMANTIC_VOCAB_SIZE]
+            if allow_early_stop:
+                relevant_logits = torch.hstack(
+                    (relevant_logits, logits[:, 0, [model.config.SEMANTIC_PAD_TOKEN]])
+                )  # eos
+            item_next, probs = _sample_next_tokens(relevant_logits, temp, top_k=top_k, top_p=top_p)
+            if allow_early_stop:
+                is_eos = item_next == model.config.SEMANTIC_VOCAB_SIZE
+                if min_eos_p is not None:
+                    is_eos |= probs[:, -1] >= min_eos_p
+                done |= is_eos
+                if done.all():
+                    break
+            # the finished sequences keep being decoded with the rest of the batch but their tokens are dropped
+            lengths += (~done).long()
+            x = torch.cat((x, item_next[:, None]), dim=1)
+            tot_generated_duration_s += 1 / model.config.SEMANTIC_RATE_HZ
+            if max_gen_duration_s is not None and tot_generated_duration_s > max_gen_duration_s:
+                break
+            del logits, relevant_logits, probs, item_next
+        x = x.detach().cpu().numpy()
+        lengths = lengths.cpu().numpy()
+    outs = [x[i, 256 + 256 + 1 : 256 + 256 + 1 + lengths[i]] for i in range(batch_size)]
+    for out in outs:
+        assert all(out >= 0) and all(out < model.config.SEMANTIC_VOCAB_SIZE)
+    clear_cuda_cache()
+    return outs
+
+
+def generate_coarse_batch(
+    x_semantics,
+    model,
+    history_prompts=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    max_coarse_history=630,  # min 60 (faster), max 630 (more context)
+    sliding_window_len=60,
+    use_kv_caching=True,
+):
+    """Generate the coarse audio codes of a batch of semantic token sequences together. See `generate_coarse()`.
+
+    The inputs of the sliding windows are left padded to the longest one of the batch and the padding is masked out
+    of the attention. The batch is decoded until the longest sequence is done.
+
+    Args:
+        x_semantics (List[np.ndarray]): The semantic tokens to generate coarse audio codes from.
+        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
+        history_prompts (List[tuple]): A (semantic_history, coarse_history, fine_history) prompt for each sequence.
+            Defaults to None.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        max_coarse_history (int): The maximum number of coarse audio codes to use as history.
+        sliding_window_len (int): The length of the sliding window to use for the generation.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+
+    Returns:
+        List[np.ndarray]: The generated coarse audio codes of each sequence.
+    """
+    assert 60 <= max_coarse_history <= 630
+    assert max_coarse_history + sliding_window_len <= 1024 - 256
+    semantic_to_coarse_ratio = (
+        model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
+    )
+    max_semantic_history = int(np.floor(max_coarse_history / semantic_to_coarse_ratio))
+    if history_prompts is None:
+        history_prompts = [(None, None, None)] * len(x_semantics)
+    inputs = [
+        _prepare_coarse_input(x, model, h, None, max_coarse_history) for x, h in zip(x_semantics, history_prompts)
+    ]
+    batch_size = len(inputs)
+    n_steps = max(n for *_, n in inputs)
+    device = model.device
+    with inference_mode():
+        x_semantic_ins = [torch.from_numpy(x_semantic).to(device) for x_semantic, *_ in inputs]
+        # the coarse histories are left padded and extended by a column for every generated token
+        max_history_len = max(len(x_coarse) for _, x_coarse, *_ in inputs)
+        x_coarse_in = torch.zeros(batch_size, max_history_len, dtype=torch.int32, device=device)
+        x_coarse_mask = torch.zeros(batch_size, max_history_len, dtype=torch.bool, device=device)
+        for i, (_, x_coarse, *_) in enumerate(inputs):
+            if len(x_coarse) > 0:
+                x_coarse_in[i, -len(x_coarse) :] = torch.from_numpy(x_coarse).to(device)
+                x_coarse_mask[i, -len(x_coarse) :] = True
+        infer_token = torch.tensor([model.config.COARSE_INFER_TOKEN], dtype=torch.int32, device=device)
+        n_window_steps = int(np.ceil(n_steps / sliding_window_len))
+        n_step = 0
+        # the buffers are reused by all the windows
+        kv_cache = model.coarse_model.new_kv_cache(batch_size=batch_size) if use_kv_caching else None
+        for _ in tqdm.tqdm(range(n_window_steps), total=n_window_steps, disable=silent):
+            rows = []
+            for i, (_, _, base_semantic_idx, _) in enumerate(inputs):
+                semantic_idx = base_semantic_idx + int(round(n_step / semantic_to_coarse_ratio))
+                # pad from right side
+                x_in = x_semantic_ins[i][np.max([0, semantic_idx - max_semantic_history]) :]
+                x_in = x_in[:256]
+                x_in = F.pad(x_in, (0, 256 - x_in.shape[-1]), "constant", model.config.COARSE_SEMANTIC_PAD_TOKEN)
+                x_coarse = x_coarse_in[i, -max_coarse_history:][x_coarse_mask[i, -max_coarse_history:]]
+                rows.append(torch.hstack([x_in.int(), infer_token, x_coarse]))
+            # left pad the rows to the longest one
+            window_len = max(len(row) for row in rows)
+            x_in = torch.zeros(batch_size, window_len, dtype=torch.long, device=device)
+            attention_mask = torch.zeros(batch_size, window_len, dtype=torch.bool, device=device)
+            for i, row in enumerate(rows):
+                x_in[i, window_len - len(row) :] = row
+                attention_mask[i, window_len - len(row) :] = True
+            position_ids = (attention_mask.long().cumsum(1) - 1).clamp(min=0)
+            if use_kv_caching:
+                kv_cache.reset()
+            for _ in range(sliding_window_len):
+                if n_step >= n_steps:
+                    continue
+                is_major_step = n_step % model.config.N_COARSE_CODEBOOKS == 0
+
+                if use_kv_caching and len(kv_cache) > 0:
+                    x_input = x_in[:, [-1]]
+                    position_ids_input = position_ids[:, [-1]]
+                else:
+                    x_input = x_in
+                    position_ids_input = position_ids
+
+                logits, kv_cache = model.coarse_model(
+                    x_input,
+                    use_cache=use_kv_caching,
+                    past_kv=kv_cache,
+                    position_ids=position_ids_input,
+                    attention_mask=attention_mask,
+                )
+                logit_start_idx = (
+                    model.config.SEMANTIC_VOCAB_SIZE + (1 - int(is_major_step)) * model.config.CODEBOOK_SIZE
+                )
+                logit_end_idx = model.config.SEMANTIC_VOCAB_SIZE + (2 - int(is_major_step)) * model.config.CODEBOOK_SIZE
+                relevant_logits = logits[:, 0, logit_start_idx:logit_end_idx]
+                item_next, _ = _sample_next_tokens(relevant_logits, temp, top_k=top_k, top_p=top_p)
+                item_next = (item_next + logit_start_idx)[:, None]
+                x_coarse_in = torch.cat((x_coarse_in, item_next.int()), dim=1)
+                x_coarse_mask = F.pad(x_coarse_mask, (0, 1), value=True)
+                x_in = torch.cat((x_in, item_next), dim=1)
+                attention_mask = F.pad(attention_mask, (0, 1), value=True)
+                position_ids = torch.cat((position_ids, position_ids[:, [-1]] + 1), dim=1)
+                del logits, relevant_logits, item_next
+                n_step += 1
+            del x_in
+        del x_semantic_ins
+        gen_coarse_arrs = x_coarse_in[:, max_history_len:].detach().cpu().numpy()
+        del x_coarse_in
+    outs = []
+    for gen_coarse_arr, (*_, n_steps_item) in zip(gen_coarse_arrs, inputs):
+        gen_coarse_audio_arr = (
+            gen_coarse_arr[:n_steps_item].reshape(-1, model.config.N_COARSE_CODEBOOKS).T
+            - model.config.SEMANTIC_VOCAB_SIZE
+        )
+        for n in range(1, model.config.N_COARSE_CODEBOOKS):
+            gen_coarse_audio_arr[n, :] -= n * model.config.CODEBOOK_SIZE
+        outs.append(gen_coarse_audio_arr)
+    clear_cuda_cache()
+    return outs
+
+
+def generate_fine_batch(
+    x_coarse_gens,
+    model,
+    history_prompts=None,
+    temp=0.5,
+    silent=True,
+):
+    """Generate the full audio codes of a batch of coarse audio codes together. See `generate_fine()`.
+
+    The windows of 1024 codes of all the sequences are predicted together. The windows of the longer sequences that
+    follow are predicted in smaller batches.
+
+    Args:
+        x_coarse_gens (List[np.ndarray]): The coarse audio codes to generate full audio codes from.
+        model (BarkModel): The BarkModel to use for generating the full audio codes.
+        history_prompts (List[tuple]): A (semantic_history, coarse_history, fine_history) prompt for each sequence.
+            Defaults to None.
+        temp (float): The temperature to use for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+
+    Returns:
+        List[np.ndarray]: The generated full audio codes of each sequence.
+    """
+    if history_prompts is None:
+        history_prompts = [(None, None, None)] * len(x_coarse_gens)
+    n_coarse = x_coarse_gens[0].shape[0]
+    assert all(x.shape[0] == n_coarse for x in x_coarse_gens)
+    inputs = [_prepare_fine_input(x, model, h) for x, h in zip(x_coarse_gens, history_prompts)]
+    with inference_mode():
+        in_arrs = [torch.tensor(in_arr.T).to(model.device) for in_arr, *_ in inputs]
+        for n in tqdm.tqdm(range(max(n_loops for *_, n_loops in inputs)), disable=silent):
+            rows = [i for i, (*_, n_loops) in enumerate(inputs) if n < n_loops]
+            start_idxs = [np.min([n * 512, in_arrs[i].shape[0] - 1024]) for i in rows]
+            start_fill_idxs = [np.min([inputs[i][1] + n * 512, in_arrs[i].shape[0] - 512]) for i in rows]
+            rel_start_fill_idxs = [fill - start for fill, start in zip(start_fill_idxs, start_idxs)]
+            in_buffer = torch.stack([in_arrs[i][start : start + 1024, :] for i, start in zip(rows, start_idxs)])
+            for nn in range(n_coarse, model.config.N_FINE_CODEBOOKS):
+                logits = model.fine_model(nn, in_buffer)
+                relevant_logits = logits[:, :, : model.config.CODEBOOK_SIZE]
+                if temp is None:
+                    codebook_preds = torch.argmax(relevant_logits, -1)
+                else:
+                    probs = F.softmax(relevant_logits / temp, dim=-1)
+                    codebook_preds = torch.multinomial(probs.flatten(0, 1), num_samples=1).view(probs.shape[:2])
+                for j, rel_start_fill_idx in enumerate(rel_start_fill_idxs):
+                    in_buffer[j, rel_start_fill_idx:, nn] = codebook_preds[j, rel_start_fill_idx:]
+                del logits, codebook_preds
+            # transfer over info into model_in
+            for j, (i, start_fill_idx, rel_start_fill_idx) in enumerate(
+                zip(rows, start_fill_idxs, rel_start_fill_idxs)
+            ):
+                in_arrs[i][start_fill_idx : start_fill_idx + (1024 - rel_start_fill_idx), n_coarse:] = in_buffer[
+                    j, rel_start_fill_idx:, n_coarse:
+                ]
+            del in_buffer
+        gen_fine_arrs = [in_arr.detach().cpu().numpy().T for in_arr in in_arrs]
+        del in_arrs
+    outs = []
+    for gen_fine_arr, x_coarse_gen, (_, n_history, n_remove_from_end, _) in zip(gen_fine_arrs, x_coarse_gens, inputs):
+        gen_fine_arr = gen_fine_arr[:, n_history:]
+        if n_remove_from_end > 0:
+            gen_fine_arr = gen_fine_arr[:, :-n_remove_from_end]
+        assert gen_fine_arr.shape[-1] == x_coarse_gen.shape[-1]
+        outs.append(gen_fine_arr)
+    clear_cuda_cache()
+    return outs
+
+
 def codec_decode(fine_tokens, model):
     """Turn quantized audio codes into audio array using encodec."""
     arr = torch.from_numpy(fine_tokens)[None]
@@ -23,6 +23,49 @@ class LayerNorm(nn.Module):
         return F.layer_norm(x, self.weight.shape, self.weight, self.bias, 1e-5)
 
 
+class StaticKVCache:
+    """Key-value cache of all the attention layers of a `GPT`, allocated once for a whole generation.
+
+    The keys and values of the new positions are written in place into preallocated buffers of shape
+    `[n_layer, batch_size, n_head, max_len, head_dim]` instead of concatenating them to the cached ones at every
+    decoding step. `reset()` empties the cache to reuse the buffers, e.g. for the next sliding window.
+
+    Args:
+        n_layer (int): number of attention layers.
+        batch_size (int): number of sequences.
+        n_head (int): number of attention heads.
+        max_len (int): maximum number of cached positions.
+        head_dim (int): dimension of the attention heads.
+        device (torch.device): device of the buffers.
+        dtype (torch.dtype): dtype of the buffers.
+    """
+
+    def __init__(self, n_layer, batch_size, n_head, max_len, head_dim, device=None, dtype=None):
+        self.keys = torch.zeros(n_layer, batch_size, n_head, max_len, head_dim, device=device, dtype=dtype)
+        self.values = torch.zeros_like(self.keys)
+        self.max_len = max_len
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def reset(self):
+        self.length = 0
+
+    def update(self, layer_idx, k, v):
+        """Write the keys and values of the new positions of a layer and return views of all the cached ones.
+        The length of the cache is advanced by `advance()` once all the layers are updated."""
+        end = self.length + k.shape[-2]
+        if end > self.max_len:
+            raise RuntimeError(f" [!] KV cache overflow: {end} positions for a capacity of {self.max_len}.")
+        self.keys[layer_idx, :, :, self.length : end] = k
+        self.values[layer_idx, :, :, self.length : end] = v
+        return self.keys[layer_idx, :, :, :end], self.values[layer_idx, :, :, :end]
+
+    def advance(self, num_positions):
+        self.length += num_positions
+
+
 class CausalSelfAttention(nn.Module):
     def __init__(self, config):
         super().__init__()
@@ -49,7 +92,7 @@ class CausalSelfAttention(nn.Module):
                 ),
             )
 
-    def forward(self, x, past_kv=None, use_cache=False):
+    def forward(self, x, past_kv=None, use_cache=False, kv_cache=None, layer_idx=0, attn_mask=None):
         B, T, C = x.size()  # batch size, sequence length, embedding dimensionality (n_embd)
 
         # calculate query, key, values for all heads in batch and move head forward to be the batch dim
@@ -58,7 +101,10 @@ class CausalSelfAttention(nn.Module):
         q = q.view(B, T, self.n_head, C // self.n_head).transpose(1, 2)  # (B, nh, T, hs)
         v = v.view(B, T, self.n_head, C // self.n_head).transpose(1, 2)  # (B, nh, T, hs)
 
-        if past_kv is not None:
+        if kv_cache is not None:
+            # the static cache is written in place and owned by the caller
+            k, v = kv_cache.update(layer_idx, k, v)
+        elif past_kv is not None:
             past_key = past_kv[0]
             past_value = past_kv[1]
             k = torch.cat((past_key, k), dim=-2)
@@ -66,16 +112,18 @@ class CausalSelfAttention(nn.Module):
 
         FULL_T = k.shape[-2]
 
-        if use_cache is True:
+        if use_cache is True and kv_cache is None:
             present = (k, v)
         else:
             present = None
 
         # causal self-attention; Self-attend: (B, nh, T, hs) x (B, nh, hs, T) -> (B, nh, T, T)
-        if self.flash:
+        if self.flash and attn_mask is not None:
+            y = torch.nn.functional.scaled_dot_product_attention(q, k, v, attn_mask=attn_mask, dropout_p=self.dropout)
+        elif self.flash:
             # efficient attention using Flash Attention CUDA kernels
-            if past_kv is not None:
-                # When `past_kv` is provided, we're doing incremental decoding and `q.shape[2] == 1`: q only contains
+            if FULL_T > T:
+                # When keys and values are cached, we're doing incremental decoding and `q.shape[2] == 1`: q only contains
                 # the query for the last token. scaled_dot_product_attention interprets this as the first token in the
                 # sequence, so if is_causal=True it will mask out all attention from it. This is not what we want, so
                 # to work around this we set is_causal=False.
@@ -88,7 +136,10 @@ class CausalSelfAttention(nn.Module):
         else:
             # manual implementation of attention
             att = (q @ k.transpose(-2, -1)) * (1.0 / math.sqrt(k.size(-1)))
-            att = att.masked_fill(self.bias[:, :, FULL_T - T : FULL_T, :FULL_T] == 0, float("-inf"))
+            if attn_mask is not None:
+                att = att.masked_fill(~attn_mask, float("-inf"))
+            else:
+                att = att.masked_fill(self.bias[:, :, FULL_T - T : FULL_T, :FULL_T] == 0, float("-inf"))
             att = F.softmax(att, dim=-1)
             att = self.attn_dropout(att)
             y = att @ v  # (B, nh, T, T) x (B, nh, T, hs) -> (B, nh, T, hs)
@@ -124,8 +175,15 @@ class Block(nn.Module):
         self.mlp = MLP(config)
         self.layer_idx = layer_idx
 
-    def forward(self, x, past_kv=None, use_cache=False):
-        attn_output, prev_kvs = self.attn(self.ln_1(x), past_kv=past_kv, use_cache=use_cache)
+    def forward(self, x, past_kv=None, use_cache=False, kv_cache=None, attn_mask=None):
+        attn_output, prev_kvs = self.attn(
+            self.ln_1(x),
+            past_kv=past_kv,
+            use_cache=use_cache,
+            kv_cache=kv_cache,
+            layer_idx=self.layer_idx,
+            attn_mask=attn_mask,
+        )
         x = x + attn_output
         x = x + self.mlp(self.ln_2(x))
         return (x, prev_kvs)
@@ -175,9 +233,38 @@ class GPT(nn.Module):
             n_params -= self.transformer.wpe.weight.numel()
         return n_params
 
-    def forward(self, idx, merge_context=False, past_kv=None, position_ids=None, use_cache=False):
+    def new_kv_cache(self, batch_size=1, max_len=None):
+        """Allocate a `StaticKVCache` for generating `batch_size` sequences of up to `max_len` positions. Pass it as
+        `past_kv` at every step of the generation, starting with the first one."""
+        param = self.transformer.wte.weight
+        return StaticKVCache(
+            n_layer=self.config.n_layer,
+            batch_size=batch_size,
+            n_head=self.config.n_head,
+            max_len=max_len or self.config.block_size,
+            head_dim=self.config.n_embd // self.config.n_head,
+            device=param.device,
+            dtype=param.dtype,
+        )
+
+    def forward(self, idx, merge_context=False, past_kv=None, position_ids=None, use_cache=False, attention_mask=None):
+        """
+        Args:
+            idx (torch.LongTensor): input tokens of shape `(b, t)`.
+            merge_context (bool): sum the embeddings of the first 256 text tokens and of the next 256 history tokens.
+            past_kv (Union[Tuple, StaticKVCache]): cached keys and values of the previous positions.
+            position_ids (torch.LongTensor): positions of the input tokens of shape `(1, t)` or `(b, t)`. Defaults to
+                the positions following the cached ones.
+            use_cache (bool): return the keys and values of all the positions.
+            attention_mask (torch.BoolTensor): False for the left padding positions of a batch of sequences, of shape
+                `(b, past_length + t)`. The padding is not attended to and should be skipped by `position_ids`.
+        """
         device = idx.device
         _, t = idx.size()
+        kv_cache = None
+        if isinstance(past_kv, StaticKVCache):
+            kv_cache = past_kv
+            past_kv = past_kv if len(kv_cache) > 0 else None
         if past_kv is not None:
             assert t == 1
             tok_emb = self.transformer.wte(idx)  # token embeddings of shape (b, t, n_embd)
@@ -205,6 +292,9 @@ class GPT(nn.Module):
         if past_kv is None:
             past_length = 0
             past_kv = tuple([None] * len(self.transformer.h))
+        elif kv_cache is not None:
+            past_length = len(kv_cache)
+            past_kv = tuple([None] * len(self.transformer.h))
         else:
             past_length = past_kv[0][0].size(-2)
 
@@ -217,14 +307,27 @@ class GPT(nn.Module):
 
         x = self.transformer.drop(tok_emb + pos_emb)
 
+        attn_mask = None
+        if attention_mask is not None:
+            # the queries attend to the keys that are not padding up to their own position
+            full_t = attention_mask.shape[1]
+            causal_mask = torch.ones(t, full_t, dtype=torch.bool, device=device).tril(full_t - t)
+            attn_mask = causal_mask[None, None] & attention_mask[:, None, None, :]
+            # let the padding queries attend to every key to avoid NaNs, their outputs are never used
+            attn_mask = attn_mask | ~attn_mask.any(-1, keepdim=True)
+
         new_kv = () if use_cache else None
 
         for _, (block, past_layer_kv) in enumerate(zip(self.transformer.h, past_kv)):
-            x, kv = block(x, past_kv=past_layer_kv, use_cache=use_cache)
+            x, kv = block(x, past_kv=past_layer_kv, use_cache=use_cache, kv_cache=kv_cache, attn_mask=attn_mask)
 
             if use_cache:
                 new_kv = new_kv + (kv,)
 
+        if kv_cache is not None:
+            kv_cache.advance(x.shape[1])
+            new_kv = kv_cache
+
         x = self.transformer.ln_f(x)
 
         # inference-time mini-optimization: only forward the lm_head on the very last position
@@ -45,6 +45,8 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
         self.embeddings = embeddings
         self.lm_head = nn.Sequential(norm, linear)
         self.kv_cache = kv_cache
+        # normalized hidden states of the generated tokens, only collected when set to a list
+        self.latents = None
 
     def store_mel_emb(self, mel_emb):
         self.cached_mel_emb = mel_emb
@@ -134,6 +136,8 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
         )
         hidden_states = transformer_outputs[0]
         lm_logits = self.lm_head(hidden_states)
+        if self.latents is not None:
+            self.latents.append(self.lm_head[0](hidden_states[:, -1:]))
 
         if not return_dict:
             return (lm_logits,) + transformer_outputs[1:]
@@ -557,8 +561,16 @@ class UnifiedVoice(nn.Module):
         max_generate_length=None,
         typical_sampling=False,
         typical_mass=0.9,
+        return_latent=False,
         **hf_generate_kwargs,
     ):
+        """Sample mel codes for the text with the HF generate API.
+
+        If `return_latent` is set, the latents of the generated codes are collected during generation and returned
+        with them, so they do not have to be recomputed with `forward(..., return_latent=True)`. They are the same up
+        to the first stop token. After it, they are conditioned on the stop tokens generate pads the finished sequences
+        with instead of the codes written by `fix_autoregressive_output()`.
+        """
         text_inputs = F.pad(text_inputs, (0, 1), value=self.stop_text_token)
         text_inputs, text_targets = self.build_aligned_inputs_and_targets(
             text_inputs, self.start_text_token, self.stop_text_token
@@ -596,16 +608,25 @@ class UnifiedVoice(nn.Module):
         max_length = (
             trunc_index + self.max_mel_tokens - 1 if max_generate_length is None else trunc_index + max_generate_length
         )
-        gen = self.inference_model.generate(
-            inputs,
-            bos_token_id=self.start_mel_token,
-            pad_token_id=self.stop_mel_token,
-            eos_token_id=self.stop_mel_token,
-            max_length=max_length,
-            logits_processor=logits_processor,
-            num_return_sequences=num_return_sequences,
-            **hf_generate_kwargs,
-        )
+        if return_latent:
+            self.inference_model.latents = []
+        try:
+            gen = self.inference_model.generate(
+                inputs,
+                bos_token_id=self.start_mel_token,
+                pad_token_id=self.stop_mel_token,
+                eos_token_id=self.stop_mel_token,
+                max_length=max_length,
+                logits_processor=logits_processor,
+                num_return_sequences=num_return_sequences,
+                **hf_generate_kwargs,
+            )
+            latents = self.inference_model.latents
+        finally:
+            self.inference_model.latents = None
+        if return_latent:
+            # one latent per forward pass, each predicting the next code
+            return gen[:, trunc_index:], torch.cat(latents, dim=1)[:, : gen.shape[1] - trunc_index]
         return gen[:, trunc_index:]
 
 
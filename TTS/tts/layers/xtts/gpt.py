@@ -1,8 +1,10 @@
 # ported from: https://github.com/neonbjb/tortoise-tts
 
 import functools
+import hashlib
 import math
 import random
+from collections import OrderedDict
 
 import torch
 import torch.nn as nn
@@ -108,10 +110,12 @@ class GPT(nn.Module):
         label_smoothing=0.0,
         use_perceiver_resampler=False,
         perceiver_cond_length_compression=256,
+        prefix_cache_size=0,
     ):
         """
         Args:
-
+            prefix_cache_size (int): number of conditioning prefixes whose past key/values are kept for `generate()`,
+                see `get_prefix_key_values()`. 0 disables the cache. Defaults to 0.
         """
         super().__init__()
 
@@ -133,6 +137,8 @@ class GPT(nn.Module):
         self.max_text_tokens = -1 if max_text_tokens == -1 else max_text_tokens + 2
         self.max_prompt_tokens = max_prompt_tokens
         self.code_stride_len = code_stride_len
+        self.prefix_cache_size = prefix_cache_size
+        self.prefix_cache = OrderedDict()
         self.conditioning_encoder = ConditioningEncoder(80, model_dim, num_attn_heads=heads)
         self.conditioning_dropout = nn.Dropout1d(0.1)
         self.average_conditioning_embeddings = average_conditioning_embeddings
@@ -217,6 +223,8 @@ class GPT(nn.Module):
             kv_cache=kv_cache,
         )
         self.gpt.wte = self.mel_embedding
+        # the cached key/values are only valid for the current weights
+        self.prefix_cache = OrderedDict()
 
         if use_deepspeed:
             import deepspeed
@@ -562,10 +570,29 @@ class GPT(nn.Module):
         self,
         cond_latents,
         text_inputs,
+        text_lengths=None,
     ):
+        """Store the embeddings of the conditioning and text prefix for the inference model and return the dummy
+        input ids of the prefix for `generate()`.
+
+        If `text_lengths` is given, `text_inputs` is a right padded batch of texts. The texts are then moved to the
+        end of the prefix, so that all the rows start generating at the same position, and the padding between the
+        conditioning latents and the texts has to be masked, see `generate()`. A single `cond_latents` is shared by
+        all the rows.
+        """
         text_inputs = F.pad(text_inputs, (0, 1), value=self.stop_text_token)
         text_inputs = F.pad(text_inputs, (1, 0), value=self.start_text_token)
+        if text_lengths is not None:
+            text_inputs[torch.arange(text_inputs.shape[0]), text_lengths + 1] = self.stop_text_token
         emb = self.text_embedding(text_inputs) + self.text_pos_embedding(text_inputs)
+        if text_lengths is not None:
+            # left pad each text, its position embeddings still start at 0
+            padding = (text_inputs.shape[1] - 2 - text_lengths).unsqueeze(-1)
+            idxs = torch.arange(emb.shape[1], device=emb.device) - padding
+            emb = emb.gather(1, idxs.clamp(min=0).unsqueeze(-1).expand(-1, -1, emb.shape[-1]))
+            emb = emb * (idxs >= 0).unsqueeze(-1)
+        if cond_latents.shape[0] != emb.shape[0]:
+            cond_latents = cond_latents.expand(emb.shape[0], -1, -1)
         emb = torch.cat([cond_latents, emb], dim=1)
         self.gpt_inference.store_prefix_emb(emb)
         gpt_inputs = torch.full(
@@ -580,24 +607,94 @@ class GPT(nn.Module):
         gpt_inputs[:, -1] = self.start_audio_token
         return gpt_inputs
 
+    def get_prefix_key_values(self, cond_latents, batch_size=None):
+        """Past key/values of the transformer for the conditioning prefix `cond_latents`.
+
+        The key/values are kept in an LRU cache keyed by the content of `cond_latents`, so the generation for a
+        speaker seen recently only encodes the text and audio tokens. The prefix does not attend to the text, so the
+        key/values are the same as the ones of the full sequence. They are repeated along the batch dimension up to
+        `batch_size`.
+
+        Returns None if the cache is disabled or the inference model does not use the KV cache.
+        """
+        if self.prefix_cache_size <= 0 or not self.gpt_inference.kv_cache or hasattr(self, "ds_engine"):
+            return None
+        cond_latents = cond_latents.to(self.mel_embedding.weight.dtype)
+        hasher = hashlib.sha256(f"{tuple(cond_latents.shape)}:{cond_latents.dtype}:{cond_latents.device}".encode())
+        hasher.update(cond_latents.detach().contiguous().view(-1).view(torch.uint8).cpu().numpy().tobytes())
+        key = hasher.hexdigest()
+        if key in self.prefix_cache:
+            self.prefix_cache.move_to_end(key)
+            past_key_values = self.prefix_cache[key]
+        else:
+            with torch.no_grad():
+                past_key_values = self.gpt(inputs_embeds=cond_latents, use_cache=True, return_dict=True).past_key_values
+            self.prefix_cache[key] = past_key_values
+            if len(self.prefix_cache) > self.prefix_cache_size:
+                self.prefix_cache.popitem(last=False)
+        if batch_size is not None and batch_size != cond_latents.shape[0]:
+            past_key_values = tuple(
+                tuple(past_state.repeat_interleave(batch_size // cond_latents.shape[0], 0) for past_state in layer_past)
+                for layer_past in past_key_values
+            )
+        return past_key_values
+
     def generate(
         self,
         cond_latents,
         text_inputs,
+        text_lengths=None,
+        return_latent=False,
         **hf_generate_kwargs,
     ):
-        gpt_inputs = self.compute_embeddings(cond_latents, text_inputs)
-        gen = self.gpt_inference.generate(
-            gpt_inputs,
-            bos_token_id=self.start_audio_token,
-            pad_token_id=self.stop_audio_token,
-            eos_token_id=self.stop_audio_token,
-            max_length=self.max_gen_mel_tokens + gpt_inputs.shape[-1],
-            **hf_generate_kwargs,
-        )
+        """Sample audio codes.
+
+        If `text_lengths` is given, the right padded texts of `text_inputs` are generated in one batch with a shared
+        `cond_latents`. Each row stops at its own stop token and is then filled with stop tokens.
+
+        If `return_latent` is True, the latents of the codes for the HiFi-GAN decoder are collected from the
+        sampling steps and returned after the codes. They are the same as the ones of a teacher forced
+        `forward(..., return_latent=True)` pass over the generated codes, without running it. Beam search reorders
+        the sequences between steps, so it is not supported with `return_latent`.
+        """
+        if return_latent and hf_generate_kwargs.get("num_beams", 1) > 1:
+            raise ValueError(" [!] `return_latent` is not supported with beam search.")
+        gpt_inputs = self.compute_embeddings(cond_latents, text_inputs, text_lengths)
+        if text_lengths is not None:
+            # mask the padding between the conditioning latents and the texts
+            attention_mask = torch.ones_like(gpt_inputs)
+            text_start = gpt_inputs.shape[1] - text_inputs.shape[1] - 3
+            positions = torch.arange(text_inputs.shape[1] + 2, device=gpt_inputs.device)
+            attention_mask[:, text_start:-1] = positions >= (text_inputs.shape[1] - text_lengths).unsqueeze(-1)
+            hf_generate_kwargs["attention_mask"] = attention_mask
+        if "past_key_values" not in hf_generate_kwargs:
+            # generate() expands the inputs to the beams or the returned sequences
+            num_beams = hf_generate_kwargs.get("num_beams", 1)
+            expand_size = num_beams if num_beams > 1 else hf_generate_kwargs.get("num_return_sequences", 1)
+            past_key_values = self.get_prefix_key_values(cond_latents, gpt_inputs.shape[0] * expand_size)
+            if past_key_values is not None:
+                hf_generate_kwargs["past_key_values"] = past_key_values
+        if return_latent:
+            self.gpt_inference.latents = []
+        try:
+            gen = self.gpt_inference.generate(
+                gpt_inputs,
+                bos_token_id=self.start_audio_token,
+                pad_token_id=self.stop_audio_token,
+                eos_token_id=self.stop_audio_token,
+                max_length=self.max_gen_mel_tokens + gpt_inputs.shape[-1],
+                **hf_generate_kwargs,
+            )
+            latents = torch.cat(self.gpt_inference.latents, dim=1) if return_latent else None
+        finally:
+            self.gpt_inference.latents = None
         if "return_dict_in_generate" in hf_generate_kwargs:
-            return gen.sequences[:, gpt_inputs.shape[1] :], gen
-        return gen[:, gpt_inputs.shape[1] :]
+            outputs = (gen.sequences[:, gpt_inputs.shape[1] :], gen)
+        else:
+            outputs = (gen[:, gpt_inputs.shape[1] :],)
+        if return_latent:
+            outputs += (latents,)
+        return outputs if len(outputs) > 1 else outputs[0]
 
     def get_generator(self, fake_inputs, **hf_generate_kwargs):
         return self.gpt_inference.generate_stream(
@@ -17,6 +17,8 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
         self.final_norm = norm
         self.lm_head = nn.Sequential(norm, linear)
         self.kv_cache = kv_cache
+        # list that collects the latent of the last position at every generation step, see `GPT.generate()`
+        self.latents = None
 
     def store_prefix_emb(self, prefix_emb):
         self.cached_prefix_emb = prefix_emb
@@ -26,11 +28,13 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
         if not self.kv_cache:
             past_key_values = None
 
-        # only last token for inputs_ids if past is defined in kwargs
-        if past_key_values is not None:
+        # only last token for inputs_ids if past is defined in kwargs, unless the past only covers a cached
+        # conditioning prefix and the rest of the inputs still have to be encoded
+        past_length = past_key_values[0][0].shape[2] if past_key_values is not None else 0
+        if past_key_values is not None and past_length == input_ids.shape[1] - 1:
             input_ids = input_ids[:, -1].unsqueeze(-1)
-            if token_type_ids is not None:
-                token_type_ids = token_type_ids[:, -1].unsqueeze(-1)
+        if token_type_ids is not None:
+            token_type_ids = token_type_ids[:, past_length:]
 
         attention_mask = kwargs.get("attention_mask", None)
         position_ids = kwargs.get("position_ids", None)
@@ -39,8 +43,7 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
             # create position_ids on the fly for batch generation
             position_ids = attention_mask.long().cumsum(-1) - 1
             position_ids.masked_fill_(attention_mask == 0, 1)
-            if past_key_values is not None:
-                position_ids = position_ids[:, -1].unsqueeze(-1)
+            position_ids = position_ids[:, past_length:]
         else:
             position_ids = None
         return {
@@ -89,6 +92,9 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
             else:
                 prefix_emb = self.cached_prefix_emb.to(gen_emb.dtype)
             emb = torch.cat([prefix_emb, gen_emb], dim=1)
+            if past_key_values is not None:
+                # the past key/values of a cached prefix
+                emb = emb[:, past_key_values[0][0].shape[2] :]
         else:
             emb = self.embeddings(input_ids)
             emb = emb + self.pos_embedding.get_fixed_embedding(
@@ -109,6 +115,8 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
             return_dict=return_dict,
         )
         hidden_states = transformer_outputs[0]
+        if self.latents is not None:
+            self.latents.append(self.final_norm(hidden_states[:, -1:]))
         lm_logits = self.lm_head(hidden_states)
 
         if not return_dict:
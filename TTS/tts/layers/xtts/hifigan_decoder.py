@@ -684,7 +684,20 @@ class HifiDecoder(torch.nn.Module):
             x: [B, C, T]
             Tensor: [B, 1, T]
         """
+        z = self.upsample_latents(latents)
+        o = self.waveform_decoder(z, g=g)
+        return o
+
+    def upsample_latents(self, latents):
+        """Interpolate the GPT latents to the frame rate of the waveform decoder. Every output frame is then decoded
+        to `output_hop_length` samples.
+
+        Args:
+            latents (Tensor): GPT latents.
 
+        Shapes:
+            latents: [B, T, C]
+        """
         z = torch.nn.functional.interpolate(
             latents.transpose(1, 2),
             scale_factor=[self.ar_mel_length_compression / self.output_hop_length],
@@ -697,8 +710,7 @@ class HifiDecoder(torch.nn.Module):
                 scale_factor=[self.output_sample_rate / self.input_sample_rate],
                 mode="linear",
             ).squeeze(0)
-        o = self.waveform_decoder(z, g=g)
-        return o
+        return z
 
     @torch.no_grad()
     def inference(self, c, g):
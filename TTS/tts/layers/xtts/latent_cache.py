@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+import torch
+
+from TTS.utils.io import load_fsspec
+
+
+class ConditioningLatentCache:
+    """LRU cache of the XTTS conditioning latents `(gpt_cond_latent, speaker_embedding)` of reference audios.
+
+    Entries are keyed by the content of the reference files and the settings used to compute the latents, so a
+    renamed file still hits the cache and an edited file does not. If `cache_dir` is set, every entry is also saved
+    to disk and the cache survives restarts. The latents depend on the model weights, so use a separate `cache_dir`
+    for each model or set `namespace` to something identifying the model.
+
+    Args:
+        max_size (int, optional): maximum number of entries kept in memory. Defaults to 32.
+        cache_dir (str, optional): directory to persist the entries to. Defaults to None.
+        namespace (str, optional): extra string hashed into every key. Defaults to "".
+    """
+
+    def __init__(self, max_size: int = 32, cache_dir: str = None, namespace: str = ""):
+        assert max_size > 0, " [!] `max_size` must be a positive integer."
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, audio_path: Union[str, List[str]], **settings) -> str:
+        """Hash the bytes of the reference files, the settings and the namespace."""
+        audio_paths = audio_path if isinstance(audio_path, list) else [audio_path]
+        hasher = hashlib.sha256(self.namespace.encode("utf-8"))
+        for file_path in audio_paths:
+            with open(file_path, "rb") as f:
+                hasher.update(hashlib.sha256(f.read()).digest())
+        hasher.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pth")
+
+    def get(self, key: str) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Return the cached latents on CPU or None if `key` is not in the cache."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if self.cache_dir is not None and os.path.isfile(self._file_path(key)):
+            state = load_fsspec(self._file_path(key), map_location="cpu")
+            latents = (state["gpt_cond_latent"], state["speaker_embedding"])
+            with self._lock:
+                self.hits += 1
+                self._add(key, latents)
+            return latents
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, gpt_cond_latent: torch.Tensor, speaker_embedding: torch.Tensor) -> None:
+        latents = (gpt_cond_latent.detach().cpu(), speaker_embedding.detach().cpu())
+        with self._lock:
+            self._add(key, latents)
+        if self.cache_dir is not None:
+            # write to a temporary file first so a concurrent reader never loads a partial file
+            tmp_path = f"{self._file_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            torch.save({"gpt_cond_latent": latents[0], "speaker_embedding": latents[1]}, tmp_path)
+            os.replace(tmp_path, self._file_path(key))
+
+    def _add(self, key: str, latents: Tuple[torch.Tensor, torch.Tensor]) -> None:
+        self._entries[key] = latents
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the entries kept in memory. The files in `cache_dir` are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from TTS.tts.models.xtts import load_audio
+
+STORE_VERSION = 1
+# arrays start at multiples of this many bytes so every dtype can be viewed in place
+ALIGNMENT = 64
+
+
+def _sample_key(sample: Dict) -> str:
+    return sample.get("audio_unique_name", None) or sample["audio_file"]
+
+
+def extract_dvae_codes(model, samples: List[Dict], output_path: str, shard_size: int = 2**28, verbose: bool = True):
+    """Write the DVAE codes, the text tokens and the audio lengths of the samples to memory-mappable shard files with
+    a JSON index, to be read by `DVAECodeStore`. Set `model_args.dvae_codes_path` to `output_path` to fine-tune from
+    the store instead of running the DVAE on every training step.
+
+    The audio files are decoded at `config.audio.sample_rate` as in `XTTSDataset` and the codes are computed one
+    sample at a time by `GPTTrainer.compute_dvae_codes()` on the device of the model. The samples that cannot be
+    loaded or whose text has unknown tokens are skipped, the dataset then ignores them as failed samples.
+
+    Args:
+        model (GPTTrainer): model with the DVAE, its mel spectrogram extractor and the tokenizer.
+        samples (List[Dict]): samples from `load_tts_samples()`.
+        output_path (str): directory of the shard files and `index.json`.
+        shard_size (int): size in bytes after which a new shard file is started. Defaults to 256MB.
+        verbose (bool): show a progress bar. Defaults to True.
+
+    Returns:
+        Dict: the index of the store.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    codes_dtype = np.int16 if model.args.gpt_num_audio_tokens <= 2**15 else np.int32
+    # write to temporary files first so a reader never sees a partial store
+    suffix = f".{os.getpid()}.tmp"
+    shards = []
+    entries = []
+    f = None
+    offset = 0
+    try:
+        for sample in tqdm(samples, desc=" > Extracting DVAE codes", disable=not verbose):
+            try:
+                text_tokens = model.xtts.tokenizer.encode(str(sample["text"]), sample["language"])
+                wav = load_audio(sample["audio_file"], model.config.audio.sample_rate)
+            except Exception as e:  # pylint: disable=broad-except
+                print(f" [!] Skipping {sample['audio_file']}: {e}")
+                continue
+            # unknown and stop tokens, see `XTTSDataset.get_text()`
+            if any(token in (0, 1) for token in text_tokens):
+                print(f" [!] Skipping {sample['audio_file']}: unknown tokens in {sample['text']}")
+                continue
+            codes = model.compute_dvae_codes(wav.unsqueeze(0).to(model.device))[0]
+            arrays = {
+                "codes": codes.cpu().numpy().astype(codes_dtype),
+                "text_tokens": np.asarray(text_tokens, dtype=np.int32),
+            }
+
+            if f is None or offset >= shard_size:
+                if f is not None:
+                    f.close()
+                shards.append(f"shard_{len(shards):05d}.bin")
+                f = open(os.path.join(output_path, shards[-1] + suffix), "wb")  # pylint: disable=consider-using-with
+                offset = 0
+            entry = {"key": _sample_key(sample), "audio_length": wav.shape[-1], "shard": len(shards) - 1, "arrays": {}}
+            for name, array in arrays.items():
+                entry["arrays"][name] = [offset, array.dtype.str, list(array.shape)]
+                f.write(array.tobytes())
+                offset += array.nbytes
+                padding = -offset % ALIGNMENT
+                f.write(b"\0" * padding)
+                offset += padding
+            entries.append(entry)
+    finally:
+        if f is not None:
+            f.close()
+
+    index = {
+        "version": STORE_VERSION,
+        "sample_rate": model.config.audio.sample_rate,
+        "num_text_tokens": model.xtts.tokenizer.get_number_tokens(),
+        "shards": shards,
+        "samples": entries,
+    }
+    with open(os.path.join(output_path, "index.json") + suffix, "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file)
+    for shard in shards:
+        os.replace(os.path.join(output_path, shard + suffix), os.path.join(output_path, shard))
+    os.replace(os.path.join(output_path, "index.json") + suffix, os.path.join(output_path, "index.json"))
+    return index
+
+
+class DVAECodeStore:
+    """Reader of the DVAE codes, text tokens and audio lengths written by `extract_dvae_codes()`.
+
+    The samples are looked up by `audio_unique_name` and their arrays are read from memory-mapped shard files.
+    Every data loader worker maps the shards on its own.
+
+    Args:
+        store_path (str): directory of the store.
+    """
+
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        with open(os.path.join(store_path, "index.json"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["version"] != STORE_VERSION:
+            raise ValueError(f" [!] Unsupported DVAE code store version {index['version']} in {store_path}.")
+        self.sample_rate = index["sample_rate"]
+        self.num_text_tokens = index["num_text_tokens"]
+        self.shards = index["shards"]
+        self.entries = {entry["key"]: entry for entry in index["samples"]}
+        self._shard_data = {}
+
+    def check_compatible(self, sample_rate: int, tokenizer):
+        """Raise a ValueError if the store was written for another sample rate or tokenizer."""
+        if sample_rate != self.sample_rate:
+            raise ValueError(
+                f" [!] The DVAE code store sample rate {self.sample_rate} does not match the dataset sample rate {sample_rate}."
+            )
+        if tokenizer.get_number_tokens() != self.num_text_tokens:
+            raise ValueError(" [!] The DVAE code store was written with a different tokenizer vocabulary.")
+
+    def __contains__(self, sample: Dict) -> bool:
+        return _sample_key(sample) in self.entries
+
+    def shard_data(self, shard: int) -> np.ndarray:
+        # map the shards lazily so every worker process maps them on its own
+        if shard not in self._shard_data:
+            self._shard_data[shard] = np.memmap(
+                os.path.join(self.store_path, self.shards[shard]), dtype=np.uint8, mode="r"
+            )
+        return self._shard_data[shard]
+
+    def load(self, sample: Dict) -> Dict:
+        """Read the `codes`, `text_tokens` and `audio_length` of a sample. Raise a KeyError if it is not stored."""
+        entry = self.entries[_sample_key(sample)]
+        data = self.shard_data(entry["shard"])
+        item = {"audio_length": entry["audio_length"]}
+        for name, (offset, dtype, shape) in entry["arrays"].items():
+            count = int(np.prod(shape))
+            # copy the values out of the read-only map
+            array = np.frombuffer(data, dtype=np.dtype(dtype), count=count, offset=offset).reshape(shape)
+            item[name] = torch.from_numpy(array.astype(np.int64 if name == "codes" else np.int32))
+        return item
+
+    def __getstate__(self) -> Dict:
+        # do not pickle the mapped shards, workers map the files themselves
+        state = self.__dict__.copy()
+        state["_shard_data"] = {}
+        return state
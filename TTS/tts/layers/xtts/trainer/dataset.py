@@ -23,8 +23,9 @@ def key_samples_by_col(samples, col):
     return samples_by_col
 
 
-def get_prompt_slice(gt_path, max_sample_length, min_sample_length, sample_rate, is_eval=False):
-    rel_clip = load_audio(gt_path, sample_rate)
+def get_prompt_slice(gt_path, max_sample_length, min_sample_length, sample_rate, is_eval=False, audio=None):
+    # `audio` is the already decoded `gt_path`
+    rel_clip = load_audio(gt_path, sample_rate) if audio is None else audio
     # if eval uses a middle size sample when it is possible to be more reproducible
     if is_eval:
         sample_length = int((min_sample_length + max_sample_length) / 2)
@@ -49,7 +50,13 @@ def get_prompt_slice(gt_path, max_sample_length, min_sample_length, sample_rate,
 
 
 class XTTSDataset(torch.utils.data.Dataset):
-    def __init__(self, config, samples, tokenizer, sample_rate, is_eval=False):
+    def __init__(self, config, samples, tokenizer, sample_rate, is_eval=False, code_store=None):
+        """
+        Args:
+            code_store (DVAECodeStore): if given, the DVAE codes and the text tokens are read from the store and the
+                batches have `audio_codes` instead of `wav`. The audio files are only decoded for the conditioning.
+                Defaults to None.
+        """
         self.config = config
         model_args = config.model_args
         self.failed_samples = set()
@@ -63,6 +70,9 @@ class XTTSDataset(torch.utils.data.Dataset):
         self.max_text_len = model_args.max_text_length
         self.use_masking_gt_prompt_approach = model_args.gpt_use_masking_gt_prompt_approach
         assert self.max_wav_len is not None and self.max_text_len is not None
+        self.code_store = code_store
+        if code_store is not None:
+            code_store.check_compatible(sample_rate, tokenizer)
 
         self.samples = samples
         if not is_eval:
@@ -81,7 +91,7 @@ class XTTSDataset(torch.utils.data.Dataset):
         new_samples = []
         for sample in self.samples:
             try:
-                tseq, _, wav, _, _, _ = self.load_item(sample)
+                tseq, _, wav, _, _, _, _ = self.load_item(sample)
             except:
                 continue
             # Basically, this audio file is nonexistent or too long to be supported by the dataset.
@@ -105,8 +115,13 @@ class XTTSDataset(torch.utils.data.Dataset):
 
     def load_item(self, sample):
         text = str(sample["text"])
-        tseq = self.get_text(text, sample["language"])
         audiopath = sample["audio_file"]
+        codes = None
+        if self.code_store is not None:
+            stored = self.code_store.load(sample)
+            tseq, codes = stored["text_tokens"], stored["codes"]
+        else:
+            tseq = self.get_text(text, sample["language"])
         wav = load_audio(audiopath, self.sample_rate)
         if text is None or len(text.strip()) == 0:
             raise ValueError
@@ -117,7 +132,12 @@ class XTTSDataset(torch.utils.data.Dataset):
         if self.use_masking_gt_prompt_approach:
             # get a slice from GT to condition the model
             cond, _, cond_idxs = get_prompt_slice(
-                audiopath, self.max_conditioning_length, self.min_conditioning_length, self.sample_rate, self.is_eval
+                audiopath,
+                self.max_conditioning_length,
+                self.min_conditioning_length,
+                self.sample_rate,
+                self.is_eval,
+                audio=wav,
             )
             # if use masking do not use cond_len
             cond_len = torch.nan
@@ -128,12 +148,17 @@ class XTTSDataset(torch.utils.data.Dataset):
                 else audiopath
             )
             cond, cond_len, _ = get_prompt_slice(
-                ref_sample, self.max_conditioning_length, self.min_conditioning_length, self.sample_rate, self.is_eval
+                ref_sample,
+                self.max_conditioning_length,
+                self.min_conditioning_length,
+                self.sample_rate,
+                self.is_eval,
+                audio=wav if ref_sample == audiopath else None,
             )
             # if do not use masking use cond_len
             cond_idxs = torch.nan
 
-        return tseq, audiopath, wav, cond, cond_len, cond_idxs
+        return tseq, audiopath, wav, cond, cond_len, cond_idxs, codes
 
     def __getitem__(self, index):
         if self.is_eval:
@@ -157,7 +182,7 @@ class XTTSDataset(torch.utils.data.Dataset):
 
         # try to load the sample, if fails added it to the failed samples list
         try:
-            tseq, audiopath, wav, cond, cond_len, cond_idxs = self.load_item(sample)
+            tseq, audiopath, wav, cond, cond_len, cond_idxs, codes = self.load_item(sample)
         except:
             if self.debug_failures:
                 print(f"error loading {sample['audio_file']} {sys.exc_info()}")
@@ -192,6 +217,10 @@ class XTTSDataset(torch.utils.data.Dataset):
             else torch.tensor([cond_len]),
             "cond_idxs": torch.tensor(cond_idxs) if cond_idxs is not torch.nan else torch.tensor([cond_idxs]),
         }
+        if codes is not None:
+            # the codes replace the waveform, which is only needed to compute them
+            res["audio_codes"] = codes
+            del res["wav"]
         return res
 
     def __len__(self):
@@ -219,21 +248,31 @@ class XTTSDataset(torch.utils.data.Dataset):
             batch["cond_lens"] = None
 
         max_text_len = batch["text_lengths"].max()
-        max_wav_len = batch["wav_lengths"].max()
 
         # create padding tensors
         text_padded = torch.IntTensor(B, max_text_len)
-        wav_padded = torch.FloatTensor(B, 1, max_wav_len)
 
         # initialize tensors for zero padding
         text_padded = text_padded.zero_()
-        wav_padded = wav_padded.zero_()
         for i in range(B):
             text = batch["text"][i]
             text_padded[i, : batch["text_lengths"][i]] = torch.IntTensor(text)
-            wav = batch["wav"][i]
-            wav_padded[i, :, : batch["wav_lengths"][i]] = torch.FloatTensor(wav)
 
-        batch["wav"] = wav_padded
+        if "audio_codes" in batch:
+            # the padding is replaced by stop tokens in `GPT.forward()`
+            max_codes_len = max(codes.shape[-1] for codes in batch["audio_codes"])
+            codes_padded = torch.zeros(B, max_codes_len, dtype=torch.long)
+            for i, codes in enumerate(batch["audio_codes"]):
+                codes_padded[i, : codes.shape[-1]] = codes
+            batch["audio_codes"] = codes_padded
+        else:
+            max_wav_len = batch["wav_lengths"].max()
+            wav_padded = torch.FloatTensor(B, 1, max_wav_len)
+            wav_padded = wav_padded.zero_()
+            for i in range(B):
+                wav = batch["wav"][i]
+                wav_padded[i, :, : batch["wav_lengths"][i]] = torch.FloatTensor(wav)
+            batch["wav"] = wav_padded
+
         batch["padded_text"] = text_padded
         return batch
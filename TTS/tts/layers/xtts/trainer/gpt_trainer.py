@@ -15,6 +15,7 @@ from TTS.tts.datasets.dataset import TTSDataset
 from TTS.tts.layers.tortoise.arch_utils import TorchMelSpectrogram
 from TTS.tts.layers.xtts.dvae import DiscreteVAE
 from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer
+from TTS.tts.layers.xtts.trainer.code_store import DVAECodeStore
 from TTS.tts.layers.xtts.trainer.dataset import XTTSDataset
 from TTS.tts.models.base_tts import BaseTTS
 from TTS.tts.models.xtts import Xtts, XttsArgs, XttsAudioConfig
@@ -49,6 +50,8 @@ class GPTArgs(XttsArgs):
     tokenizer_file: str = ""
     mel_norm_file: str = "https://coqui.gateway.scarf.sh/v0.14.0_models/mel_norms.pth"
     dvae_checkpoint: str = ""
+    # DVAE code store written by `extract_dvae_codes()`, the codes are computed on the fly if empty
+    dvae_codes_path: str = ""
     xtts_checkpoint: str = ""
     gpt_checkpoint: str = ""  # if defined it will replace the gpt weights on xtts model
     vocoder: str = ""  # overide vocoder key on the config to avoid json write issues
@@ -272,10 +275,26 @@ class GPTTrainer(BaseTTS):
         paired_conditioning_mel = paired_conditioning_mel.view(B, num_cond_samples, n_mel, T_mel)
         # get the conditioning embeddings
         batch["cond_mels"] = paired_conditioning_mel
-        # compute codes using DVAE
+        # the codes are read from the DVAE code store if the dataset uses one
+        if "audio_codes" not in batch:
+            batch["audio_codes"] = self.compute_dvae_codes(batch["wav"])
+            del batch["wav"]
+        # delete useless batch tensors
+        del batch["padded_text"]
+        del batch["conditioning"]
+        return batch
+
+    @torch.no_grad()
+    def compute_dvae_codes(self, wav):
+        """Compute the DVAE codes of waveforms at `config.audio.sample_rate`.
+
+        Shapes:
+            wav: [B, 1, T]
+            codes: [B, T_codes]
+        """
         if self.config.audio.sample_rate != self.config.audio.dvae_sample_rate:
-            dvae_wav = torchaudio.functional.resample(
-                batch["wav"],
+            wav = torchaudio.functional.resample(
+                wav,
                 orig_freq=self.config.audio.sample_rate,
                 new_freq=self.config.audio.dvae_sample_rate,
                 lowpass_filter_width=64,
@@ -283,17 +302,8 @@ class GPTTrainer(BaseTTS):
                 resampling_method="kaiser_window",
                 beta=14.769656459379492,
             )
-        else:
-            dvae_wav = batch["wav"]
-        dvae_mel_spec = self.torch_mel_spectrogram_dvae(dvae_wav)
-        codes = self.dvae.get_codebook_indices(dvae_mel_spec)
-
-        batch["audio_codes"] = codes
-        # delete useless batch tensors
-        del batch["padded_text"]
-        del batch["wav"]
-        del batch["conditioning"]
-        return batch
+        dvae_mel_spec = self.torch_mel_spectrogram_dvae(wav)
+        return self.dvae.get_codebook_indices(dvae_mel_spec)
 
     def train_step(self, batch, criterion):
         loss_dict = {}
@@ -363,8 +373,13 @@ class GPTTrainer(BaseTTS):
         if is_eval and not config.run_eval:
             loader = None
         else:
+            if config.get("packed_dataset_path", None):
+                raise ValueError(" [!] `packed_dataset_path` is only supported by the models that use `TTSDataset`.")
             # init dataloader
-            dataset = XTTSDataset(self.config, samples, self.xtts.tokenizer, config.audio.sample_rate, is_eval)
+            code_store = DVAECodeStore(self.args.dvae_codes_path) if self.args.dvae_codes_path else None
+            dataset = XTTSDataset(
+                self.config, samples, self.xtts.tokenizer, config.audio.sample_rate, is_eval, code_store=code_store
+            )
 
             # wait all the DDP process to be ready
             if num_gpus > 1:
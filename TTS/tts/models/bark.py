@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 import numpy as np
 from coqpit import Coqpit
@@ -10,8 +10,11 @@ from transformers import BertTokenizer
 from TTS.tts.layers.bark.inference_funcs import (
     codec_decode,
     generate_coarse,
+    generate_coarse_batch,
     generate_fine,
+    generate_fine_batch,
     generate_text_semantic,
+    generate_text_semantic_batch,
     generate_voice,
     load_voice,
 )
@@ -163,6 +166,39 @@ class Bark(BaseTTS):
         )
         return audio_arr, [x_semantic, c, f]
 
+    def generate_audio_batch(
+        self,
+        texts: List[str],
+        history_prompts: Optional[List] = None,
+        text_temp: float = 0.7,
+        waveform_temp: float = 0.7,
+        allow_early_stop=True,
+        **kwargs,
+    ):
+        """Generate the audio of a batch of texts together. Each stage runs on the whole batch, which is faster than
+        `generate_audio()` for each text when there are many texts to narrate.
+
+        Args:
+            texts: texts to be turned into audio
+            history_prompts: history choice for audio cloning of each text. Defaults to None.
+            text_temp: generation temperature (1.0 more diverse, 0.0 more conservative)
+            waveform_temp: generation temperature (1.0 more diverse, 0.0 more conservative)
+
+        Returns:
+            the outputs of `generate_audio()` for each text
+        """
+        x_semantics = generate_text_semantic_batch(
+            texts,
+            self,
+            history_prompts=history_prompts,
+            temp=text_temp,
+            allow_early_stop=allow_early_stop,
+            **kwargs,
+        )
+        x_coarse_gens = generate_coarse_batch(x_semantics, self, history_prompts=history_prompts, temp=waveform_temp)
+        x_fine_gens = generate_fine_batch(x_coarse_gens, self, history_prompts=history_prompts, temp=0.5)
+        return [(codec_decode(f, self), [s, c, f]) for s, c, f in zip(x_semantics, x_coarse_gens, x_fine_gens)]
+
     def generate_voice(self, audio, speaker_id, voice_dir):
         """Generate a voice from the given audio and text.
 
@@ -225,6 +261,31 @@ class Bark(BaseTTS):
 
         return return_dict
 
+    def synthesize_batch(
+        self, texts, config, speaker_ids="random", voice_dirs=None, **kwargs
+    ):  # pylint: disable=unused-argument
+        """Synthesize speech for a batch of texts together. See `synthesize()`.
+
+        Args:
+            texts (List[str]): Input texts.
+            config (BarkConfig): Config with inference parameters.
+            speaker_ids (Union[str, List[str]]): Speaker name for all the texts or for each text. If `random`, it
+                generates a random speaker.
+            voice_dirs (List[str]): List of paths that host reference audio files for speakers. Defaults to None.
+            **kwargs: Model specific inference settings used by `generate_audio_batch()`.
+
+        Returns:
+            A list of the `synthesize()` output dictionaries of each text.
+        """
+        if speaker_ids is None or isinstance(speaker_ids, str):
+            speaker_ids = [speaker_ids] * len(texts)
+        voice_dirs = self._set_voice_dirs(voice_dirs)
+        history_prompts = [
+            load_voice(self, "random" if speaker_id is None else speaker_id, voice_dirs) for speaker_id in speaker_ids
+        ]
+        outputs = self.generate_audio_batch(texts, history_prompts=history_prompts, **kwargs)
+        return [{"wav": output[0], "text_inputs": text} for output, text in zip(outputs, texts)]
+
     def eval_step(self):
         ...
 
@@ -11,12 +11,14 @@ from torch.utils.data.sampler import WeightedRandomSampler
 from trainer.torch import DistributedSampler, DistributedSamplerWrapper
 
 from TTS.model import BaseTrainerModel
-from TTS.tts.datasets.dataset import TTSDataset
+from TTS.tts.datasets.dataset import TTSDataset, pad_spectrogram
+from TTS.tts.datasets.packed_dataset import PackedTTSDataset
 from TTS.tts.utils.data import get_length_balancer_weights
 from TTS.tts.utils.languages import LanguageManager, get_language_balancer_weights
 from TTS.tts.utils.speakers import SpeakerManager, get_speaker_balancer_weights, get_speaker_manager
 from TTS.tts.utils.synthesis import synthesis
 from TTS.tts.utils.visual import plot_alignment, plot_spectrogram
+from TTS.utils.audio.torch_transforms import BatchSpectrogram
 
 # pylint: skip-file
 
@@ -237,8 +239,39 @@ class BaseTTS(BaseTrainerModel):
             "energy": energy,
             "language_ids": language_ids,
             "audio_unique_names": batch["audio_unique_names"],
+            "spec_waveform": batch.get("spec_waveform", None),
+            "spec_waveform_lengths": batch.get("spec_waveform_lengths", None),
         }
 
+    def format_batch_on_device(self, batch: Dict) -> Dict:
+        """Compute the spectrograms of the batch on the training device with `BatchSpectrogram` if the dataset
+        returned the waveforms instead, i.e. `spectrogram_backend` is `device`.
+
+        Args:
+            batch (Dict): batch formatted by `format_batch()` and moved to the device.
+
+        Returns:
+            Dict: the batch with `mel_input` and, if needed, `linear_input`.
+        """
+        spec_waveform = batch.get("spec_waveform", None)
+        if spec_waveform is None:
+            return batch
+        if getattr(self, "batch_spectrogram", None) is None:
+            self.batch_spectrogram = BatchSpectrogram(self.ap).to(spec_waveform.device)
+        lengths = batch["spec_waveform_lengths"]
+        r = self.config.get("r", 1)
+        max_length = int(torch.ceil(batch["mel_lengths"].max() / r)) * r
+        with torch.no_grad():
+            if batch["mel_input"] is None:
+                mel = self.batch_spectrogram.melspectrogram(spec_waveform, lengths)
+                batch["mel_input"] = pad_spectrogram(mel, max_length)
+            if batch["linear_input"] is None and (
+                self.config.model.lower() == "tacotron" or self.config.get("compute_linear_spec", False)
+            ):
+                linear = self.batch_spectrogram.spectrogram(spec_waveform, lengths)
+                batch["linear_input"] = pad_spectrogram(linear, max_length)
+        return batch
+
     def get_sampler(self, config: Coqpit, dataset: TTSDataset, num_gpus=1):
         weights = None
         data_items = dataset.samples
@@ -312,7 +345,12 @@ class BaseTTS(BaseTrainerModel):
                 language_id_mapping = None
 
             # init dataloader
-            dataset = TTSDataset(
+            dataset_kwargs = {}
+            dataset_class = TTSDataset
+            if config.get("packed_dataset_path", None):
+                dataset_kwargs["pack_path"] = config.packed_dataset_path
+                dataset_class = PackedTTSDataset
+            dataset = dataset_class(
                 outputs_per_step=config.r if "r" in config else 1,
                 compute_linear_spec=config.model.lower() == "tacotron" or config.compute_linear_spec,
                 compute_f0=config.get("compute_f0", False),
@@ -336,6 +374,9 @@ class BaseTTS(BaseTrainerModel):
                 tokenizer=self.tokenizer,
                 start_by_longest=config.start_by_longest,
                 language_id_mapping=language_id_mapping,
+                spectrogram_backend=config.get("spectrogram_backend", "numpy"),
+                mel_cache_path=config.get("mel_cache_path", None),
+                **dataset_kwargs,
             )
 
             # wait all the DDP process to be ready
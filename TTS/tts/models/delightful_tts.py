@@ -1,7 +1,6 @@
 import os
 from dataclasses import dataclass, field
 from itertools import chain
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
@@ -18,7 +17,7 @@ from torch.utils.data.sampler import WeightedRandomSampler
 from trainer.torch import DistributedSampler, DistributedSamplerWrapper
 from trainer.trainer_utils import get_optimizer, get_scheduler
 
-from TTS.tts.datasets.dataset import F0Dataset, TTSDataset, _parse_sample
+from TTS.tts.datasets.dataset import F0Dataset, TTSDataset, string2filename
 from TTS.tts.layers.delightful_tts.acoustic_model import AcousticModel
 from TTS.tts.layers.losses import ForwardSumLoss, VitsDiscriminatorLoss
 from TTS.tts.layers.vits.discriminator import VitsDiscriminator
@@ -366,6 +365,15 @@ class ForwardTTSE2eF0Dataset(F0Dataset):
             pitch = np.load(pitch_file)
         return pitch.astype(np.float32)
 
+    def compute_or_load_batch(self, indices):
+        # the pitch is computed on the raw audio files one by one
+        return [
+            self.compute_or_load(
+                self.samples[idx]["audio_file"], string2filename(self.samples[idx]["audio_unique_name"])
+            )
+            for idx in indices
+        ]
+
 
 class ForwardTTSE2eDataset(TTSDataset):
     def __init__(self, *args, **kwargs):
@@ -394,9 +402,6 @@ class ForwardTTSE2eDataset(TTSDataset):
     def __getitem__(self, idx):
         item = self.samples[idx]
 
-        rel_wav_path = Path(item["audio_file"]).relative_to(item["root_path"]).with_suffix("")
-        rel_wav_path = str(rel_wav_path).replace("/", "_")
-
         raw_text = item["text"]
         wav, _ = load_audio(item["audio_file"])
         wav_filename = os.path.basename(item["audio_file"])
@@ -420,7 +425,7 @@ class ForwardTTSE2eDataset(TTSDataset):
 
         attn_prior = None
         if self.attn_prior_cache_path is not None:
-            attn_prior = self.load_or_compute_attn_prior(token_ids, wav, rel_wav_path)
+            attn_prior = self.load_or_compute_attn_prior(token_ids, wav)
 
         return {
             "raw_text": raw_text,
@@ -435,27 +440,11 @@ class ForwardTTSE2eDataset(TTSDataset):
             "audio_unique_name": item["audio_unique_name"],
         }
 
-    def load_or_compute_attn_prior(self, token_ids, wav, rel_wav_path):
-        """Load or compute and save the attention prior."""
-        attn_prior_file = os.path.join(self.attn_prior_cache_path, f"{rel_wav_path}.npy")
-        # pylint: disable=no-else-return
-        if os.path.exists(attn_prior_file):
-            return np.load(attn_prior_file)
-        else:
-            token_len = len(token_ids)
-            mel_len = wav.shape[1] // self.ap.hop_length
-            attn_prior = compute_attn_prior(token_len, mel_len)
-            np.save(attn_prior_file, attn_prior)
-            return attn_prior
-
-    @property
-    def lengths(self):
-        lens = []
-        for item in self.samples:
-            _, wav_file, *_ = _parse_sample(item)
-            audio_len = os.path.getsize(wav_file) / 16 * 8  # assuming 16bit audio
-            lens.append(audio_len)
-        return lens
+    def load_or_compute_attn_prior(self, token_ids, wav):
+        """Load or compute and save the attention prior. The priors are cached by the token and mel lengths."""
+        token_len = len(token_ids)
+        mel_len = wav.shape[1] // self.ap.hop_length
+        return compute_attn_prior(token_len, mel_len, cache_path=self.attn_prior_cache_path)
 
     def collate_fn(self, batch):
         """
@@ -1434,6 +1423,8 @@ class DelightfulTTS(BaseTTSE2E):
         if is_eval and not config.run_eval:
             loader = None
         else:
+            if config.get("packed_dataset_path", None):
+                raise ValueError(" [!] `packed_dataset_path` is only supported by the models that use `TTSDataset`.")
             # init dataloader
             dataset = ForwardTTSE2eDataset(
                 samples=samples,
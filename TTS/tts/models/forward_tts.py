@@ -368,7 +368,8 @@ class ForwardTTS(BaseTTS):
         """
         o_dr = (torch.exp(o_dr_log) - 1) * x_mask * self.length_scale
         o_dr[o_dr < 1] = 1.0
-        o_dr = torch.round(o_dr)
+        # padded inputs must not add frames in batch mode
+        o_dr = torch.round(o_dr) * x_mask
         return o_dr
 
     def _forward_encoder(
@@ -673,6 +674,9 @@ class ForwardTTS(BaseTTS):
     def inference(self, x, aux_input={"d_vectors": None, "speaker_ids": None}):  # pylint: disable=unused-argument
         """Model's inference pass.
 
+        Note:
+            To run in batch mode, provide `x_lengths` in `aux_input` else model assumes that the batch size is 1.
+
         Args:
             x (torch.LongTensor): Input character sequence.
             aux_input (Dict): Auxiliary model inputs. Defaults to `{"d_vectors": None, "speaker_ids": None}`.
@@ -683,7 +687,9 @@ class ForwardTTS(BaseTTS):
             - g: [B, C]
         """
         g = self._set_speaker_input(aux_input)
-        x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
+        x_lengths = aux_input.get("x_lengths", None)
+        if x_lengths is None:
+            x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
         x_mask = torch.unsqueeze(sequence_mask(x_lengths, x.shape[1]), 1).to(x.dtype).float()
         # encoder pass
         o_en, x_mask, g, _ = self._forward_encoder(x, x_mask, g)
@@ -704,12 +710,14 @@ class ForwardTTS(BaseTTS):
             o_en = o_en + o_energy_emb
         # decoder pass
         o_de, attn = self._forward_decoder(o_en, o_dr, x_mask, y_lengths, g=None)
+        y_mask = torch.unsqueeze(sequence_mask(y_lengths, o_de.shape[1]), 1).to(o_de.dtype)
         outputs = {
             "model_outputs": o_de,
             "alignments": attn,
             "pitch": o_pitch,
             "energy": o_energy,
             "durations_log": o_dr_log,
+            "y_mask": y_mask,
         }
         return outputs
 
@@ -11,6 +11,7 @@ from TTS.tts.layers.tacotron.capacitron_layers import CapacitronVAE
 from TTS.tts.layers.tacotron.gst_layers import GST
 from TTS.tts.layers.tacotron.tacotron2 import Decoder, Encoder, Postnet
 from TTS.tts.models.base_tacotron import BaseTacotron
+from TTS.tts.utils.helpers import sequence_mask
 from TTS.tts.utils.measures import alignment_diagonal_score
 from TTS.tts.utils.speakers import SpeakerManager
 from TTS.tts.utils.text.tokenizer import TTSTokenizer
@@ -239,13 +240,21 @@ class Tacotron2(BaseTacotron):
     def inference(self, text, aux_input=None):
         """Forward pass for inference with no Teacher-Forcing.
 
+        Note:
+            To run in batch mode, provide `x_lengths` in `aux_input` with the inputs sorted by decreasing length.
+
         Shapes:
            text: :math:`[B, T_in]`
            text_lengths: :math:`[B]`
         """
         aux_input = self._format_aux_input(aux_input)
         embedded_inputs = self.embedding(text).transpose(1, 2)
-        encoder_outputs = self.encoder.inference(embedded_inputs)
+        input_mask = None
+        if text.shape[0] > 1 and aux_input is not None and aux_input.get("x_lengths", None) is not None:
+            input_mask = sequence_mask(aux_input["x_lengths"], text.shape[1])
+            encoder_outputs = self.encoder(embedded_inputs, aux_input["x_lengths"])
+        else:
+            encoder_outputs = self.encoder.inference(embedded_inputs)
 
         if self.gst and self.use_gst:
             # B x gst_dim
@@ -276,18 +285,18 @@ class Tacotron2(BaseTacotron):
 
         if self.num_speakers > 1:
             if not self.use_d_vector_file:
-                embedded_speakers = self.speaker_embedding(aux_input["speaker_ids"])[None]
-                # reshape embedded_speakers
+                embedded_speakers = self.speaker_embedding(aux_input["speaker_ids"])
+                # reshape embedded_speakers to B x 1 x speaker_embed_dim
                 if embedded_speakers.ndim == 1:
                     embedded_speakers = embedded_speakers[None, None, :]
                 elif embedded_speakers.ndim == 2:
-                    embedded_speakers = embedded_speakers[None, :]
+                    embedded_speakers = embedded_speakers[:, None]
             else:
                 embedded_speakers = aux_input["d_vectors"]
 
             encoder_outputs = self._concat_speaker_embedding(encoder_outputs, embedded_speakers)
 
-        decoder_outputs, alignments, stop_tokens = self.decoder.inference(encoder_outputs)
+        decoder_outputs, alignments, stop_tokens = self.decoder.inference(encoder_outputs, mask=input_mask)
         postnet_outputs = self.postnet(decoder_outputs)
         postnet_outputs = decoder_outputs + postnet_outputs
         decoder_outputs, postnet_outputs, alignments = self.shape_outputs(decoder_outputs, postnet_outputs, alignments)
@@ -297,6 +306,11 @@ class Tacotron2(BaseTacotron):
             "alignments": alignments,
             "stop_tokens": stop_tokens,
         }
+        # in batch mode the decoder runs until every sample stops, each sample ends at its own first stop token.
+        stopped = stop_tokens.squeeze(-1) > self.decoder.stop_threshold
+        stopped[:, : text.shape[0] // 2 + 1] = False
+        num_steps = torch.where(stopped.any(1), stopped.float().argmax(1) + 1, stopped.shape[1])
+        outputs["y_mask"] = sequence_mask(num_steps * self.decoder.r, postnet_outputs.shape[1]).unsqueeze(1).float()
         return outputs
 
     def before_backward_pass(self, loss_dict, optimizer) -> None:
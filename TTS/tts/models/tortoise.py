@@ -116,6 +116,19 @@ def fix_autoregressive_output(codes, stop_token, complain=True):
     return codes
 
 
+def latent_length(codes, calm_token=83):
+    """
+    Number of autoregressive latents to keep for the diffusion model, up to the first run of more than 8 "calm"
+    tokens after the speech. The 8 tokens give the diffusion model some "breathing room" to terminate speech.
+    """
+    if codes.shape[-1] < 9:
+        return codes.shape[-1]
+    calm_runs = (codes == calm_token).unfold(-1, 9, 1).all(-1).nonzero()
+    if len(calm_runs) == 0:
+        return codes.shape[-1]
+    return calm_runs[0].item() + 8
+
+
 def do_spectrogram_diffusion(
     diffusion_model,
     diffuser,
@@ -393,6 +406,21 @@ class Tortoise(BaseTTS):
             self.vocoder = self.vocoder.to(self.device)
         self.high_vram = self.args.high_vram
 
+    def keep_models_resident(self, resident=True):
+        """Keep all the models on the device between the stages and the calls, like `high_vram`, instead of moving
+        each one to the device and back to the CPU every time it is used. Use it to serve many requests when the
+        models fit in the device memory.
+
+        Args:
+            resident (bool): keep the models on the device or move them back to the CPU. Defaults to True.
+        """
+        device = self.device if resident else torch.device("cpu")
+        self.autoregressive = self.autoregressive.to(device)
+        self.diffusion = self.diffusion.to(device)
+        self.clvp = self.clvp.to(device)
+        self.vocoder = self.vocoder.to(device)
+        self.high_vram = resident
+
     @contextmanager
     def temporary_cuda(self, model):
         if self.high_vram:
@@ -620,6 +648,8 @@ class Tortoise(BaseTTS):
         sampler="ddim",
         half=True,
         original_tortoise=False,
+        cache_autoregressive_latents=False,
+        diffusion_batch_size=1,
         **hf_generate_kwargs,
     ):
         """
@@ -659,6 +689,11 @@ class Tortoise(BaseTTS):
                 As cond_free_k increases, the output becomes dominated by the conditioning-free signal.
             diffusion_temperature: (float) Controls the variance of the noise fed into the diffusion model. [0,1]. Values at 0
                                       are the "mean" prediction of the diffusion network and will sound bland and smeared.
+            cache_autoregressive_latents: (bool) Keep the latents of the autoregressive model from the sampling instead of
+                recomputing them for the `k` best clips. It saves a forward pass but keeps the latents of all the samples in
+                memory. The few latents after the end of the speech differ slightly, see `UnifiedVoice.inference_speech()`.
+            diffusion_batch_size: (int) Number of the `k` clips decoded together by the diffusion model and the vocoder.
+                Defaults to 1, one clip after another. See `candidates_to_wav()`.
             hf_generate_kwargs: (**kwargs) The huggingface Transformers generate API is used for the autoregressive transformer.
                                     Extra keyword args fed to this function get forwarded directly to that API. Documentation
                                     here: https://huggingface.co/docs/transformers/internal/generation_utils
@@ -669,12 +704,152 @@ class Tortoise(BaseTTS):
         """
         deterministic_seed = deterministic_state(seed=use_deterministic_seed)
 
+        text_tokens = self.encode_text(text)
+        auto_conditioning, diffusion_conditioning = self.get_inference_conditioning(
+            voice_samples, conditioning_latents, latent_averaging_mode, original_tortoise
+        )
+
+        diffuser = load_discrete_vocoder_diffuser(
+            desired_diffusion_steps=diffusion_iterations, cond_free=cond_free, cond_free_k=cond_free_k, sampler=sampler
+        )
+
+        with torch.no_grad():
+            best_results, best_latents = self.generate_candidates(
+                text_tokens,
+                auto_conditioning,
+                k=k,
+                verbose=verbose,
+                num_autoregressive_samples=num_autoregressive_samples,
+                temperature=temperature,
+                length_penalty=length_penalty,
+                repetition_penalty=repetition_penalty,
+                top_p=top_p,
+                max_mel_tokens=max_mel_tokens,
+                cache_autoregressive_latents=cache_autoregressive_latents,
+                half=half,
+                **hf_generate_kwargs,
+            )
+            del auto_conditioning
+
+            if verbose:
+                print("Transforming autoregressive outputs into audio..")
+            wav_candidates = self.candidates_to_wav(
+                best_results,
+                best_latents,
+                diffusion_conditioning.repeat(best_results.shape[0], 1),
+                diffuser,
+                diffusion_temperature=diffusion_temperature,
+                diffusion_batch_size=diffusion_batch_size,
+                verbose=verbose,
+            )
+            wav_candidates = [self.potentially_redact(wav_candidate, text) for wav_candidate in wav_candidates]
+
+            if len(wav_candidates) > 1:
+                res = wav_candidates
+            else:
+                res = wav_candidates[0]
+
+        return_dict = {
+            "wav": res,
+            "deterministic_seed": None,
+            "text": None,
+            "voice_samples": None,
+            "conditioning_latents": None,
+        }
+        if return_deterministic_state:
+            return_dict = {
+                "wav": res,
+                "deterministic_seed": deterministic_seed,
+                "text": text,
+                "voice_samples": voice_samples,
+                "conditioning_latents": conditioning_latents,
+            }
+        return return_dict
+
+    def inference_batch(
+        self,
+        texts,
+        voice_samples=None,
+        conditioning_latents=None,
+        k=1,
+        verbose=True,
+        use_deterministic_seed=None,
+        latent_averaging_mode=0,
+        diffusion_iterations=100,
+        cond_free=True,
+        cond_free_k=2,
+        diffusion_temperature=1.0,
+        sampler="ddim",
+        diffusion_batch_size=None,
+        original_tortoise=False,
+        **kwargs,
+    ):
+        """Produce audio clips of several texts spoken with the same voice.
+
+        The autoregressive model and CLVP run for every text in turn, then the `k` best candidates of all the texts
+        go through the diffusion model and the vocoder together, `diffusion_batch_size` at a time.
+
+        Args:
+            texts: (List[str]) Texts to be spoken.
+            diffusion_batch_size: (int) Number of candidates decoded together by the diffusion model and the vocoder.
+                Defaults to all the candidates of all the texts.
+            **kwargs: The autoregressive generation parameters of `inference()`.
+            The other arguments are the same as in `inference()`.
+
+        Returns:
+            A dictionary with `wav` as the list of the generated audio clip(s) of every text, in the same format as
+            `inference()`.
+        """
+        deterministic_state(seed=use_deterministic_seed)
+
+        auto_conditioning, diffusion_conditioning = self.get_inference_conditioning(
+            voice_samples, conditioning_latents, latent_averaging_mode, original_tortoise
+        )
+        diffuser = load_discrete_vocoder_diffuser(
+            desired_diffusion_steps=diffusion_iterations, cond_free=cond_free, cond_free_k=cond_free_k, sampler=sampler
+        )
+
+        with torch.no_grad():
+            best_results = []
+            best_latents = []
+            for text in texts:
+                codes, latents = self.generate_candidates(
+                    self.encode_text(text), auto_conditioning, k=k, verbose=verbose, **kwargs
+                )
+                best_results.append(codes)
+                best_latents.append(latents)
+
+            if verbose:
+                print("Transforming autoregressive outputs into audio..")
+            wav_candidates = self.candidates_to_wav(
+                torch.cat(best_results),
+                torch.cat(best_latents),
+                diffusion_conditioning.repeat(len(texts) * k, 1),
+                diffuser,
+                diffusion_temperature=diffusion_temperature,
+                diffusion_batch_size=diffusion_batch_size or len(texts) * k,
+                verbose=verbose,
+            )
+
+        wavs = []
+        for idx, text in enumerate(texts):
+            text_candidates = [self.potentially_redact(wav, text) for wav in wav_candidates[idx * k : (idx + 1) * k]]
+            wavs.append(text_candidates if k > 1 else text_candidates[0])
+        return {"wav": wavs}
+
+    def encode_text(self, text):
         text_tokens = torch.IntTensor(self.tokenizer.encode(text)).unsqueeze(0).to(self.device)
         text_tokens = F.pad(text_tokens, (0, 1))  # This may not be necessary.
         assert (
             text_tokens.shape[-1] < 400
         ), "Too much text provided. Break the text up into separate segments and re-try inference."
+        return text_tokens
 
+    def get_inference_conditioning(
+        self, voice_samples=None, conditioning_latents=None, latent_averaging_mode=0, original_tortoise=False
+    ):
+        """Get the autoregressive and diffusion conditioning latents from the voice samples, the given latents or the
+        random latent generators, in this order of priority."""
         if voice_samples is not None:
             (
                 auto_conditioning,
@@ -694,143 +869,165 @@ class Tortoise(BaseTTS):
                 auto_conditioning,
                 diffusion_conditioning,
             ) = self.get_random_conditioning_latents()
-        auto_conditioning = auto_conditioning.to(self.device)
-        diffusion_conditioning = diffusion_conditioning.to(self.device)
+        return auto_conditioning.to(self.device), diffusion_conditioning.to(self.device)
 
-        diffuser = load_discrete_vocoder_diffuser(
-            desired_diffusion_steps=diffusion_iterations, cond_free=cond_free, cond_free_k=cond_free_k, sampler=sampler
-        )
+    def generate_candidates(
+        self,
+        text_tokens,
+        auto_conditioning,
+        k=1,
+        verbose=True,
+        num_autoregressive_samples=16,
+        temperature=0.8,
+        length_penalty=1,
+        repetition_penalty=2.0,
+        top_p=0.8,
+        max_mel_tokens=500,
+        cache_autoregressive_latents=False,
+        half=True,
+        **hf_generate_kwargs,
+    ):
+        """Sample mel codes with the autoregressive model, rank them with CLVP and return the `k` best ones with
+        their autoregressive latents, the conditioning of the diffusion model. See `inference()` for the arguments.
 
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: the codes `[k, max_mel_tokens]` and the latents
+            `[k, max_mel_tokens, C]`.
+        """
         # in the case of single_sample,
         orig_batch_size = self.autoregressive_batch_size
         while num_autoregressive_samples % self.autoregressive_batch_size:
             self.autoregressive_batch_size //= 2
-        with torch.no_grad():
-            samples = []
-            num_batches = num_autoregressive_samples // self.autoregressive_batch_size
-            stop_mel_token = self.autoregressive.stop_mel_token
-            calm_token = (
-                83  # This is the token for coding silence, which is fixed in place with "fix_autoregressive_output"
-            )
-            self.autoregressive = self.autoregressive.to(self.device)
-            if verbose:
-                print("Generating autoregressive samples..")
-            with self.temporary_cuda(self.autoregressive) as autoregressive, torch.autocast(
-                device_type="cuda", dtype=torch.float16, enabled=half
-            ):
-                for b in tqdm(range(num_batches), disable=not verbose):
-                    codes = autoregressive.inference_speech(
-                        auto_conditioning,
-                        text_tokens,
-                        do_sample=True,
-                        top_p=top_p,
-                        temperature=temperature,
-                        num_return_sequences=self.autoregressive_batch_size,
-                        length_penalty=length_penalty,
-                        repetition_penalty=repetition_penalty,
-                        max_generate_length=max_mel_tokens,
-                        **hf_generate_kwargs,
-                    )
-                    padding_needed = max_mel_tokens - codes.shape[1]
-                    codes = F.pad(codes, (0, padding_needed), value=stop_mel_token)
-                    samples.append(codes)
-            self.autoregressive_batch_size = orig_batch_size  # in the case of single_sample
-
-            clip_results = []
-            with self.temporary_cuda(self.clvp) as clvp, torch.autocast(
-                device_type="cuda", dtype=torch.float16, enabled=half
-            ):
-                for batch in tqdm(samples, disable=not verbose):
-                    for i in range(batch.shape[0]):
-                        batch[i] = fix_autoregressive_output(batch[i], stop_mel_token)
-                    clvp_res = clvp(
-                        text_tokens.repeat(batch.shape[0], 1),
-                        batch,
-                        return_loss=False,
-                    )
-                    clip_results.append(clvp_res)
-
-                clip_results = torch.cat(clip_results, dim=0)
-                samples = torch.cat(samples, dim=0)
-                best_results = samples[torch.topk(clip_results, k=k).indices]
-            del samples
-
-            # The diffusion model actually wants the last hidden layer from the autoregressive model as conditioning
-            # inputs. Re-produce those for the top results. This could be made more efficient by storing all of these
-            # results, but will increase memory usage.
-            with self.temporary_cuda(self.autoregressive) as autoregressive:
-                best_latents = autoregressive(
-                    auto_conditioning.repeat(k, 1),
-                    text_tokens.repeat(k, 1),
-                    torch.tensor([text_tokens.shape[-1]], device=text_tokens.device),
-                    best_results,
-                    torch.tensor(
-                        [best_results.shape[-1] * self.autoregressive.mel_length_compression],
-                        device=text_tokens.device,
-                    ),
-                    return_latent=True,
-                    clip_inputs=False,
+        samples = []
+        sample_latents = []
+        num_batches = num_autoregressive_samples // self.autoregressive_batch_size
+        stop_mel_token = self.autoregressive.stop_mel_token
+        self.autoregressive = self.autoregressive.to(self.device)
+        if verbose:
+            print("Generating autoregressive samples..")
+        with self.temporary_cuda(self.autoregressive) as autoregressive, torch.autocast(
+            device_type="cuda", dtype=torch.float16, enabled=half
+        ):
+            for b in tqdm(range(num_batches), disable=not verbose):
+                codes = autoregressive.inference_speech(
+                    auto_conditioning,
+                    text_tokens,
+                    do_sample=True,
+                    top_p=top_p,
+                    temperature=temperature,
+                    num_return_sequences=self.autoregressive_batch_size,
+                    length_penalty=length_penalty,
+                    repetition_penalty=repetition_penalty,
+                    max_generate_length=max_mel_tokens,
+                    return_latent=cache_autoregressive_latents,
+                    **hf_generate_kwargs,
                 )
-            del auto_conditioning
-
-            if verbose:
-                print("Transforming autoregressive outputs into audio..")
-            wav_candidates = []
-            for b in range(best_results.shape[0]):
-                codes = best_results[b].unsqueeze(0)
-                latents = best_latents[b].unsqueeze(0)
-
-                # Find the first occurrence of the "calm" token and trim the codes to that.
-                ctokens = 0
-                for code in range(codes.shape[-1]):
-                    if codes[0, code] == calm_token:
-                        ctokens += 1
-                    else:
-                        ctokens = 0
-                    if ctokens > 8:  # 8 tokens gives the diffusion model some "breathing room" to terminate speech.
-                        latents = latents[:, :code]
-                        break
-                with self.temporary_cuda(self.diffusion) as diffusion:
-                    mel = do_spectrogram_diffusion(
-                        diffusion,
-                        diffuser,
-                        latents,
-                        diffusion_conditioning,
-                        temperature=diffusion_temperature,
-                        verbose=verbose,
+                if cache_autoregressive_latents:
+                    codes, latents = codes
+                    # the positions after the end of the generation repeat the last latent
+                    latents = F.pad(
+                        latents.float().transpose(1, 2), (0, max_mel_tokens - codes.shape[1]), mode="replicate"
                     )
-                with self.temporary_cuda(self.vocoder) as vocoder:
-                    wav = vocoder.inference(mel)
-                    wav_candidates.append(wav.cpu())
+                    sample_latents.append(latents.transpose(1, 2))
+                padding_needed = max_mel_tokens - codes.shape[1]
+                codes = F.pad(codes, (0, padding_needed), value=stop_mel_token)
+                samples.append(codes)
+        self.autoregressive_batch_size = orig_batch_size  # in the case of single_sample
+
+        clip_results = []
+        with self.temporary_cuda(self.clvp) as clvp, torch.autocast(
+            device_type="cuda", dtype=torch.float16, enabled=half
+        ):
+            for batch in tqdm(samples, disable=not verbose):
+                for i in range(batch.shape[0]):
+                    batch[i] = fix_autoregressive_output(batch[i], stop_mel_token)
+                clvp_res = clvp(
+                    text_tokens.repeat(batch.shape[0], 1),
+                    batch,
+                    return_loss=False,
+                )
+                clip_results.append(clvp_res)
+
+            clip_results = torch.cat(clip_results, dim=0)
+            samples = torch.cat(samples, dim=0)
+            best_indices = torch.topk(clip_results, k=k).indices
+            best_results = samples[best_indices]
+        del samples
+
+        if cache_autoregressive_latents:
+            return best_results, torch.cat(sample_latents, dim=0)[best_indices]
+
+        # The diffusion model actually wants the last hidden layer from the autoregressive model as conditioning
+        # inputs. Re-produce those for the top results. Set `cache_autoregressive_latents` to keep them from the
+        # sampling instead, at the cost of memory.
+        with self.temporary_cuda(self.autoregressive) as autoregressive:
+            best_latents = autoregressive(
+                auto_conditioning.repeat(k, 1),
+                text_tokens.repeat(k, 1),
+                torch.tensor([text_tokens.shape[-1]], device=text_tokens.device),
+                best_results,
+                torch.tensor(
+                    [best_results.shape[-1] * self.autoregressive.mel_length_compression],
+                    device=text_tokens.device,
+                ),
+                return_latent=True,
+                clip_inputs=False,
+            )
+        return best_results, best_latents
 
-            def potentially_redact(clip, text):
-                if self.enable_redaction:
-                    return self.aligner.redact(clip.squeeze(1), text).unsqueeze(1)
-                return clip
+    def candidates_to_wav(
+        self,
+        codes,
+        latents,
+        diffusion_conditioning,
+        diffuser,
+        diffusion_temperature=1.0,
+        diffusion_batch_size=1,
+        verbose=True,
+    ):
+        """Turn the autoregressive latents of candidates into audio clips with the diffusion model and the vocoder.
 
-            wav_candidates = [potentially_redact(wav_candidate, text) for wav_candidate in wav_candidates]
+        The latents of every candidate are trimmed after the speech by `latent_length()`. When several candidates
+        are decoded together, the shorter ones keep their latents up to the longest one, which follow the speech with
+        silence, and their outputs are cut to their own lengths.
 
-            if len(wav_candidates) > 1:
-                res = wav_candidates
-            else:
-                res = wav_candidates[0]
+        Args:
+            codes (torch.Tensor): mel codes of the candidates `[N, T]`.
+            latents (torch.Tensor): latents of the candidates `[N, T, C]`.
+            diffusion_conditioning (torch.Tensor): diffusion conditioning latent of every candidate `[N, C]`.
+            diffuser (SpacedDiffusion): diffuser from `load_discrete_vocoder_diffuser()`.
+            diffusion_temperature (float): variance of the noise of the diffusion model. Defaults to 1.0.
+            diffusion_batch_size (int): number of candidates decoded together. Defaults to 1.
+            verbose (bool): show the progress of the diffusion. Defaults to True.
 
-        return_dict = {
-            "wav": res,
-            "deterministic_seed": None,
-            "text": None,
-            "voice_samples": None,
-            "conditioning_latents": None,
-        }
-        if return_deterministic_state:
-            return_dict = {
-                "wav": res,
-                "deterministic_seed": deterministic_seed,
-                "text": text,
-                "voice_samples": voice_samples,
-                "conditioning_latents": conditioning_latents,
-            }
-        return return_dict
+        Returns:
+            List[torch.Tensor]: the audio clip `[1, 1, S]` of every candidate on the CPU.
+        """
+        lengths = [latent_length(candidate_codes) for candidate_codes in codes]
+        wav_candidates = []
+        for start in range(0, len(lengths), diffusion_batch_size):
+            batch_lengths = lengths[start : start + diffusion_batch_size]
+            with self.temporary_cuda(self.diffusion) as diffusion:
+                mel = do_spectrogram_diffusion(
+                    diffusion,
+                    diffuser,
+                    latents[start : start + diffusion_batch_size, : max(batch_lengths)],
+                    diffusion_conditioning[start : start + diffusion_batch_size],
+                    temperature=diffusion_temperature,
+                    verbose=verbose,
+                )
+            with self.temporary_cuda(self.vocoder) as vocoder:
+                wav = vocoder.inference(mel)
+            hop_length = wav.shape[-1] // mel.shape[-1]
+            for b, length in enumerate(batch_lengths):
+                mel_length = length * 4 * 24000 // 22050
+                wav_candidates.append(wav[b : b + 1, :, : mel_length * hop_length].cpu())
+        return wav_candidates
+
+    def potentially_redact(self, clip, text):
+        if self.enable_redaction:
+            return self.aligner.redact(clip.squeeze(1), text).unsqueeze(1)
+        return clip
 
     def forward(self):
         raise NotImplementedError("Tortoise Training is not implemented")
@@ -19,7 +19,7 @@ from trainer.torch import DistributedSampler, DistributedSamplerWrapper
 from trainer.trainer_utils import get_optimizer, get_scheduler
 
 from TTS.tts.configs.shared_configs import CharactersConfig
-from TTS.tts.datasets.dataset import TTSDataset, _parse_sample
+from TTS.tts.datasets.dataset import TTSDataset
 from TTS.tts.layers.glow_tts.duration_predictor import DurationPredictor
 from TTS.tts.layers.vits.discriminator import VitsDiscriminator
 from TTS.tts.layers.vits.networks import PosteriorEncoder, ResidualCouplingBlocks, TextEncoder
@@ -290,15 +290,6 @@ class VitsDataset(TTSDataset):
             "audio_unique_name": item["audio_unique_name"],
         }
 
-    @property
-    def lengths(self):
-        lens = []
-        for item in self.samples:
-            _, wav_file, *_ = _parse_sample(item)
-            audio_len = os.path.getsize(wav_file) / 16 * 8  # assuming 16bit audio
-            lens.append(audio_len)
-        return lens
-
     def collate_fn(self, batch):
         """
         Return Shapes:
@@ -1567,7 +1558,7 @@ class Vits(BaseTTS):
                 w_sampler,
                 data=data_items,
                 batch_size=config.eval_batch_size if is_eval else config.batch_size,
-                sort_key=lambda x: os.path.getsize(x["audio_file"]),
+                sort_key=lambda x: x["audio_length"],
                 drop_last=True,
             )
         else:
@@ -1594,6 +1585,8 @@ class Vits(BaseTTS):
         if is_eval and not config.run_eval:
             loader = None
         else:
+            if config.get("packed_dataset_path", None):
+                raise ValueError(" [!] `packed_dataset_path` is only supported by the models that use `TTSDataset`.")
             # init dataloader
             dataset = VitsDataset(
                 model_args=self.args,
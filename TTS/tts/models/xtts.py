@@ -1,7 +1,9 @@
+import math
 import os
 from dataclasses import dataclass
 
 import librosa
+import numpy as np
 import torch
 import torch.nn.functional as F
 import torchaudio
@@ -9,6 +11,7 @@ from coqpit import Coqpit
 
 from TTS.tts.layers.xtts.gpt import GPT
 from TTS.tts.layers.xtts.hifigan_decoder import HifiDecoder
+from TTS.tts.layers.xtts.latent_cache import ConditioningLatentCache
 from TTS.tts.layers.xtts.stream_generator import init_stream_support
 from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer, split_sentence
 from TTS.tts.layers.xtts.xtts_manager import SpeakerManager, LanguageManager
@@ -148,6 +151,7 @@ class XttsArgs(Coqpit):
         gpt_code_stride_len (int, optional): The hop_size of dvae and consequently of the gpt output. Defaults to 1024.
         gpt_use_masking_gt_prompt_approach (bool, optional):  If True, it will use ground truth as prompt and it will mask the loss to avoid repetition. Defaults to True.
         gpt_use_perceiver_resampler (bool, optional):  If True, it will use perceiver resampler from flamingo paper - https://arxiv.org/abs/2204.14198. Defaults to False.
+        gpt_prefix_cache_size (int, optional): Number of speakers whose conditioning prefix key/values are kept between the inference calls. It requires the kv_cache. Set to 0 to disable it. Defaults to 8.
     """
 
     gpt_batch_size: int = 1
@@ -175,6 +179,7 @@ class XttsArgs(Coqpit):
     gpt_code_stride_len: int = 1024
     gpt_use_masking_gt_prompt_approach: bool = True
     gpt_use_perceiver_resampler: bool = False
+    gpt_prefix_cache_size: int = 8
 
     # HifiGAN Decoder params
     input_sample_rate: int = 22050
@@ -212,6 +217,9 @@ class Xtts(BaseTTS):
 
         self.tokenizer = VoiceBpeTokenizer()
         self.gpt = None
+        self.latent_cache = None
+        if config.latent_cache_size > 0:
+            self.latent_cache = ConditioningLatentCache(config.latent_cache_size, config.latent_cache_dir)
         self.init_models()
         self.register_buffer("mel_stats", torch.ones(80))
 
@@ -238,6 +246,7 @@ class Xtts(BaseTTS):
                 stop_audio_token=self.args.gpt_stop_audio_token,
                 use_perceiver_resampler=self.args.gpt_use_perceiver_resampler,
                 code_stride_len=self.args.gpt_code_stride_len,
+                prefix_cache_size=self.args.gpt_prefix_cache_size,
             )
 
         self.hifigan_decoder = HifiDecoder(
@@ -379,6 +388,24 @@ class Xtts(BaseTTS):
 
         return gpt_cond_latents, speaker_embedding
 
+    def get_cached_conditioning_latents(self, audio_path, **kwargs):
+        """Same as `get_conditioning_latents()` but returns the latents from `self.latent_cache` if the same
+        reference audio was already used with the same settings.
+
+        Args:
+            audio_path (str or List[str]): Path to reference audio file(s).
+            **kwargs: Settings passed to `get_conditioning_latents()`.
+        """
+        if self.latent_cache is None:
+            return self.get_conditioning_latents(audio_path, **kwargs)
+        key = self.latent_cache.make_key(audio_path, **kwargs)
+        latents = self.latent_cache.get(key)
+        if latents is not None:
+            return latents[0].to(self.device), latents[1].to(self.device)
+        gpt_cond_latent, speaker_embedding = self.get_conditioning_latents(audio_path, **kwargs)
+        self.latent_cache.put(key, gpt_cond_latent, speaker_embedding)
+        return gpt_cond_latent, speaker_embedding
+
     def synthesize(self, text, config, speaker_wav, language, speaker_id=None, **kwargs):
         """Synthesize speech with the given input text.
 
@@ -477,7 +504,7 @@ class Xtts(BaseTTS):
             Generated audio clip(s) as a torch tensor. Shape 1,S if k=1 else, (k,1,S) where S is the sample length.
             Sample rate is 24kHz.
         """
-        (gpt_cond_latent, speaker_embedding) = self.get_conditioning_latents(
+        (gpt_cond_latent, speaker_embedding) = self.get_cached_conditioning_latents(
             audio_path=ref_audio_path,
             gpt_cond_len=gpt_cond_len,
             gpt_cond_chunk_len=gpt_cond_chunk_len,
@@ -516,6 +543,7 @@ class Xtts(BaseTTS):
         num_beams=1,
         speed=1.0,
         enable_text_splitting=False,
+        batch_sentences=False,
         **hf_generate_kwargs,
     ):
         language = language.split("-")[0]  # remove the country code
@@ -527,6 +555,28 @@ class Xtts(BaseTTS):
         else:
             text = [text]
 
+        if batch_sentences:
+            outputs = self.inference_batch(
+                text,
+                language,
+                gpt_cond_latent,
+                speaker_embedding,
+                temperature=temperature,
+                length_penalty=length_penalty,
+                repetition_penalty=repetition_penalty,
+                top_k=top_k,
+                top_p=top_p,
+                do_sample=do_sample,
+                num_beams=num_beams,
+                speed=speed,
+                **hf_generate_kwargs,
+            )
+            return {
+                "wav": np.concatenate(outputs["wav"]),
+                "gpt_latents": np.concatenate(outputs["gpt_latents"], axis=1),
+                "speaker_embedding": speaker_embedding,
+            }
+
         wavs = []
         gpt_latents_list = []
         for sent in text:
@@ -538,7 +588,7 @@ class Xtts(BaseTTS):
             ), " ❗ XTTS can only generate text with a maximum of 400 tokens."
 
             with torch.no_grad():
-                gpt_codes = self.gpt.generate(
+                generate_kwargs = dict(
                     cond_latents=gpt_cond_latent,
                     text_inputs=text_tokens,
                     input_tokens=None,
@@ -553,20 +603,24 @@ class Xtts(BaseTTS):
                     output_attentions=False,
                     **hf_generate_kwargs,
                 )
-                expected_output_len = torch.tensor(
-                    [gpt_codes.shape[-1] * self.gpt.code_stride_len], device=text_tokens.device
-                )
-
-                text_len = torch.tensor([text_tokens.shape[-1]], device=self.device)
-                gpt_latents = self.gpt(
-                    text_tokens,
-                    text_len,
-                    gpt_codes,
-                    expected_output_len,
-                    cond_latents=gpt_cond_latent,
-                    return_attentions=False,
-                    return_latent=True,
-                )
+                if num_beams == 1:
+                    # collect the latents while sampling instead of a second pass over the generated codes
+                    gpt_codes, gpt_latents = self.gpt.generate(return_latent=True, **generate_kwargs)
+                else:
+                    gpt_codes = self.gpt.generate(**generate_kwargs)
+                    expected_output_len = torch.tensor(
+                        [gpt_codes.shape[-1] * self.gpt.code_stride_len], device=text_tokens.device
+                    )
+                    text_len = torch.tensor([text_tokens.shape[-1]], device=self.device)
+                    gpt_latents = self.gpt(
+                        text_tokens,
+                        text_len,
+                        gpt_codes,
+                        expected_output_len,
+                        cond_latents=gpt_cond_latent,
+                        return_attentions=False,
+                        return_latent=True,
+                    )
 
                 if length_scale != 1.0:
                     gpt_latents = F.interpolate(
@@ -582,6 +636,143 @@ class Xtts(BaseTTS):
             "speaker_embedding": speaker_embedding,
         }
 
+    @torch.inference_mode()
+    def inference_batch(
+        self,
+        sentences,
+        language,
+        gpt_cond_latent,
+        speaker_embedding,
+        # GPT inference
+        temperature=0.75,
+        length_penalty=1.0,
+        repetition_penalty=10.0,
+        top_k=50,
+        top_p=0.85,
+        do_sample=True,
+        num_beams=1,
+        speed=1.0,
+        batch_size=None,
+        **hf_generate_kwargs,
+    ):
+        """Generate speech for several sentences of the same speaker in batches. Takes the same arguments as
+        `inference()`, `gpt_batch_size` is not used.
+
+        The sentences are sorted by length and split into batches of `batch_size`. The texts of a batch are left
+        padded into one `generate()` call where each sentence stops at its own stop token, and the latents are
+        decoded in one padded HiFi-GAN pass. The sentences can come from several requests as long as they share the
+        speaker and the generation settings.
+
+        Since the decoder sees the padding within its receptive field, the last tens of milliseconds of the shorter
+        sentences of a batch differ slightly from separately decoded ones.
+
+        Args:
+            sentences (List[str]): sentences to synthesize.
+
+            batch_size (int): Maximum number of sentences in a batch. Defaults to None, all the sentences are
+                generated in one batch.
+
+        Returns:
+            Dict: `wav` and `gpt_latents` lists with the waveform and the GPT latents of each sentence in the order
+            of `sentences` and the `speaker_embedding`.
+        """
+        language = language.split("-")[0]  # remove the country code
+        length_scale = 1.0 / max(speed, 0.05)
+        gpt_cond_latent = gpt_cond_latent.to(self.device)
+        speaker_embedding = speaker_embedding.to(self.device)
+
+        tokens = []
+        for sent in sentences:
+            sent = sent.strip().lower()
+            tokens.append(self.tokenizer.encode(sent, lang=language))
+            assert (
+                len(tokens[-1]) < self.args.gpt_max_text_tokens
+            ), " ❗ XTTS can only generate text with a maximum of 400 tokens."
+
+        # sort by length to limit the padding
+        order = sorted(range(len(tokens)), key=lambda idx: len(tokens[idx]))
+        batch_size = batch_size or max(len(order), 1)
+        wavs = [None] * len(sentences)
+        gpt_latents_list = [None] * len(sentences)
+        for start in range(0, len(order), batch_size):
+            idxs = order[start : start + batch_size]
+            text_lengths = torch.tensor([len(tokens[idx]) for idx in idxs], device=self.device)
+            text_tokens = torch.zeros(len(idxs), text_lengths.max(), dtype=torch.int32, device=self.device)
+            for row, idx in enumerate(idxs):
+                text_tokens[row, : len(tokens[idx])] = torch.IntTensor(tokens[idx])
+
+            generate_kwargs = dict(
+                cond_latents=gpt_cond_latent,
+                text_inputs=text_tokens,
+                text_lengths=text_lengths,
+                do_sample=do_sample,
+                top_p=top_p,
+                top_k=top_k,
+                temperature=temperature,
+                num_beams=num_beams,
+                length_penalty=length_penalty,
+                repetition_penalty=repetition_penalty,
+                output_attentions=False,
+                **hf_generate_kwargs,
+            )
+            if num_beams == 1:
+                gpt_codes, gpt_latents = self.gpt.generate(return_latent=True, **generate_kwargs)
+            else:
+                gpt_codes = self.gpt.generate(**generate_kwargs)
+                gpt_latents = None
+
+            # each sentence ends with its first stop token
+            is_stop = gpt_codes == self.gpt.stop_audio_token
+            code_lengths = torch.where(is_stop.any(1), is_stop.int().argmax(1) + 1, gpt_codes.shape[1]).tolist()
+            latents = []
+            for row, code_length in enumerate(code_lengths):
+                if gpt_latents is not None:
+                    row_latents = gpt_latents[row : row + 1, :code_length]
+                else:
+                    row_latents = self.gpt(
+                        text_tokens[row : row + 1, : text_lengths[row]],
+                        text_lengths[row : row + 1],
+                        gpt_codes[row : row + 1, :code_length],
+                        torch.tensor([code_length * self.gpt.code_stride_len], device=self.device),
+                        cond_latents=gpt_cond_latent,
+                        return_attentions=False,
+                        return_latent=True,
+                    )
+                if length_scale != 1.0:
+                    row_latents = F.interpolate(
+                        row_latents.transpose(1, 2), scale_factor=length_scale, mode="linear"
+                    ).transpose(1, 2)
+                latents.append(row_latents)
+
+            for idx, row_latents, wav in zip(idxs, latents, self.decode_batch(latents, speaker_embedding)):
+                gpt_latents_list[idx] = row_latents.cpu().numpy()
+                wavs[idx] = wav.cpu().numpy()
+
+        return {
+            "wav": wavs,
+            "gpt_latents": gpt_latents_list,
+            "speaker_embedding": speaker_embedding,
+        }
+
+    def decode_batch(self, gpt_latents, speaker_embedding):
+        """Decode the GPT latents of several sentences in one HiFi-GAN pass.
+
+        The latents are upsampled separately and right padded to the longest sentence.
+
+        Args:
+            gpt_latents (List[Tensor]): GPT latents of each sentence, each of shape [1, T, C].
+            speaker_embedding (Tensor): speaker embedding for the decoder.
+
+        Returns:
+            List[Tensor]: waveform of each sentence.
+        """
+        z = [self.hifigan_decoder.upsample_latents(latents) for latents in gpt_latents]
+        z = [z_i.reshape(-1, z_i.shape[-1]) for z_i in z]
+        num_frames = [z_i.shape[-1] for z_i in z]
+        z = torch.stack([F.pad(z_i, (0, max(num_frames) - z_i.shape[-1])) for z_i in z])
+        wav = self.hifigan_decoder.waveform_decoder(z, g=speaker_embedding.expand(z.shape[0], -1, -1))
+        return [wav[i, 0, : frames * self.args.output_hop_length] for i, frames in enumerate(num_frames)]
+
     def handle_chunks(self, wav_gen, wav_gen_prev, wav_overlap, overlap_len):
         """Handle chunk formatting in streaming mode"""
         wav_chunk = wav_gen[:-overlap_len]
@@ -607,6 +798,38 @@ class Xtts(BaseTTS):
         wav_gen_prev = wav_gen
         return wav_chunk, wav_gen_prev, wav_overlap
 
+    def decode_stream_window(
+        self, gpt_latents, speaker_embedding, wav_gen_prev, wav_gen_prev_start, overlap_len, context_len
+    ):
+        """Decode only the end of the latents that is needed for the next streaming chunk.
+
+        The waveform is decoded from `context_len` GPT latents before the last `overlap_len` samples of the previous
+        chunk. Both waveforms are aligned to the start of this window, so `handle_chunks()` can treat them as if the
+        whole sentence was decoded.
+
+        Args:
+            gpt_latents (Tensor): all the GPT latents of the sentence generated so far.
+            speaker_embedding (Tensor): speaker embedding for the decoder.
+            wav_gen_prev (Tensor): waveform decoded for the previous chunk or None for the first chunk.
+            wav_gen_prev_start (int): index of the first sample of `wav_gen_prev` in the sentence waveform.
+            overlap_len (int): number of samples cross-faded between chunks.
+            context_len (int): number of GPT latents decoded as left context.
+
+        Returns:
+            Tuple[Tensor, Tensor, int]: waveform of the window, `wav_gen_prev` cut to the start of the window and the
+            index of the first sample of the window in the sentence waveform.
+        """
+        hop_length = self.args.output_hop_length
+        z = self.hifigan_decoder.upsample_latents(gpt_latents)
+        start = 0
+        if wav_gen_prev is not None:
+            context_frames = math.ceil(context_len * z.shape[-1] / gpt_latents.shape[1])
+            prev_end = wav_gen_prev_start + wav_gen_prev.shape[0]
+            start = max(wav_gen_prev_start // hop_length, (prev_end - overlap_len) // hop_length - context_frames)
+            wav_gen_prev = wav_gen_prev[start * hop_length - wav_gen_prev_start :]
+        wav_gen = self.hifigan_decoder.waveform_decoder(z[..., start:], g=speaker_embedding.to(self.device))
+        return wav_gen, wav_gen_prev, start * hop_length
+
     @torch.inference_mode()
     def inference_stream(
         self,
@@ -617,6 +840,7 @@ class Xtts(BaseTTS):
         # Streaming
         stream_chunk_size=20,
         overlap_wav_len=1024,
+        decoder_context_len=4,
         # GPT inference
         temperature=0.75,
         length_penalty=1.0,
@@ -628,6 +852,21 @@ class Xtts(BaseTTS):
         enable_text_splitting=False,
         **hf_generate_kwargs,
     ):
+        """Generate speech chunk by chunk. Takes the same arguments as `inference()` plus the streaming settings.
+
+        Args:
+            stream_chunk_size (int): Number of GPT tokens generated before a chunk of audio is decoded. Defaults to 20.
+
+            overlap_wav_len (int): Number of samples cross-faded between consecutive chunks. Defaults to 1024.
+
+            decoder_context_len (int): Number of GPT latents, before the new ones, that are decoded again as left
+                context for each chunk. The vocoder cost of a chunk then stays constant instead of growing with the
+                length of the sentence. The default covers the receptive field of the HiFi-GAN decoder. Set to None to
+                decode all the latents of the sentence for every chunk. Defaults to 4.
+
+        Yields:
+            Tensor: the next chunk of the waveform. Sample rate is 24kHz.
+        """
         language = language.split("-")[0]  # remove the country code
         length_scale = 1.0 / max(speed, 0.05)
         gpt_cond_latent = gpt_cond_latent.to(self.device)
@@ -651,6 +890,7 @@ class Xtts(BaseTTS):
             )
             gpt_generator = self.gpt.get_generator(
                 fake_inputs=fake_inputs,
+                past_key_values=self.gpt.get_prefix_key_values(gpt_cond_latent.to(self.device)),
                 top_k=top_k,
                 top_p=top_p,
                 temperature=temperature,
@@ -667,6 +907,7 @@ class Xtts(BaseTTS):
             last_tokens = []
             all_latents = []
             wav_gen_prev = None
+            wav_gen_prev_start = 0
             wav_overlap = None
             is_end = False
 
@@ -684,7 +925,17 @@ class Xtts(BaseTTS):
                         gpt_latents = F.interpolate(
                             gpt_latents.transpose(1, 2), scale_factor=length_scale, mode="linear"
                         ).transpose(1, 2)
-                    wav_gen = self.hifigan_decoder(gpt_latents, g=speaker_embedding.to(self.device))
+                    if decoder_context_len is None:
+                        wav_gen = self.hifigan_decoder(gpt_latents, g=speaker_embedding.to(self.device))
+                    else:
+                        wav_gen, wav_gen_prev, wav_gen_prev_start = self.decode_stream_window(
+                            gpt_latents,
+                            speaker_embedding,
+                            wav_gen_prev,
+                            wav_gen_prev_start,
+                            overlap_wav_len,
+                            decoder_context_len,
+                        )
                     wav_chunk, wav_gen_prev, wav_overlap = self.handle_chunks(
                         wav_gen.squeeze(), wav_gen_prev, wav_overlap, overlap_wav_len
                     )
@@ -760,6 +1011,12 @@ class Xtts(BaseTTS):
         if speaker_file_path is None and checkpoint_dir is not None:
             speaker_file_path = os.path.join(checkpoint_dir, "speakers_xtts.pth")
 
+        if self.latent_cache is not None:
+            # cached latents are only valid for the weights they were computed with
+            model_size = os.path.getsize(model_path) if os.path.isfile(model_path) else None
+            self.latent_cache.namespace = f"{model_path}:{model_size}"
+            self.latent_cache.clear()
+
         self.language_manager = LanguageManager(config)
         self.speaker_manager = None
         if speaker_file_path is not None and os.path.exists(speaker_file_path):
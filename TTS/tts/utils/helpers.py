@@ -1,6 +1,9 @@
+import functools
+import os
+
 import numpy as np
 import torch
-from scipy.stats import betabinom
+from scipy.special import betaln, gammaln
 from torch.nn import functional as F
 
 try:
@@ -170,9 +173,11 @@ def generate_path(duration, mask):
 
 
 def maximum_path(value, mask):
-    if CYTHON:
+    """Monotonic alignment search. The Cython version is used for CPU tensors if it is built, the torch version
+    otherwise so that the tensors on the GPU are not copied to the host and back."""
+    if CYTHON and value.device.type == "cpu":
         return maximum_path_cython(value, mask)
-    return maximum_path_numpy(value, mask)
+    return maximum_path_torch(value, mask)
 
 
 def maximum_path_cython(value, mask):
@@ -236,23 +241,89 @@ def maximum_path_numpy(value, mask, max_neg_val=None):
     return path
 
 
+@torch.jit.script
+def _maximum_path_torch(value: torch.Tensor, t_xs: torch.Tensor, t_ys: torch.Tensor) -> torch.Tensor:
+    b, t_x, t_y = value.shape
+    batch_range = torch.arange(b, device=value.device)
+    neg_inf = torch.full((b, 1), float("-inf"), dtype=value.dtype, device=value.device)
+    # cells that a monotonic path from (0, 0) to (t_x - 1, t_y - 1) can go through
+    x_range = torch.arange(t_x, device=value.device).view(1, -1, 1)
+    y_range = torch.arange(t_y, device=value.device).view(1, 1, -1)
+    in_band = (
+        (x_range <= y_range) & (x_range >= (t_xs - t_ys).view(-1, 1, 1) + y_range) & (x_range < t_xs.view(-1, 1, 1))
+    )
+    v = neg_inf.expand(b, t_x)
+    go_down = torch.zeros(value.shape, dtype=torch.bool, device=value.device)
+    # the columns only depend on the previous one, so each one is a wavefront over the whole batch
+    for y in range(t_y):
+        v_stay = v
+        v_down = torch.cat([torch.zeros_like(neg_inf) if y == 0 else neg_inf, v[:, :-1]], dim=1)
+        go_down[:, :, y] = v_down > v_stay
+        v = torch.where(in_band[:, :, y], torch.maximum(v_stay, v_down) + value[:, :, y], neg_inf)
+
+    path = torch.zeros_like(value)
+    index = t_xs - 1
+    for y in range(t_y - 1, -1, -1):
+        active = y < t_ys
+        path[batch_range, index, y] = active.to(value.dtype)
+        step = active & (index != 0) & ((index == y) | go_down[batch_range, index, y])
+        index = index - step.long()
+    return path
+
+
+def maximum_path_torch(value, mask):
+    """Monotonic alignment search in torch. It runs on the device of the inputs and gives the same paths as the
+    Cython version.
+
+    Shapes:
+        - value: :math:`[B, T_en, T_de]`
+        - mask: :math:`[B, T_en, T_de]`
+    """
+    dtype = value.dtype
+    value = (value * mask).detach().float()
+    t_xs = mask.sum(1)[:, 0].long()
+    t_ys = mask.sum(2)[:, 0].long()
+    return _maximum_path_torch(value, t_xs, t_ys).to(dtype)
+
+
 def beta_binomial_prior_distribution(phoneme_count, mel_count, scaling_factor=1.0):
+    """Beta-binomial prior of the alignment between the phonemes and the mel frames. The pmf is evaluated in closed
+    form for all the frames at once.
+
+    Shapes:
+        - output: :math:`[T_mel, T_phoneme]`
+    """
     P, M = phoneme_count, mel_count
-    x = np.arange(0, P)
-    mel_text_probs = []
-    for i in range(1, M + 1):
-        a, b = scaling_factor * i, scaling_factor * (M + 1 - i)
-        rv = betabinom(P, a, b)
-        mel_i_prob = rv.pmf(x)
-        mel_text_probs.append(mel_i_prob)
-    return np.array(mel_text_probs)
-
-
-def compute_attn_prior(x_len, y_len, scaling_factor=1.0):
-    """Compute attention priors for the alignment network."""
-    attn_prior = beta_binomial_prior_distribution(
-        x_len,
-        y_len,
-        scaling_factor,
-    )
-    return attn_prior  # [y_len, x_len]
+    x = np.arange(0, P).reshape(1, -1)
+    i = np.arange(1, M + 1).reshape(-1, 1)
+    a, b = scaling_factor * i, scaling_factor * (M + 1 - i)
+    # log pmf of betabinom(P, a, b) = log(P choose x) + log B(x + a, P - x + b) - log B(a, b)
+    log_pmf = gammaln(P + 1) - gammaln(x + 1) - gammaln(P - x + 1) + betaln(x + a, P - x + b) - betaln(a, b)
+    return np.exp(log_pmf)
+
+
+# keep only the priors of the recent lengths in memory, `cache_path` keeps all of them
+@functools.lru_cache(maxsize=128)
+def _cached_attn_prior(x_len, y_len, scaling_factor, cache_path):
+    if cache_path is None:
+        return beta_binomial_prior_distribution(x_len, y_len, scaling_factor).astype(np.float32)
+    attn_prior_file = os.path.join(cache_path, f"{x_len}_{y_len}_{scaling_factor}.npy")
+    if os.path.exists(attn_prior_file):
+        return np.load(attn_prior_file).astype(np.float32, copy=False)
+    attn_prior = beta_binomial_prior_distribution(x_len, y_len, scaling_factor).astype(np.float32)
+    os.makedirs(cache_path, exist_ok=True)
+    # write to a temporary file first so a concurrent data loader worker never reads a partial file
+    tmp_file = f"{attn_prior_file}.{os.getpid()}.tmp.npy"
+    np.save(tmp_file, attn_prior)
+    os.replace(tmp_file, attn_prior_file)
+    return attn_prior
+
+
+def compute_attn_prior(x_len, y_len, scaling_factor=1.0, cache_path=None):
+    """Compute attention priors for the alignment network.
+
+    The priors only depend on the lengths. The recently used ones are kept in memory as float32 arrays by
+    `(x_len, y_len, scaling_factor)` and all of them are also saved under `cache_path` if it is given.
+    """
+    attn_prior = _cached_attn_prior(int(x_len), int(y_len), float(scaling_factor), cache_path)
+    return attn_prior.copy()  # [y_len, x_len]
@@ -33,6 +33,24 @@ def save_file(obj: Any, path: str):
         raise ValueError("Unsupported file type")
 
 
+def load_clip_features(ap: AudioProcessor, wav_file: str, use_torch_spec: bool) -> torch.Tensor:
+    """Load an audio file at the sample rate of the encoder and compute the input of the encoder, the waveform if
+    the encoder computes its own spectrogram or else the mel spectrogram.
+
+    Args:
+        ap (AudioProcessor): audio processor of the encoder.
+        wav_file (str): path to the audio file.
+        use_torch_spec (bool): `model_params.use_torch_spec` of the encoder config.
+
+    Returns:
+        torch.Tensor: encoder input without the batch dimension.
+    """
+    waveform = ap.load_wav(wav_file, sr=ap.sample_rate)
+    if not use_torch_spec:
+        return torch.from_numpy(ap.melspectrogram(waveform))
+    return torch.from_numpy(waveform)
+
+
 class BaseIDManager:
     """Base `ID` Manager class. Every new `ID` manager must inherit this.
     It defines common `ID` manager specific functions.
@@ -339,13 +357,9 @@ class EmbeddingManager(BaseIDManager):
         """
 
         def _compute(wav_file: str):
-            waveform = self.encoder_ap.load_wav(wav_file, sr=self.encoder_ap.sample_rate)
-            if not self.encoder_config.model_params.get("use_torch_spec", False):
-                m_input = self.encoder_ap.melspectrogram(waveform)
-                m_input = torch.from_numpy(m_input)
-            else:
-                m_input = torch.from_numpy(waveform)
-
+            m_input = load_clip_features(
+                self.encoder_ap, wav_file, self.encoder_config.model_params.get("use_torch_spec", False)
+            )
             if self.use_cuda:
                 m_input = m_input.cuda()
             m_input = m_input.unsqueeze(0)
@@ -4,6 +4,8 @@ import numpy as np
 import torch
 from torch import nn
 
+from TTS.utils.audio.torch_transforms import BatchSpectrogram
+
 
 def numpy_to_torch(np_array, dtype, cuda=False, device="cpu"):
     if cuda:
@@ -32,8 +34,9 @@ def run_model_torch(
     style_text: str = None,
     d_vector: torch.Tensor = None,
     language_id: torch.Tensor = None,
+    input_lengths: torch.Tensor = None,
 ) -> Dict:
-    """Run a torch model for inference. It does not support batch inference.
+    """Run a torch model for inference. Batch inference needs `input_lengths` and a model that supports it.
 
     Args:
         model (nn.Module): The model to run inference.
@@ -41,11 +44,13 @@ def run_model_torch(
         speaker_id (int, optional): Input speaker ids for multi-speaker models. Defaults to None.
         style_mel (torch.Tensor, optional): Spectrograms used for voice styling . Defaults to None.
         d_vector (torch.Tensor, optional): d-vector for multi-speaker models    . Defaults to None.
+        input_lengths (torch.Tensor, optional): Lengths of the padded inputs. Defaults to None, meaning batch size 1.
 
     Returns:
         Dict: model outputs.
     """
-    input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
+    if input_lengths is None:
+        input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
     if hasattr(model, "module"):
         _func = model.module.inference
     else:
@@ -76,6 +81,31 @@ def inv_spectrogram(postnet_output, ap, CONFIG):
     return wav
 
 
+def inv_spectrogram_batch(outputs, lengths, ap, CONFIG):
+    """Convert a padded batch of spectrograms to waveforms with the batched torch Griffin-Lim on the device of
+    `outputs`.
+
+    Args:
+        outputs (Tensor): spectrograms. Shape :math:`[B, T, C]`.
+        lengths (Tensor): number of frames of each spectrogram. Shape :math:`[B]`.
+        ap (AudioProcessor): TTS audio processor.
+        CONFIG (Dict): TTS config.
+
+    Returns:
+        List[np.ndarray]: waveform of each spectrogram.
+    """
+    outputs = torch.as_tensor(outputs)
+    lengths = torch.as_tensor(lengths, device=outputs.device)
+    batch_spectrogram = BatchSpectrogram(ap).to(outputs.device)
+    with torch.no_grad():
+        if CONFIG.model.lower() in ["tacotron"]:
+            wavs = batch_spectrogram.inv_spectrogram(outputs.transpose(1, 2), lengths)
+        else:
+            wavs = batch_spectrogram.inv_melspectrogram(outputs.transpose(1, 2), lengths)
+    wav_lengths = (lengths - 1) * ap.hop_length
+    return [wav[:wav_len].cpu().numpy() for wav, wav_len in zip(wavs, wav_lengths)]
+
+
 def id_to_torch(aux_id, cuda=False, device="cpu"):
     if cuda:
         device = "cuda"
@@ -95,15 +125,17 @@ def embedding_to_torch(d_vector, cuda=False, device="cpu"):
     return d_vector
 
 
-# TODO: perform GL with pytorch for batching
 def apply_griffin_lim(inputs, input_lens, CONFIG, ap):
-    """Apply griffin-lim to each sample iterating throught the first dimension.
+    """Apply griffin-lim to each sample iterating throught the first dimension, or to the whole batch at once if
+    `ap.griffin_lim_backend` is `torch`.
     Args:
         inputs (Tensor or np.Array): Features to be converted by GL. First dimension is the batch size.
         input_lens (Tensor or np.Array): 1D array of sample lengths.
         CONFIG (Dict): TTS config.
         ap (AudioProcessor): TTS audio processor.
     """
+    if getattr(ap, "griffin_lim_backend", "numpy") == "torch":
+        return inv_spectrogram_batch(inputs, input_lens, ap, CONFIG)
     wavs = []
     for idx, spec in enumerate(inputs):
         wav_len = (input_lens[idx] * ap.hop_length) - ap.hop_length  # inverse librosa padding
@@ -252,6 +284,137 @@ def synthesis(
     return return_dict
 
 
+def synthesis_batch(
+    model,
+    texts,
+    CONFIG,
+    use_cuda,
+    speaker_id=None,
+    use_griffin_lim=False,
+    do_trim_silence=False,
+    d_vector=None,
+    language_id=None,
+):
+    """Batched version of `synthesis()`. The texts are padded and run through the model in a single forward pass,
+    then the outputs are un-padded again.
+
+    It works for the models that take `x_lengths` in `aux_input` and return the output mask as `y_mask`
+    (Vits, ForwardTTS, GlowTTS and Tacotron2). Style transfer is not supported and all the texts share the same
+    speaker and language.
+
+    Args:
+        model (TTS.tts.models):
+            The TTS model to synthesize audio with.
+
+        texts (List[str]):
+            The input texts to convert to speech.
+
+        CONFIG (Coqpit):
+            Model configuration.
+
+        use_cuda (bool):
+            Enable/disable CUDA.
+
+        speaker_id (int):
+            Speaker ID passed to the speaker embedding layer in multi-speaker model. Defaults to None.
+
+        use_griffin_lim (bool):
+            Compute the waveforms of spectrogram models with Griffin-Lim. Defaults to False.
+
+        do_trim_silence (bool):
+            trim silence after synthesis. Defaults to False.
+
+        d_vector (torch.Tensor):
+            d-vector for multi-speaker models in share :math:`[1, D]`. Defaults to None.
+
+        language_id (int):
+            Language ID passed to the language embedding layer in multi-langual model. Defaults to None.
+
+    Returns:
+        List[Dict]: `wav` and un-padded `model_outputs` for each text, in the input order.
+    """
+    # device
+    device = next(model.parameters()).device
+    if use_cuda:
+        device = "cuda"
+
+    language_name = None
+    if language_id is not None:
+        language = [k for k, v in model.language_manager.name_to_id.items() if v == language_id]
+        assert len(language) == 1, "language_id must be a valid language"
+        language_name = language[0]
+
+    # convert texts to sequences of token IDs and pad them, longest first as Tacotron2 packs the encoder inputs.
+    token_ids = [model.tokenizer.text_to_ids(text, language=language_name) for text in texts]
+    order = sorted(range(len(texts)), key=lambda idx: len(token_ids[idx]), reverse=True)
+    input_lengths = [len(token_ids[idx]) for idx in order]
+    pad_id = model.tokenizer.pad_id if model.tokenizer.pad_id is not None else 0
+    text_inputs = np.full((len(texts), input_lengths[0]), pad_id, dtype=np.int32)
+    for row, idx in enumerate(order):
+        text_inputs[row, : input_lengths[row]] = token_ids[idx]
+
+    # pass tensors to backend
+    batch_size = len(texts)
+    if speaker_id is not None:
+        speaker_id = id_to_torch(speaker_id, device=device).view(1).repeat(batch_size)
+
+    if d_vector is not None:
+        d_vector = embedding_to_torch(d_vector, device=device).repeat(batch_size, 1)
+
+    if language_id is not None:
+        language_id = id_to_torch(language_id, device=device).view(1).repeat(batch_size)
+
+    text_inputs = numpy_to_torch(text_inputs, torch.long, device=device)
+    input_lengths = numpy_to_torch(input_lengths, torch.long, device=device)
+    # synthesize voice
+    outputs = run_model_torch(
+        model,
+        text_inputs,
+        speaker_id,
+        d_vector=d_vector,
+        language_id=language_id,
+        input_lengths=input_lengths,
+    )
+    model_outputs = outputs["model_outputs"].data.cpu()
+    output_lengths = outputs["y_mask"].sum(dim=[1, 2]).long().cpu()
+
+    # spectrogram models return [B, T, C] and waveform models [B, 1, T_wav]
+    num_frames = outputs["y_mask"].shape[-1]
+    samples_per_frame = 1
+    if model_outputs.shape[1] != num_frames:
+        max_inference_len = getattr(model, "max_inference_len", None)
+        if max_inference_len is not None:
+            num_frames = min(num_frames, max_inference_len)
+        samples_per_frame = model_outputs.shape[-1] // num_frames
+
+    batch_wavs = None
+    if use_griffin_lim and samples_per_frame == 1 and getattr(model.ap, "griffin_lim_backend", "numpy") == "torch":
+        batch_wavs = inv_spectrogram_batch(outputs["model_outputs"].data, output_lengths, model.ap, CONFIG)
+
+    return_dicts = [None] * batch_size
+    for row, idx in enumerate(order):
+        wav = None
+        if samples_per_frame == 1:  # [T, C_spec]
+            item_outputs = model_outputs[row, : output_lengths[row]].numpy()
+            if use_griffin_lim:
+                if batch_wavs is not None:
+                    wav = batch_wavs[row]
+                else:
+                    wav = inv_spectrogram(item_outputs, model.ap, CONFIG)
+                # trim silence
+                if do_trim_silence:
+                    wav = trim_silence(wav, model.ap)
+        else:  # [T,]
+            item_outputs = model_outputs[row, 0, : output_lengths[row] * samples_per_frame].numpy()
+            wav = item_outputs
+        return_dicts[idx] = {
+            "wav": wav,
+            "model_outputs": item_outputs,
+            "text_inputs": text_inputs[row, : input_lengths[row]],
+        }
+    return return_dicts
+
+
 def transfer_voice(
     model,
     CONFIG,
@@ -43,6 +43,9 @@ class BasePhonemizer(abc.ABC):
         self._keep_puncs = keep_puncs
         self._punctuator = Punctuation(punctuations)
 
+        # optional cache of the phonemized segments
+        self.phoneme_cache = None
+
     def _init_language(self, language):
         """Language initialization
 
@@ -90,6 +93,27 @@ class BasePhonemizer(abc.ABC):
     def _phonemize(self, text, separator):
         """The main phonemization method"""
 
+    def cache_namespace(self) -> str:
+        """Identify the backend and the settings changing the output of `_phonemize()` in the cache keys.
+
+        Override this if the phonemizer has options changing its output.
+        """
+        return f"{self.name()}:{self.version()}:{self.language}"
+
+    def set_cache(self, cache: "PhonemeCache") -> None:
+        """Look up the phonemized segments in `cache` before calling the backend. Set None to disable caching."""
+        self.phoneme_cache = cache
+
+    def _phonemize_cached(self, text: str, separator: str) -> str:
+        if self.phoneme_cache is None:
+            return self._phonemize(text, separator)
+        key = "\0".join([self.cache_namespace(), separator, text])
+        phonemes = self.phoneme_cache.get(key)
+        if phonemes is None:
+            phonemes = self._phonemize(text, separator)
+            self.phoneme_cache.put(key, phonemes)
+        return phonemes
+
     def _phonemize_preprocess(self, text) -> Tuple[List[str], List]:
         """Preprocess the text before phonemization
 
@@ -129,7 +153,7 @@ class BasePhonemizer(abc.ABC):
         text, punctuations = self._phonemize_preprocess(text)
         phonemized = []
         for t in text:
-            p = self._phonemize(t, separator)
+            p = self._phonemize_cached(t, separator)
             phonemized.append(p)
         phonemized = self._phonemize_postprocess(phonemized, punctuations)
         return phonemized
@@ -138,3 +162,6 @@ class BasePhonemizer(abc.ABC):
         indent = "\t" * level
         print(f"{indent}| > phoneme language: {self.language}")
         print(f"{indent}| > phoneme backend: {self.name()}")
+        if self.phoneme_cache is not None:
+            stats = self.phoneme_cache.stats()
+            print(f"{indent}| > phoneme cache: {stats['size']} entries, {stats['hit_rate']:.2%} hit rate")
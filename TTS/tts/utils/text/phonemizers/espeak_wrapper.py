@@ -1,6 +1,10 @@
+import ctypes
+import ctypes.util
 import logging
+import os
 import re
 import subprocess
+import threading
 from typing import Dict, List
 
 from packaging.version import Version
@@ -80,6 +84,141 @@ def _espeak_exe(espeak_lib: str, args: List, sync=False) -> List[str]:
     return res2
 
 
+class _ESpeakVoice(ctypes.Structure):
+    """`espeak_VOICE` used to select a voice by language."""
+
+    _fields_ = [
+        ("name", ctypes.c_char_p),
+        ("languages", ctypes.c_char_p),
+        ("identifier", ctypes.c_char_p),
+        ("gender", ctypes.c_ubyte),
+        ("age", ctypes.c_ubyte),
+        ("variant", ctypes.c_ubyte),
+        ("xx1", ctypes.c_ubyte),
+        ("score", ctypes.c_int),
+        ("spare", ctypes.c_void_p),
+    ]
+
+
+class ESpeakLibrary:
+    """Resident `libespeak-ng` loaded with ctypes.
+
+    It runs the same code path as `espeak-ng -q --ipa=1`, synthesizing the text and tracing the phonemes to a memory
+    stream, so the output is identical to the command line without starting a process and loading the voice data for
+    every call. The library keeps a global state, so the calls are serialized with a lock.
+
+    Args:
+        lib_path (str): path to the shared library.
+    """
+
+    _AUDIO_OUTPUT_SYNCHRONOUS = 2
+    _POS_CHARACTER = 1
+    # espeakCHARS_UTF8 | espeakPHONEMES | espeakENDPAUSE, the flags of the command line except that the text is always
+    # decoded as UTF-8 instead of espeakCHARS_AUTO
+    _SYNTH_FLAGS = 0x1 | 0x100 | 0x1000
+    _ESPEAKPHONEMES_IPA = 0x02
+
+    def __init__(self, lib_path: str):
+        self.lib_path = lib_path
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"))
+        self._libc.open_memstream.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t)]
+        self._libc.open_memstream.restype = ctypes.c_void_p
+        self._libc.fclose.argtypes = [ctypes.c_void_p]
+        self._libc.free.argtypes = [ctypes.c_void_p]
+
+        lib = ctypes.cdll.LoadLibrary(lib_path)
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_Info.argtypes = [ctypes.c_void_p]
+        lib.espeak_Info.restype = ctypes.c_char_p
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_SetVoiceByProperties.argtypes = [ctypes.POINTER(_ESpeakVoice)]
+        lib.espeak_SetPhonemeTrace.argtypes = [ctypes.c_int, ctypes.c_void_p]
+        lib.espeak_Synth.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+            ctypes.c_uint,
+            ctypes.c_int,
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+        ]
+        # the data path is read from `ESPEAK_DATA_PATH` as for the command line
+        if lib.espeak_Initialize(self._AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0) <= 0:
+            raise RuntimeError(f" [!] Failed to initialize {lib_path}.")
+        # the generated audio is discarded, keep a reference to the callback as long as the library is loaded
+        self._synth_callback = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p)(
+            lambda wav, num_samples, events: 0
+        )
+        lib.espeak_SetSynthCallback(self._synth_callback)
+        self._lib = lib
+        self._voice = None
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        return self._lib.espeak_Info(None).decode("utf8").split()[0]
+
+    def _set_voice(self, voice: str) -> None:
+        # same fallback as the command line, names like `fr-fr` are only matched by language
+        if self._lib.espeak_SetVoiceByName(voice.encode("utf8")) != 0:
+            voice_spec = _ESpeakVoice(languages=voice.encode("utf8"))
+            if self._lib.espeak_SetVoiceByProperties(ctypes.byref(voice_spec)) != 0:
+                raise RuntimeError(f" [!] Unknown espeak-ng voice: {voice}")
+        self._voice = voice
+
+    def text_to_phonemes(self, text: str, voice: str, separator: str = "_") -> List[str]:
+        """Convert text to IPA phonemes with `separator` between the phonemes of a word.
+
+        Returns:
+            List[str]: the lines printed by `espeak-ng -q --ipa=1 -v {voice} {text}`.
+        """
+        text_buffer = ctypes.create_string_buffer(text.encode("utf8"))
+        buffer, size = ctypes.c_void_p(), ctypes.c_size_t()
+        with self._lock:
+            if voice != self._voice:
+                self._set_voice(voice)
+            stream = self._libc.open_memstream(ctypes.byref(buffer), ctypes.byref(size))
+            if not stream:
+                raise MemoryError(" [!] Failed to open a memory stream for the espeak-ng phoneme trace.")
+            try:
+                self._lib.espeak_SetPhonemeTrace(self._ESPEAKPHONEMES_IPA | (ord(separator) << 8), stream)
+                self._lib.espeak_Synth(
+                    text_buffer, len(text_buffer), 0, self._POS_CHARACTER, 0, self._SYNTH_FLAGS, None, None
+                )
+                self._lib.espeak_Synchronize()
+            finally:
+                self._lib.espeak_SetPhonemeTrace(0, None)
+                self._libc.fclose(stream)
+            try:
+                output = ctypes.string_at(buffer, size.value).decode("utf8")
+            finally:
+                self._libc.free(buffer)
+        return output.splitlines()
+
+
+_ESPEAK_LIBRARY = None
+_ESPEAK_LIBRARY_LOCK = threading.Lock()
+
+
+def get_espeak_library() -> ESpeakLibrary:
+    """Load `libespeak-ng` once per process. Returns None if the library is not found or fails to load.
+
+    The library is searched in the system library paths, set `ESPEAK_NG_LIBRARY` to use a specific file.
+    """
+    global _ESPEAK_LIBRARY  # pylint: disable=global-statement
+    with _ESPEAK_LIBRARY_LOCK:
+        if _ESPEAK_LIBRARY is None:
+            _ESPEAK_LIBRARY = False
+            lib_path = os.environ.get("ESPEAK_NG_LIBRARY") or ctypes.util.find_library("espeak-ng")
+            if lib_path is not None:
+                try:
+                    _ESPEAK_LIBRARY = ESpeakLibrary(lib_path)
+                except (OSError, AttributeError, RuntimeError) as e:
+                    logging.warning("espeak-ng: failed to load %s, falling back to the command line: %s", lib_path, e)
+        return _ESPEAK_LIBRARY or None
+
+
 class ESpeak(BasePhonemizer):
     """ESpeak wrapper calling `espeak` or `espeak-ng` from the command-line the perform G2P
 
@@ -97,6 +236,10 @@ class ESpeak(BasePhonemizer):
         keep_puncs (bool):
             If True, keep the punctuations after phonemization. Defaults to True.
 
+        use_library (bool):
+            If True and the backend is `espeak-ng`, phonemize with a resident `libespeak-ng` instead of starting a
+            process for every call. The command line is used if the library is not found. Defaults to True.
+
     Example:
 
         >>> from TTS.tts.utils.text.phonemizers import ESpeak
@@ -109,7 +252,14 @@ class ESpeak(BasePhonemizer):
     _ESPEAK_LIB = _DEF_ESPEAK_LIB
     _ESPEAK_VER = _DEF_ESPEAK_VER
 
-    def __init__(self, language: str, backend=None, punctuations=Punctuation.default_puncs(), keep_puncs=True):
+    def __init__(
+        self,
+        language: str,
+        backend=None,
+        punctuations=Punctuation.default_puncs(),
+        keep_puncs=True,
+        use_library=True,
+    ):
         if self._ESPEAK_LIB is None:
             raise Exception(" [!] No espeak backend found. Install espeak-ng or espeak to your system.")
         self.backend = self._ESPEAK_LIB
@@ -123,6 +273,7 @@ class ESpeak(BasePhonemizer):
         super().__init__(language, punctuations=punctuations, keep_puncs=keep_puncs)
         if backend is not None:
             self.backend = backend
+        self.use_library = use_library
 
     @property
     def backend(self):
@@ -187,10 +338,15 @@ class ESpeak(BasePhonemizer):
 
         args.append(text)
         # compute phonemes
+        library = get_espeak_library() if self.use_library and self.backend == "espeak-ng" and not tie else None
+        if library is not None:
+            lines = library.text_to_phonemes(text, self._language)
+        else:
+            lines = [line.decode("utf8") for line in _espeak_exe(self._ESPEAK_LIB, args, sync=True)]
         phonemes = ""
-        for line in _espeak_exe(self._ESPEAK_LIB, args, sync=True):
+        for line in lines:
             logging.debug("line: %s", repr(line))
-            ph_decoded = line.decode("utf8").strip()
+            ph_decoded = line.strip()
             # espeak:
             #   version 1.48.15: " p_ɹ_ˈaɪ_ɚ t_ə n_oʊ_v_ˈɛ_m_b_ɚ t_w_ˈɛ_n_t_i t_ˈuː\n"
             # espeak-ng:
@@ -208,6 +364,9 @@ class ESpeak(BasePhonemizer):
     def _phonemize(self, text, separator=None):
         return self.phonemize_espeak(text, separator, tie=False)
 
+    def cache_namespace(self) -> str:
+        return f"{self.name()}:{self.backend}:{self.backend_version}:{self.language}"
+
     @staticmethod
     def supported_languages() -> Dict:
         """Get a dictionary of supported languages.
@@ -109,6 +109,9 @@ class Gruut(BasePhonemizer):
     def _phonemize(self, text, separator):
         return self.phonemize_gruut(text, separator, tie=False)
 
+    def cache_namespace(self) -> str:
+        return f"{super().cache_namespace()}:{self.use_espeak_phonemes}:{self.keep_stress}"
+
     def is_supported_language(self, language):
         """Returns True if `language` is supported by the backend"""
         return gruut.is_language_supported(language)
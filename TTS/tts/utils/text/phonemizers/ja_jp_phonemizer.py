@@ -48,7 +48,7 @@ class JA_JP_Phonemizer(BasePhonemizer):
 
         Skip pre-post processing steps used by the other phonemizers.
         """
-        return self._phonemize(text, separator)
+        return self._phonemize_cached(text, separator)
 
     @staticmethod
     def supported_languages() -> Dict:
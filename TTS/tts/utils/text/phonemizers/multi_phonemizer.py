@@ -41,6 +41,11 @@ class MultiPhonemizer:
             raise ValueError("Language must be set for multi-phonemizer to phonemize.")
         return self.lang_to_phonemizer[language].phonemize(text, separator)
 
+    def set_cache(self, cache: "PhonemeCache") -> None:
+        """Share `cache` between the phonemizers of all the languages."""
+        for phonemizer in self.lang_to_phonemizer.values():
+            phonemizer.set_cache(cache)
+
     def supported_languages(self) -> List:
         return list(self.lang_to_phonemizer.keys())
 
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+
+class PhonemeCache:
+    """LRU cache of phonemized text segments.
+
+    The phonemizers look up every punctuation-free segment of the input text before calling the backend, so
+    repeated prompts and phrases are phonemized once. Segments are cached as a whole since the phonemes of a word
+    depend on its context. If `cache_path` is set, the entries are also stored in an SQLite database that is shared
+    by all the processes using the same path and survives restarts.
+
+    Args:
+        max_size (int, optional): maximum number of entries kept in memory. Defaults to 10000.
+        cache_path (str, optional): path to the SQLite database to persist the entries to. Defaults to None.
+
+    Example:
+
+        >>> from TTS.tts.utils.text.phonemizers import ESpeak
+        >>> from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
+        >>> phonemizer = ESpeak("en-us")
+        >>> phonemizer.set_cache(PhonemeCache(max_size=1000))
+        >>> phonemizer.phonemize("Hello, world!")
+        >>> phonemizer.phoneme_cache.stats()
+    """
+
+    def __init__(self, max_size: int = 10000, cache_path: str = None):
+        assert max_size > 0, " [!] `max_size` must be a positive integer."
+        self.max_size = max_size
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        if cache_path is not None and os.path.dirname(cache_path):
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # a connection must not be shared with forked processes, so open one per process
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.cache_path, timeout=60, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS phonemes (key TEXT PRIMARY KEY, phonemes TEXT NOT NULL)")
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def get(self, key: str) -> str:
+        """Return the cached phonemes or None if `key` is not in the cache."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            if self.cache_path is not None:
+                row = self._connection().execute("SELECT phonemes FROM phonemes WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self._add(key, row[0])
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, phonemes: str) -> None:
+        with self._lock:
+            self._add(key, phonemes)
+            if self.cache_path is not None:
+                with self._connection() as db:
+                    db.execute("INSERT OR REPLACE INTO phonemes (key, phonemes) VALUES (?, ?)", (key, phonemes))
+
+    def _add(self, key: str, phonemes: str) -> None:
+        self._entries[key] = phonemes
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the entries kept in memory. The entries in `cache_path` are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            num_lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / num_lookups if num_lookups > 0 else 0.0,
+            }
+
+    def __getstate__(self):
+        # the lock and the database connection can not be pickled, e.g. when the tokenizer is sent to a data loader
+        # worker, the copy reopens the database on first use
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_db"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
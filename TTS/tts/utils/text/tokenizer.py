@@ -4,6 +4,7 @@ from TTS.tts.utils.text import cleaners
 from TTS.tts.utils.text.characters import Graphemes, IPAPhonemes
 from TTS.tts.utils.text.phonemizers import DEF_LANG_TO_PHONEMIZER, get_phonemizer_by_name
 from TTS.tts.utils.text.phonemizers.multi_phonemizer import MultiPhonemizer
+from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
 from TTS.utils.generic_utils import get_import_path, import_class
 
 
@@ -207,6 +208,10 @@ class TTSTokenizer:
                             f"""No phonemizer found for language {config.phoneme_language}.
                             You may need to install a third party library for this language."""
                         ) from e
+            if "phonemizer_cache_size" in config and config.phonemizer_cache_size > 0:
+                phonemizer.set_cache(
+                    PhonemeCache(max_size=config.phonemizer_cache_size, cache_path=config.phonemizer_cache_path)
+                )
 
         return (
             TTSTokenizer(
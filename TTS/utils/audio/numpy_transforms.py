@@ -303,6 +303,94 @@ def compute_f0(
     return f0
 
 
+def compute_f0_yin(
+    *,
+    x: np.ndarray = None,
+    pitch_fmax: float = None,
+    pitch_fmin: float = None,
+    hop_length: int = None,
+    win_length: int = None,
+    sample_rate: int = None,
+    stft_pad_mode: str = "reflect",
+    center: bool = True,
+    yin_threshold: float = 0.1,
+    yin_voicing_threshold: float = 0.4,
+    yin_min_rms: float = 1e-3,
+    **kwargs,
+) -> np.ndarray:
+    """Compute pitch (f0) of a batch of waveforms with a vectorized YIN.
+
+    A much faster alternative to the pYIN of `compute_f0()` with the same framing, so the outputs have the same
+    length. The period of a frame is the first trough of the cumulative mean normalized difference function below
+    `yin_threshold`, or its global minimum, refined by parabolic interpolation. Frames where the function is above
+    `yin_voicing_threshold` at the period or quieter than `yin_min_rms` are unvoiced and set to 0. There is no
+    Viterbi smoothing over the frames as in pYIN.
+
+    Args:
+        x (np.ndarray): Waveforms with the same length. Shape :math:`[B, T_wav]` or :math:`[T_wav,]`
+        pitch_fmax (float): Pitch max value.
+        pitch_fmin (float): Pitch min value.
+        hop_length (int): Number of frames between STFT columns.
+        win_length (int): STFT window length.
+        sample_rate (int): Audio sampling rate.
+        stft_pad_mode (str): Padding mode for STFT.
+        center (bool): Centered padding.
+        yin_threshold (float): Threshold of the normalized difference function for picking the period. Defaults to 0.1.
+        yin_voicing_threshold (float): Maximum of the normalized difference function at the period of voiced frames.
+            Defaults to 0.4.
+        yin_min_rms (float): Minimum RMS of voiced frames. Defaults to 1e-3.
+
+    Returns:
+        np.ndarray: Pitch. Shape :math:`[B, T_pitch]` or :math:`[T_pitch,]`. :math:`T_pitch == T_wav / hop_length`
+    """
+    assert pitch_fmax is not None, " [!] Set `pitch_fmax` before caling `compute_f0_yin`."
+    assert pitch_fmin is not None, " [!] Set `pitch_fmin` before caling `compute_f0_yin`."
+
+    frame_length = win_length
+    # the difference function is integrated over the first half of the frame as in `compute_f0()`
+    integration_length = win_length // 2
+    min_period = max(int(np.floor(sample_rate / pitch_fmax)), 1)
+    max_period = min(int(np.ceil(sample_rate / pitch_fmin)), frame_length - integration_length - 1)
+
+    x = np.asarray(x, dtype=np.float32)
+    if center:
+        pad = [(0, 0)] * (x.ndim - 1) + [(frame_length // 2, frame_length // 2)]
+        x = np.pad(x, pad, mode=stft_pad_mode)
+    frames = np.lib.stride_tricks.sliding_window_view(x, frame_length, axis=-1)[..., ::hop_length, :]
+
+    # difference function from the autocorrelation and the energy of the windows, see librosa.yin()
+    a = np.fft.rfft(frames, frame_length, axis=-1)
+    b = np.fft.rfft(frames[..., integration_length:0:-1], frame_length, axis=-1)
+    acf = np.fft.irfft(a * b, frame_length, axis=-1)[..., integration_length:]
+    energy = np.cumsum(frames.astype(np.float64) ** 2, axis=-1)
+    energy = energy[..., integration_length:] - energy[..., :-integration_length]
+    diff = np.maximum(energy[..., :1] + energy - 2 * acf, 0)
+
+    # cumulative mean normalized difference function over the periods in [min_period, max_period]
+    cumulative_mean = np.cumsum(diff[..., 1 : max_period + 1], axis=-1) / np.arange(1, max_period + 1)
+    cmndf = diff[..., min_period : max_period + 1] / (cumulative_mean[..., min_period - 1 :] + 1e-10)
+
+    # first trough below the threshold or the global minimum
+    is_trough = np.zeros(cmndf.shape, dtype=bool)
+    is_trough[..., 1:-1] = (cmndf[..., 1:-1] < cmndf[..., :-2]) & (cmndf[..., 1:-1] <= cmndf[..., 2:])
+    is_trough[..., 0] = cmndf[..., 0] < cmndf[..., 1]
+    is_trough &= cmndf < yin_threshold
+    period = np.where(is_trough.any(axis=-1), np.argmax(is_trough, axis=-1), np.argmin(cmndf, axis=-1))
+    voiced = np.take_along_axis(cmndf, period[..., None], axis=-1)[..., 0] < yin_voicing_threshold
+    voiced &= np.sqrt(energy[..., 0] / integration_length) > yin_min_rms
+
+    # parabolic interpolation around the trough
+    idx = np.clip(period, 1, cmndf.shape[-1] - 2)[..., None]
+    left, mid, right = [np.take_along_axis(cmndf, idx + k, axis=-1)[..., 0] for k in (-1, 0, 1)]
+    denominator = left - 2 * mid + right
+    shift = np.where(np.abs(denominator) > 1e-10, 0.5 * (left - right) / np.where(denominator == 0, 1, denominator), 0)
+    shift = np.where((period > 0) & (period < cmndf.shape[-1] - 1), np.clip(shift, -1, 1), 0)
+
+    f0 = sample_rate / (min_period + period + shift)
+    f0[~voiced] = 0.0
+    return f0
+
+
 def compute_energy(y: np.ndarray, **kwargs) -> np.ndarray:
     """Compute energy of a waveform using the same parameters used for computing melspectrogram.
     Args:
@@ -1,16 +1,18 @@
 from io import BytesIO
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import librosa
 import numpy as np
 import scipy.io.wavfile
 import scipy.signal
+import torch
 
 from TTS.tts.utils.helpers import StandardScaler
 from TTS.utils.audio.numpy_transforms import (
     amp_to_db,
     build_mel_basis,
     compute_f0,
+    compute_f0_yin,
     db_to_amp,
     deemphasis,
     find_endpoint,
@@ -25,6 +27,7 @@ from TTS.utils.audio.numpy_transforms import (
     trim_silence,
     volume_norm,
 )
+from TTS.utils.audio.torch_transforms import griffin_lim as torch_griffin_lim
 
 # pylint: disable=too-many-public-methods
 
@@ -97,6 +100,10 @@ class AudioProcessor(object):
         pitch_fmax (int, optional):
             maximum filter frequency for computing pitch. Defaults to None.
 
+        pitch_extractor (str, optional):
+            algorithm for computing pitch. `pyin` for librosa's pYIN or `yin` for a much faster vectorized YIN without
+            Viterbi smoothing. Defaults to 'pyin'.
+
         spec_gain (int, optional):
             gain applied when converting amplitude to DB. Defaults to 20.
 
@@ -109,6 +116,13 @@ class AudioProcessor(object):
         griffin_lim_iters (int, optional):
             Number of GriffinLim iterations. Defaults to None.
 
+        griffin_lim_backend (str, optional):
+            GriffinLim implementation, `numpy` for the original algorithm with librosa or `torch` for the fast
+            GriffinLim algorithm with momentum that needs fewer iterations. Defaults to 'numpy'.
+
+        griffin_lim_momentum (float, optional):
+            Momentum of the `torch` GriffinLim updates. Defaults to 0.99.
+
         do_trim_silence (bool, optional):
             enable/disable silence trimming when loading the audio signal. Defaults to False.
 
@@ -160,10 +174,13 @@ class AudioProcessor(object):
         mel_fmax=None,
         pitch_fmax=None,
         pitch_fmin=None,
+        pitch_extractor="pyin",
         spec_gain=20,
         stft_pad_mode="reflect",
         clip_norm=True,
         griffin_lim_iters=None,
+        griffin_lim_backend="numpy",
+        griffin_lim_momentum=0.99,
         do_trim_silence=False,
         trim_db=60,
         do_sound_norm=False,
@@ -188,12 +205,17 @@ class AudioProcessor(object):
         self.power = power
         self.preemphasis = preemphasis
         self.griffin_lim_iters = griffin_lim_iters
+        if griffin_lim_backend not in ["numpy", "torch"]:
+            raise ValueError(f" [!] Unknown GriffinLim backend {griffin_lim_backend}, use `numpy` or `torch`.")
+        self.griffin_lim_backend = griffin_lim_backend
+        self.griffin_lim_momentum = griffin_lim_momentum
         self.signal_norm = signal_norm
         self.symmetric_norm = symmetric_norm
         self.mel_fmin = mel_fmin or 0
         self.mel_fmax = mel_fmax
         self.pitch_fmin = pitch_fmin
         self.pitch_fmax = pitch_fmax
+        self.pitch_extractor = pitch_extractor
         self.spec_gain = float(spec_gain)
         self.stft_pad_mode = stft_pad_mode
         self.max_norm = 1.0 if max_norm is None else float(max_norm)
@@ -353,7 +375,15 @@ class AudioProcessor(object):
         linear_std = stats["linear_std"]
         stats_config = stats["audio_config"]
         # check all audio parameters used for computing stats
-        skip_parameters = ["griffin_lim_iters", "stats_path", "do_trim_silence", "ref_level_db", "power"]
+        skip_parameters = [
+            "griffin_lim_iters",
+            "griffin_lim_backend",
+            "griffin_lim_momentum",
+            "stats_path",
+            "do_trim_silence",
+            "ref_level_db",
+            "power",
+        ]
         for key in stats_config.keys():
             if key in skip_parameters:
                 continue
@@ -474,6 +504,18 @@ class AudioProcessor(object):
         return mel
 
     def _griffin_lim(self, S):
+        if self.griffin_lim_backend == "torch":
+            wav = torch_griffin_lim(
+                torch.from_numpy(np.asarray(S, dtype=np.float32))[None],
+                torch.hann_window(self.win_length),
+                self.fft_size,
+                self.hop_length,
+                self.win_length,
+                num_iter=self.griffin_lim_iters,
+                momentum=self.griffin_lim_momentum,
+                pad_mode=self.stft_pad_mode,
+            )
+            return wav[0].numpy()
         return griffin_lim(
             spec=S,
             num_iter=self.griffin_lim_iters,
@@ -501,22 +543,46 @@ class AudioProcessor(object):
             >>> wav = ap.load_wav(WAV_FILE, sr=ap.sample_rate)[:5 * ap.sample_rate]
             >>> pitch = ap.compute_f0(wav)
         """
-        # align F0 length to the spectrogram length
-        if len(x) % self.hop_length == 0:
-            x = np.pad(x, (0, self.hop_length // 2), mode=self.stft_pad_mode)
+        return self.compute_f0_batch([x])[0]
 
-        f0 = compute_f0(
-            x=x,
-            pitch_fmax=self.pitch_fmax,
-            pitch_fmin=self.pitch_fmin,
-            hop_length=self.hop_length,
-            win_length=self.win_length,
-            sample_rate=self.sample_rate,
-            stft_pad_mode=self.stft_pad_mode,
-            center=True,
-        )
+    def compute_f0_batch(self, wavs: List[np.ndarray]) -> List[np.ndarray]:
+        """Compute pitch (f0) of waveforms with different lengths.
+
+        The `yin` pitch extractor processes them together, `pyin` one after another.
+
+        Args:
+            wavs (List[np.ndarray]): Waveforms.
 
-        return f0
+        Returns:
+            List[np.ndarray]: Pitch of every waveform.
+        """
+        f0_args = {
+            "pitch_fmax": self.pitch_fmax,
+            "pitch_fmin": self.pitch_fmin,
+            "hop_length": self.hop_length,
+            "win_length": self.win_length,
+            "sample_rate": self.sample_rate,
+            "stft_pad_mode": self.stft_pad_mode,
+        }
+        # align F0 length to the spectrogram length
+        wavs = [
+            np.pad(x, (0, self.hop_length // 2), mode=self.stft_pad_mode) if len(x) % self.hop_length == 0 else x
+            for x in wavs
+        ]
+
+        if self.pitch_extractor == "pyin":
+            return [compute_f0(x=x, center=True, **f0_args) for x in wavs]
+        if self.pitch_extractor != "yin":
+            raise ValueError(f" [!] Unknown pitch extractor {self.pitch_extractor}, use `pyin` or `yin`.")
+
+        # pad the waveforms to the same length after the centered padding of each one
+        pad = self.win_length // 2
+        wavs = [np.pad(x, (pad, pad), mode=self.stft_pad_mode) for x in wavs]
+        batch = np.zeros((len(wavs), max(len(x) for x in wavs)), dtype=np.float32)
+        for i, x in enumerate(wavs):
+            batch[i, : len(x)] = x
+        f0 = compute_f0_yin(x=batch, center=False, **f0_args)
+        return [f0[i, : (len(x) - self.win_length) // self.hop_length + 1] for i, x in enumerate(wavs)]
 
     ### Audio Processing ###
     def find_endpoint(self, wav: np.ndarray, min_silence_sec=0.8) -> int:
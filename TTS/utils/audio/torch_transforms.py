@@ -1,5 +1,9 @@
+import math
+
 import librosa
+import numpy as np
 import torch
+import torchaudio
 from torch import nn
 
 
@@ -163,3 +167,274 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
     @staticmethod
     def _db_to_amp(x, spec_gain=1.0):
         return torch.exp(x) / spec_gain
+
+
+def griffin_lim(
+    S: torch.Tensor,
+    window: torch.Tensor,
+    fft_size: int,
+    hop_length: int,
+    win_length: int,
+    num_iter: int = 30,
+    momentum: float = 0.99,
+    pad_mode: str = "reflect",
+    lengths: torch.Tensor = None,
+) -> torch.Tensor:
+    """Fast Griffin-Lim phase reconstruction of a batch of magnitude spectrograms.
+
+    It runs the accelerated updates of Perraudin et al., "A fast Griffin-Lim algorithm", that extrapolate the phase
+    estimates by `momentum / (1 + momentum)` of the previous estimate as in `torchaudio`, and reach the spectral
+    convergence of 60 iterations of the original algorithm in about 16. `momentum=0` gives the original algorithm.
+
+    Args:
+        S (Tensor): magnitude spectrograms, zero padded after `lengths`.
+        window (Tensor): STFT window of `win_length` samples.
+        fft_size (int): FFT size.
+        hop_length (int): hop length.
+        win_length (int): window length.
+        num_iter (int): number of iterations. Defaults to 30.
+        momentum (float): momentum of the updates, in `[0, 1)`. Defaults to 0.99.
+        pad_mode (str): padding mode of the STFT. Defaults to "reflect".
+        lengths (Tensor): number of frames of each spectrogram. Defaults to the length of the batch.
+
+    Returns:
+        Tensor: waveforms of `(lengths - 1) * hop_length` samples with zeros after the end.
+
+    Shapes:
+        S: :math:`[B, C, T_spec]`
+        lengths: :math:`[B]`
+        output: :math:`[B, (T_spec - 1) * hop_length]`
+    """
+    if not 0 <= momentum < 1:
+        raise ValueError(f" [!] Griffin-Lim momentum must be in [0, 1), got {momentum}.")
+    num_samples = (S.shape[-1] - 1) * hop_length
+    wav_mask = None
+    if lengths is not None:
+        S = S * (torch.arange(S.shape[-1], device=S.device)[None, :] < lengths[:, None])[:, None, :]
+        wav_mask = torch.arange(num_samples, device=S.device)[None, :] < ((lengths - 1) * hop_length)[:, None]
+
+    def _istft(spec):
+        wav = torch.istft(spec, fft_size, hop_length, win_length, window, center=True, length=num_samples)
+        return wav * wav_mask if wav_mask is not None else wav
+
+    angles = torch.exp(2j * math.pi * torch.rand(S.shape, device=S.device))
+    S = S.to(angles.dtype)
+    rebuilt_prev = torch.zeros_like(angles)
+    for _ in range(num_iter):
+        wav = _istft(S * angles)
+        rebuilt = torch.stft(
+            wav, fft_size, hop_length, win_length, window, center=True, pad_mode=pad_mode, return_complex=True
+        )
+        angles = rebuilt - momentum / (1 + momentum) * rebuilt_prev
+        angles = angles / (angles.abs() + 1e-16)
+        rebuilt_prev = rebuilt
+    return _istft(S * angles)
+
+
+class BatchSpectrogram(nn.Module):  # pylint: disable=abstract-method
+    """Batched torch version of the spectrograms of `AudioProcessor`.
+
+    It applies the same pre-emphasis, STFT, mel filters, dB scaling and normalization as
+    `AudioProcessor.melspectrogram()` and `AudioProcessor.spectrogram()`, but to a zero padded batch of waveforms at
+    once, on any device. Every waveform is padded on its own as in the STFT of a single waveform, so the frames match
+    the ones of `AudioProcessor` up to float precision and the frames after the end of a waveform are zeros.
+
+    `inv_melspectrogram()` and `inv_spectrogram()` reconstruct the waveforms of a batch with the fast Griffin-Lim
+    algorithm, see `griffin_lim()`.
+
+    `TorchSTFT` is not used since it clamps the magnitudes and uses a different dB scale.
+
+    Args:
+        ap (AudioProcessor): audio processor to copy the parameters from.
+    """
+
+    def __init__(self, ap):
+        super().__init__()
+        self.fft_size = ap.fft_size
+        self.hop_length = ap.hop_length
+        self.win_length = ap.win_length
+        self.pad_mode = ap.stft_pad_mode
+        self.preemphasis = ap.preemphasis
+        self.do_amp_to_db_linear = ap.do_amp_to_db_linear
+        self.do_amp_to_db_mel = ap.do_amp_to_db_mel
+        self.spec_gain = ap.spec_gain
+        self.log_base = float(ap.base)
+        self.signal_norm = ap.signal_norm
+        self.ref_level_db = ap.ref_level_db
+        self.min_level_db = ap.min_level_db
+        self.max_norm = ap.max_norm
+        self.symmetric_norm = ap.symmetric_norm
+        self.clip_norm = ap.clip_norm
+        self.power = ap.power
+        self.griffin_lim_iters = ap.griffin_lim_iters
+        self.griffin_lim_momentum = getattr(ap, "griffin_lim_momentum", 0.99)
+        self.register_buffer("window", torch.hann_window(ap.win_length), persistent=False)
+        self.register_buffer("mel_basis", torch.from_numpy(ap.mel_basis).float(), persistent=False)
+        self.register_buffer("inv_mel_basis", torch.from_numpy(np.linalg.pinv(ap.mel_basis)).float(), persistent=False)
+        self.use_scaler = hasattr(ap, "mel_scaler")
+        if self.use_scaler:
+            for name, scaler in [("mel", ap.mel_scaler), ("linear", ap.linear_scaler)]:
+                self.register_buffer(f"{name}_mean", torch.as_tensor(scaler.mean_).float(), persistent=False)
+                self.register_buffer(f"{name}_scale", torch.as_tensor(scaler.scale_).float(), persistent=False)
+
+    def spec_lengths(self, lengths: torch.Tensor) -> torch.Tensor:
+        """Number of spectrogram frames of waveforms with the given lengths."""
+        return lengths // self.hop_length + 1
+
+    def _stft_magnitude(self, x: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+        if lengths is None:
+            lengths = torch.full((x.shape[0],), x.shape[1], dtype=torch.long)
+        lengths = [int(length) for length in lengths]
+        x = x.to(self.window.dtype)
+        if self.preemphasis != 0:
+            x = torch.cat([x[:, :1], x[:, 1:] - self.preemphasis * x[:, :-1]], dim=1)
+        # pad every waveform on its own, as with `center=True` in the STFT of a single waveform
+        padding = self.fft_size // 2
+        x = nn.utils.rnn.pad_sequence(
+            [
+                torch.nn.functional.pad(x[i : i + 1, :length], (padding, padding), mode=self.pad_mode)[0]
+                for i, length in enumerate(lengths)
+            ],
+            batch_first=True,
+        )
+        S = torch.stft(
+            x,
+            self.fft_size,
+            self.hop_length,
+            self.win_length,
+            self.window,
+            center=False,
+            onesided=True,
+            return_complex=True,
+        ).abs()
+        spec_lengths = self.spec_lengths(torch.tensor(lengths, device=S.device))
+        mask = torch.arange(S.shape[-1], device=S.device)[None, :] < spec_lengths[:, None]
+        return S, mask[:, None, :]
+
+    def _amp_to_db(self, x: torch.Tensor) -> torch.Tensor:
+        return self.spec_gain * torch.log(torch.clamp(x, min=1e-8)) / math.log(self.log_base)
+
+    def _normalize(self, S: torch.Tensor, name: str) -> torch.Tensor:
+        if not self.signal_norm:
+            return S
+        if self.use_scaler:
+            mean, scale = getattr(self, f"{name}_mean"), getattr(self, f"{name}_scale")
+            if mean.shape[0] != S.shape[1]:
+                raise RuntimeError(" [!] Mean-Var stats does not match the given feature dimensions.")
+            return (S - mean[:, None]) / scale[:, None]
+        S_norm = (S - self.ref_level_db - self.min_level_db) / (-self.min_level_db)
+        if self.symmetric_norm:
+            S_norm = ((2 * self.max_norm) * S_norm) - self.max_norm
+            if self.clip_norm:
+                S_norm = torch.clamp(S_norm, -self.max_norm, self.max_norm)
+            return S_norm
+        S_norm = self.max_norm * S_norm
+        if self.clip_norm:
+            S_norm = torch.clamp(S_norm, 0, self.max_norm)
+        return S_norm
+
+    def melspectrogram(self, x: torch.Tensor, lengths: torch.Tensor = None) -> torch.Tensor:
+        """Compute the melspectrograms of a batch of waveforms.
+
+        Args:
+            x (Tensor): zero padded waveforms.
+            lengths (Tensor): lengths of the waveforms. Defaults to the length of the batch.
+
+        Returns:
+            Tensor: melspectrograms with zeros after the end of every waveform.
+
+        Shapes:
+            x: :math:`[B, T_wav]`
+            lengths: :math:`[B]`
+            output: :math:`[B, C, T_spec]`
+        """
+        S, mask = self._stft_magnitude(x, lengths)
+        S = torch.matmul(self.mel_basis, S)
+        if self.do_amp_to_db_mel:
+            S = self._amp_to_db(S)
+        return self._normalize(S, "mel") * mask
+
+    def spectrogram(self, x: torch.Tensor, lengths: torch.Tensor = None) -> torch.Tensor:
+        """Compute the linear spectrograms of a batch of waveforms, see `melspectrogram()`."""
+        S, mask = self._stft_magnitude(x, lengths)
+        if self.do_amp_to_db_linear:
+            S = self._amp_to_db(S)
+        return self._normalize(S, "linear") * mask
+
+    def _denormalize(self, S: torch.Tensor, name: str) -> torch.Tensor:
+        if not self.signal_norm:
+            return S
+        if self.use_scaler:
+            mean, scale = getattr(self, f"{name}_mean"), getattr(self, f"{name}_scale")
+            if mean.shape[0] != S.shape[1]:
+                raise RuntimeError(" [!] Mean-Var stats does not match the given feature dimensions.")
+            return S * scale[:, None] + mean[:, None]
+        if self.symmetric_norm:
+            if self.clip_norm:
+                S = torch.clamp(S, -self.max_norm, self.max_norm)
+            S = ((S + self.max_norm) * -self.min_level_db / (2 * self.max_norm)) + self.min_level_db
+            return S + self.ref_level_db
+        if self.clip_norm:
+            S = torch.clamp(S, 0, self.max_norm)
+        S = (S * -self.min_level_db / self.max_norm) + self.min_level_db
+        return S + self.ref_level_db
+
+    def _db_to_amp(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.pow(self.log_base, x / self.spec_gain)
+
+    def _griffin_lim(self, S: torch.Tensor, lengths: torch.Tensor, num_iter: int, momentum: float) -> torch.Tensor:
+        wav = griffin_lim(
+            S**self.power,
+            self.window,
+            self.fft_size,
+            self.hop_length,
+            self.win_length,
+            num_iter=self.griffin_lim_iters if num_iter is None else num_iter,
+            momentum=self.griffin_lim_momentum if momentum is None else momentum,
+            pad_mode=self.pad_mode,
+            lengths=lengths,
+        )
+        if self.preemphasis != 0:
+            wav = torchaudio.functional.lfilter(
+                wav,
+                wav.new_tensor([1.0, -self.preemphasis]),
+                wav.new_tensor([1.0, 0.0]),
+                clamp=False,
+            )
+            if lengths is not None:
+                # drop the tail of the filter after the end of every waveform
+                wav = wav * (
+                    torch.arange(wav.shape[1], device=wav.device)[None, :] < (lengths - 1)[:, None] * self.hop_length
+                )
+        return wav
+
+    def inv_melspectrogram(
+        self, S: torch.Tensor, lengths: torch.Tensor = None, num_iter: int = None, momentum: float = None
+    ) -> torch.Tensor:
+        """Reconstruct the waveforms of a batch of melspectrograms with the fast Griffin-Lim algorithm.
+
+        Args:
+            S (Tensor): normalized melspectrograms as computed by `melspectrogram()`.
+            lengths (Tensor): number of frames of each melspectrogram. Defaults to the length of the batch.
+            num_iter (int): number of Griffin-Lim iterations. Defaults to `griffin_lim_iters` of the audio processor.
+            momentum (float): momentum of the Griffin-Lim updates. Defaults to `griffin_lim_momentum` of the audio
+                processor.
+
+        Returns:
+            Tensor: waveforms of `(lengths - 1) * hop_length` samples with zeros after the end.
+
+        Shapes:
+            S: :math:`[B, C, T_spec]`
+            lengths: :math:`[B]`
+            output: :math:`[B, (T_spec - 1) * hop_length]`
+        """
+        S = self._db_to_amp(self._denormalize(S.float(), "mel"))
+        S = torch.clamp(torch.matmul(self.inv_mel_basis, S), min=1e-10)
+        return self._griffin_lim(S, lengths, num_iter, momentum)
+
+    def inv_spectrogram(
+        self, S: torch.Tensor, lengths: torch.Tensor = None, num_iter: int = None, momentum: float = None
+    ) -> torch.Tensor:
+        """Reconstruct the waveforms of a batch of linear spectrograms, see `inv_melspectrogram()`."""
+        S = self._db_to_amp(self._denormalize(S.float(), "linear"))
+        return self._griffin_lim(S, lengths, num_iter, momentum)
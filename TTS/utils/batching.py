@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, List
+
+
+class DynamicBatcher:
+    """Collect items submitted by concurrent callers and process them in batches.
+
+    A background thread waits up to `timeout` seconds after the first queued item for more items to arrive, then
+    groups the collected items by their key and calls `batch_fn` once per group with at most `max_batch_size` items.
+    Only items with the same key are batched together, e.g. sentences of the same speaker.
+
+    Args:
+        batch_fn (Callable): function taking a list of items and returning a list of results in the same order.
+        max_batch_size (int, optional): maximum number of items passed to `batch_fn` at once. Defaults to 8.
+        timeout (float, optional): seconds to wait for more items before running a batch. Defaults to 0.01.
+    """
+
+    def __init__(self, batch_fn: Callable[[List], List], max_batch_size: int = 8, timeout: float = 0.01):
+        assert max_batch_size > 0, " [!] `max_batch_size` must be a positive integer."
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, item: Any, key: Hashable = None) -> Future:
+        """Queue a single item. The returned future resolves to its result."""
+        return self.submit_many([item], key=key)[0]
+
+    def submit_many(self, items: List, key: Hashable = None) -> List[Future]:
+        """Queue several items with the same key, e.g. all the sentences of a request."""
+        self._start()
+        futures = []
+        for item in items:
+            future = Future()
+            self._queue.put((key, item, future))
+            futures.append(future)
+        return futures
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dynamic_batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List:
+        """Block for the first item and gather the items arriving in the following `timeout` seconds."""
+        batch = [self._queue.get()]
+        deadline = time.time() + self.timeout
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            groups = {}
+            for key, item, future in self._collect():
+                groups.setdefault(key, []).append((item, future))
+            for group in groups.values():
+                for start in range(0, len(group), self.max_batch_size):
+                    self._run_batch(group[start : start + self.max_batch_size])
+
+    def _run_batch(self, batch: List) -> None:
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except Exception as e:  # pylint: disable=broad-except
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
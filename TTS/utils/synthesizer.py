@@ -1,6 +1,6 @@
 import os
 import time
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 
 import numpy as np
 import pysbd
@@ -10,15 +10,20 @@ from torch import nn
 from TTS.config import load_config
 from TTS.tts.configs.vits_config import VitsConfig
 from TTS.tts.models import setup_model as setup_tts_model
+from TTS.tts.models.forward_tts import ForwardTTS
+from TTS.tts.models.glow_tts import GlowTTS
+from TTS.tts.models.tacotron2 import Tacotron2
 from TTS.tts.models.vits import Vits
 
 # pylint: disable=unused-wildcard-import
 # pylint: disable=wildcard-import
-from TTS.tts.utils.synthesis import synthesis, transfer_voice, trim_silence
+from TTS.tts.utils.synthesis import synthesis, synthesis_batch, transfer_voice, trim_silence
 from TTS.utils.audio import AudioProcessor
 from TTS.utils.audio.numpy_transforms import save_wav
+from TTS.utils.batching import DynamicBatcher
 from TTS.vc.models import setup_model as setup_vc_model
 from TTS.vocoder.models import setup_model as setup_vocoder_model
+from TTS.vocoder.models.gan import GAN
 from TTS.vocoder.utils.generic_utils import interpolate_vocoder_input
 
 
@@ -38,6 +43,8 @@ class Synthesizer(nn.Module):
         model_dir: str = "",
         voice_dir: str = None,
         use_cuda: bool = False,
+        max_batch_size: int = 1,
+        batch_timeout: float = 0.01,
     ) -> None:
         """General 🐸 TTS interface for inference. It takes a tts and a vocoder
         model and synthesize speech from the provided text.
@@ -48,6 +55,10 @@ class Synthesizer(nn.Module):
         If you have certain special characters in your text, you need to handle
         them before providing the text to Synthesizer.
 
+        With `max_batch_size > 1`, the sentences of models that support padded batches (VITS, ForwardTTS, GlowTTS
+        and Tacotron2) are synthesized in batches. Sentences of concurrent `tts()` calls with the same speaker and
+        language that arrive within `batch_timeout` seconds are batched together.
+
         TODO: set the segmenter based on the source language
 
         Args:
@@ -60,6 +71,8 @@ class Synthesizer(nn.Module):
             vc_checkpoint (str, optional): path to the voice conversion model file. Defaults to `""`,
             vc_config (str, optional): path to the voice conversion config file. Defaults to `""`,
             use_cuda (bool, optional): enable/disable cuda. Defaults to False.
+            max_batch_size (int, optional): maximum number of sentences synthesized in one batch. Defaults to 1.
+            batch_timeout (float, optional): seconds to wait for sentences of concurrent calls. Defaults to 0.01.
         """
         super().__init__()
         self.tts_checkpoint = tts_checkpoint
@@ -88,6 +101,9 @@ class Synthesizer(nn.Module):
         self.voice_dir = voice_dir
         if self.use_cuda:
             assert torch.cuda.is_available(), "CUDA is not availabe on this machine."
+        self.batcher = None
+        if max_batch_size > 1:
+            self.batcher = DynamicBatcher(self._tts_batch, max_batch_size=max_batch_size, timeout=batch_timeout)
 
         if tts_checkpoint:
             self._load_tts(tts_checkpoint, tts_config_path, use_cuda)
@@ -250,6 +266,79 @@ class Synthesizer(nn.Module):
             wav = np.array(wav)
         save_wav(wav=wav, path=path, sample_rate=self.output_sample_rate, pipe_out=pipe_out)
 
+    @property
+    def supports_batching(self) -> bool:
+        """Whether the TTS model can synthesize padded batches of sentences."""
+        if self.tts_config.get("use_capacitron_vae", False):
+            return False
+        return isinstance(self.tts_model, (Vits, ForwardTTS, GlowTTS, Tacotron2))
+
+    def _tts_batch(self, items: List[Tuple[str, Dict]]) -> List[np.ndarray]:
+        """Synthesize a batch of sentences sharing the same speaker and language with a single pass of the TTS
+        model and a single pass of the vocoder.
+
+        Args:
+            items (List[Tuple[str, Dict]]): sentences and their conditioning inputs `speaker_id`, `d_vector` and
+                `language_id`. The conditioning of the first item is used for the whole batch.
+
+        Returns:
+            List[np.ndarray]: waveform of each sentence.
+        """
+        use_gl = self.vocoder_model is None
+        outputs = synthesis_batch(
+            model=self.tts_model,
+            texts=[sen for sen, _ in items],
+            CONFIG=self.tts_config,
+            use_cuda=self.use_cuda,
+            use_griffin_lim=use_gl,
+            **items[0][1],
+        )
+        if use_gl or outputs[0]["model_outputs"].ndim == 1:
+            waveforms = [output["wav"] for output in outputs]
+        else:
+            waveforms = self._vocoder_inference_batch([output["model_outputs"] for output in outputs])
+        if "do_trim_silence" in self.tts_config.audio and self.tts_config.audio["do_trim_silence"]:
+            waveforms = [trim_silence(waveform, self.tts_model.ap) for waveform in waveforms]
+        return waveforms
+
+    def _vocoder_inference_batch(self, mel_postnet_specs: List[np.ndarray]) -> List[np.ndarray]:
+        """Run the vocoder on the padded spectrograms and cut the padding from the waveforms.
+
+        Only GAN vocoders are run in batch mode, the others are run on each spectrogram.
+        """
+        vocoder_device = "cuda" if self.use_cuda else next(self.vocoder_model.parameters()).device
+        scale_factor = [1, self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate]
+        vocoder_inputs = []
+        for mel_postnet_spec in mel_postnet_specs:
+            # denormalize tts output based on tts audio config
+            mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
+            # renormalize spectrogram based on vocoder config
+            vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
+            if scale_factor[1] != 1:
+                vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)
+            else:
+                vocoder_input = torch.tensor(vocoder_input).unsqueeze(0)  # pylint: disable=not-callable
+            vocoder_inputs.append(vocoder_input)
+
+        if not isinstance(self.vocoder_model, GAN) or len(vocoder_inputs) == 1:
+            waveforms = [self.vocoder_model.inference(x.to(vocoder_device)) for x in vocoder_inputs]
+            return [waveform.cpu().numpy().squeeze() for waveform in waveforms]
+
+        # [B, C, T], pad with the lowest value to mimic silence
+        lengths = [x.shape[-1] for x in vocoder_inputs]
+        pad_value = min(x.min().item() for x in vocoder_inputs)
+        batch = torch.full((len(vocoder_inputs), vocoder_inputs[0].shape[1], max(lengths)), pad_value)
+        for idx, x in enumerate(vocoder_inputs):
+            batch[idx, :, : lengths[idx]] = x[0]
+        waveforms = self.vocoder_model.inference(batch.to(vocoder_device)).cpu()
+        # some vocoders pad their input, keep these extra samples for each item
+        hop_length = self.vocoder_config["audio"]["hop_length"]
+        num_extra_samples = waveforms.shape[-1] - max(lengths) * hop_length
+        return [
+            waveforms[idx, 0, : lengths[idx] * hop_length + num_extra_samples].numpy()
+            for idx in range(len(vocoder_inputs))
+        ]
+
     def voice_conversion(self, source_wav: str, target_wav: str) -> List[int]:
         output_wav = self.vc_model.voice_conversion(source_wav, target_wav)
         return output_wav
@@ -380,7 +469,23 @@ class Synthesizer(nn.Module):
         if self.use_cuda:
             vocoder_device = "cuda"
 
-        if not reference_wav:  # not voice conversion
+        use_batching = (
+            self.batcher is not None
+            and self.supports_batching
+            and style_wav is None
+            and style_text is None
+            and not hasattr(self.tts_model, "synthesize")
+        )
+
+        if not reference_wav and use_batching:
+            # sentences with the same conditioning can share a batch with other calls
+            conditioning = {"speaker_id": speaker_id, "d_vector": speaker_embedding, "language_id": language_id}
+            key = (speaker_name if speaker_embedding is not None else speaker_id, str(speaker_wav), language_id)
+            futures = self.batcher.submit_many([(sen, conditioning) for sen in sens], key=key)
+            for future in futures:
+                wavs += list(future.result())
+                wavs += [0] * 10000
+        elif not reference_wav:  # not voice conversion
             for sen in sens:
                 if hasattr(self.tts_model, "synthesize"):
                     outputs = self.tts_model.synthesize(
@@ -503,3 +608,75 @@ class Synthesizer(nn.Module):
         print(f" > Processing time: {process_time}")
         print(f" > Real-time factor: {process_time / audio_time}")
         return wavs
+
+    def tts_stream(
+        self,
+        text: str,
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav=None,
+        split_sentences: bool = True,
+        **kwargs,
+    ) -> Iterator[np.ndarray]:
+        """Generate speech sentence by sentence so that playback can start before the whole text is synthesized.
+
+        XTTS models are run with `Xtts.inference_stream()` and yield several chunks per sentence. The other models
+        yield the waveform of each sentence. As in `tts()`, every sentence is followed by a short silence.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav for voice cloning. Defaults to None.
+            split_sentences (bool, optional): split the input text into sentences. Defaults to True.
+            **kwargs: additional arguments to pass to `tts()` or `Xtts.inference_stream()`.
+
+        Yields:
+            np.ndarray: the next chunk of the waveform.
+        """
+        if not text:
+            raise ValueError(" [!] You need to define `text` to stream speech.")
+        sens = self.split_into_sentences(text) if split_sentences else [text]
+
+        if self.tts_config.model != "xtts":
+            for sen in sens:
+                yield np.asarray(
+                    self.tts(
+                        sen,
+                        speaker_name=speaker_name,
+                        language_name=language_name,
+                        speaker_wav=speaker_wav,
+                        split_sentences=False,
+                        **kwargs,
+                    ),
+                    dtype=np.float32,
+                )
+            return
+
+        config = self.tts_config
+        if speaker_name and speaker_name in getattr(self.tts_model.speaker_manager, "speakers", {}):
+            gpt_cond_latent, speaker_embedding = self.tts_model.speaker_manager.speakers[speaker_name].values()
+        elif speaker_wav is not None:
+            gpt_cond_latent, speaker_embedding = self.tts_model.get_cached_conditioning_latents(
+                audio_path=speaker_wav,
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+        else:
+            raise ValueError(" [!] You need to define either a `speaker_name` or a `speaker_wav` to use XTTS.")
+        settings = {
+            "temperature": config.temperature,
+            "length_penalty": config.length_penalty,
+            "repetition_penalty": config.repetition_penalty,
+            "top_k": config.top_k,
+            "top_p": config.top_p,
+        }
+        settings.update(kwargs)
+        for sen in sens:
+            for chunk in self.tts_model.inference_stream(
+                sen, language_name, gpt_cond_latent, speaker_embedding, **settings
+            ):
+                yield chunk.cpu().numpy().astype(np.float32)
+            yield np.zeros(10000, dtype=np.float32)
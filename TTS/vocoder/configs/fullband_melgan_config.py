@@ -31,8 +31,9 @@ class FullbandMelganConfig(BaseGANVocoderConfig):
             enable / disable random noise added to the input waveform. The noise is added after computing the
             features. Defaults to True.
         use_cache (bool):
-            enable / disable in memory caching of the computed features. It can cause OOM error if the system RAM is
-            not large enough. Defaults to True.
+            enable / disable caching of the computed features in a memory-mapped file under
+            `feature_cache_path`, no caching if it is not set.
+            Defaults to True.
         use_stft_loss (bool):
             enable / disable use of STFT loss originally used by ParallelWaveGAN model. Defaults to True.
         use_subband_stft (bool):
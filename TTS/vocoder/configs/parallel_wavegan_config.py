@@ -28,8 +28,9 @@ class ParallelWaveganConfig(BaseGANVocoderConfig):
             enable / disable random noise added to the input waveform. The noise is added after computing the
             features. Defaults to True.
         use_cache (bool):
-            enable / disable in memory caching of the computed features. It can cause OOM error if the system RAM is
-            not large enough. Defaults to True.
+            enable / disable caching of the computed features in a memory-mapped file under
+            `feature_cache_path`, no caching if it is not set.
+            Defaults to True.
         steps_to_start_discriminator (int):
             Number of steps required to start training the discriminator. Defaults to 0.
         use_stft_loss (bool):`
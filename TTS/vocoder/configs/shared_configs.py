@@ -26,8 +26,12 @@ class BaseVocoderConfig(BaseTrainingConfig):
             Extra padding for the feature frames against convolution of the edge frames. Defaults to MISSING.
             Defaults to 0.
         use_cache (bool):
-            enable / disable in memory caching of the computed features. If the RAM is not enough, if may cause OOM.
-            Defaults to False.
+            enable / disable caching of the computed features. Defaults to False.
+        feature_cache_path (str):
+            Directory of a feature cache. If set, the features are computed once before the training and saved in a
+            memory-mapped file shared by the data loader workers. The cache files are named after the dataset and audio
+            settings, so they are reused by the next runs. If None, `use_cache` has no effect and the features are
+            computed on the fly. Defaults to None.
         epochs (int):
             Number of training epochs to. Defaults to 10000.
         wd (float):
@@ -48,7 +52,8 @@ class BaseVocoderConfig(BaseTrainingConfig):
     seq_len: int = 1000  # signal length used in training.
     pad_short: int = 0  # additional padding for short wavs
     conv_pad: int = 0  # additional padding against convolutions applied to spectrograms
-    use_cache: bool = False  # use in memory cache to keep the computed features. This might cause OOM.
+    use_cache: bool = False  # cache the computed features.
+    feature_cache_path: str = None  # directory of a memory-mapped feature cache. If None, no cache.
     # OPTIMIZER
     epochs: int = 10000  # total number of epochs to train.
     wd: float = 0.0  # Weight decay weight.
@@ -27,8 +27,9 @@ class WavegradConfig(BaseVocoderConfig):
         seq_len (int):
             Audio segment length used at training. Larger values use more memory. Defaults to 6144.
         use_cache (bool):
-            enable / disable in memory caching of the computed features. It can cause OOM error if the system RAM is
-            not large enough. Defaults to True.
+            enable / disable caching of the computed features in a memory-mapped file under
+            `feature_cache_path`, no caching if it is not set.
+            Defaults to True.
         mixed_precision (bool):
             enable / disable mixed precision training. Default is True.
         eval_split_size (int):
@@ -44,6 +44,9 @@ class WavernnConfig(BaseVocoderConfig):
             Size of the segments in batched mode. Defaults to 11000.
         overlap_sampels (int):
             Size of the overlap between consecutive segments. Defaults to 550.
+        int8_inference (bool):
+            enable / disable int8 weights in the sampling loop at inference. It is several times faster on CPU at the
+            cost of some precision. Not supported on GPU. Defaults to False.
         batch_size (int):
             Batch size used at training. Larger values use more memory. Defaults to 256.
         seq_len (int):
@@ -82,6 +85,7 @@ class WavernnConfig(BaseVocoderConfig):
     batched: bool = True
     target_samples: int = 11000
     overlap_samples: int = 550
+    int8_inference: bool = False
 
     # Training - overrides
     epochs: int = 10000
@@ -25,6 +25,7 @@ def setup_dataset(config: Coqpit, ap: AudioProcessor, is_eval: bool, data_items:
             use_noise_augment=config.use_noise_augment,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_path=config.feature_cache_path,
         )
         dataset.shuffle_mapping()
     elif config.model.lower() == "wavegrad":
@@ -40,6 +41,7 @@ def setup_dataset(config: Coqpit, ap: AudioProcessor, is_eval: bool, data_items:
             use_noise_augment=False,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_path=config.feature_cache_path,
         )
     elif config.model.lower() == "wavernn":
         dataset = WaveRNNDataset(
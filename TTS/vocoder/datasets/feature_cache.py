@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+
+class FeatureCache:
+    """Read-only cache of precomputed arrays stored in a single memory-mapped file.
+
+    Every item is a tuple of float32 arrays, e.g. `(audio, mel)`, written back to back to `{key}.bin` with their
+    offsets and shapes in `{key}.json`. The file is mapped copy-on-write so the items are returned as numpy views
+    without copying or unpickling anything, the pages are shared by all the data loader workers through the page
+    cache and the file is reused by the next runs. Use `FeatureCache.load_or_build()` to create it.
+
+    Args:
+        cache_path (str): directory of the cache files.
+        key (str): name of the cache files, see `FeatureCache.make_key()`.
+    """
+
+    def __init__(self, cache_path: str, key: str):
+        self.data_path = os.path.join(cache_path, f"{key}.bin")
+        with open(os.path.join(cache_path, f"{key}.json"), "r", encoding="utf-8") as f:
+            self.index = json.load(f)["index"]
+        self._data = None
+
+    @staticmethod
+    def make_key(items: List, ap: "AudioProcessor", **settings) -> str:
+        """Hash the item paths with their sizes and modification times, the audio settings and the other `settings`
+        the arrays depend on."""
+        settings["ap"] = {k: v for k, v in vars(ap).items() if isinstance(v, (int, float, str, bool, type(None)))}
+        hasher = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        for item in items:
+            for file_path in item if isinstance(item, (tuple, list)) else [item]:
+                stat = os.stat(file_path)
+                hasher.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        return hasher.hexdigest()
+
+    @classmethod
+    def load_or_build(
+        cls, cache_path: str, key: str, num_items: int, compute_item: Callable, verbose: bool = False
+    ) -> "FeatureCache":
+        """Load the cache or compute all the items with `compute_item(idx)` and save them first."""
+        if not os.path.isfile(os.path.join(cache_path, f"{key}.json")):
+            os.makedirs(cache_path, exist_ok=True)
+            # write to temporary files first so a concurrent process never reads a partial cache
+            suffix = f".{os.getpid()}.tmp"
+            data_path = os.path.join(cache_path, f"{key}.bin")
+            index = []
+            offset = 0
+            with open(data_path + suffix, "wb") as f:
+                for idx in tqdm(range(num_items), desc=" > Caching features", disable=not verbose):
+                    entry = []
+                    for array in compute_item(idx):
+                        array = np.ascontiguousarray(array, dtype=np.float32)
+                        f.write(array.tobytes())
+                        entry.append([offset, list(array.shape)])
+                        offset += array.size
+                    index.append(entry)
+            with open(os.path.join(cache_path, f"{key}.json") + suffix, "w", encoding="utf-8") as f:
+                json.dump({"index": index}, f)
+            os.replace(data_path + suffix, data_path)
+            os.replace(os.path.join(cache_path, f"{key}.json") + suffix, os.path.join(cache_path, f"{key}.json"))
+        return cls(cache_path, key)
+
+    @property
+    def data(self) -> np.ndarray:
+        # map the file lazily so every worker process maps it on its own
+        if self._data is None:
+            self._data = np.memmap(self.data_path, dtype=np.float32, mode="c")
+        return self._data
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, ...]:
+        data = self.data
+        return tuple(data[offset : offset + int(np.prod(shape))].reshape(shape) for offset, shape in self.index[idx])
+
+    def __getstate__(self) -> Dict:
+        # do not pickle the mapped data, workers map the file themselves
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
@@ -1,18 +1,23 @@
 import glob
 import os
 import random
-from multiprocessing import Manager
 
 import numpy as np
 import torch
 from torch.utils.data import Dataset
 
+from TTS.vocoder.datasets.feature_cache import FeatureCache
+
 
 class GANDataset(Dataset):
     """
     GAN Dataset searchs for all the wav files under root path
     and converts them to acoustic features on the fly and returns
     random segments of (audio, feature) couples.
+
+    If `use_cache` is True and a `cache_path` is given, the (audio, feature) couples of all the items are computed
+    once and stored in a memory-mapped `FeatureCache`, shared by the data loader workers and reused by the next runs.
+    Otherwise they are computed on the fly.
     """
 
     def __init__(
@@ -29,6 +34,7 @@ class GANDataset(Dataset):
         use_noise_augment=False,
         use_cache=False,
         verbose=False,
+        cache_path=None,
     ):
         super().__init__()
         self.ap = ap
@@ -42,6 +48,7 @@ class GANDataset(Dataset):
         self.is_training = is_training
         self.return_segments = return_segments
         self.use_cache = use_cache
+        self.cache_path = cache_path
         self.use_noise_augment = use_noise_augment
         self.verbose = verbose
 
@@ -53,13 +60,21 @@ class GANDataset(Dataset):
         self.shuffle_mapping()
 
         # cache acoustic features
+        self.cache = None
         if use_cache:
             self.create_feature_cache()
 
     def create_feature_cache(self):
-        self.manager = Manager()
-        self.cache = self.manager.list()
-        self.cache += [None for _ in range(len(self.item_list))]
+        if self.cache_path is None:
+            # without a cache directory the features are computed on the fly, a cache in a manager process would
+            # pickle every item and grow with the dataset
+            return
+        key = FeatureCache.make_key(
+            self.item_list, self.ap, dataset="gan", seq_len=self.seq_len, feat_frame_len=self.feat_frame_len
+        )
+        self.cache = FeatureCache.load_or_build(
+            self.cache_path, key, len(self.item_list), self.compute_item, self.verbose
+        )
 
     @staticmethod
     def find_wav_files(path):
@@ -104,29 +119,26 @@ class GANDataset(Dataset):
     def shuffle_mapping(self):
         random.shuffle(self.G_to_D_mappings)
 
-    def load_item(self, idx):
-        """load (audio, feat) couple"""
+    def compute_item(self, idx):
+        """load or compute the (audio, feat) couple padded to the segment length"""
         if self.compute_feat:
             # compute features from wav
             wavpath = self.item_list[idx]
-            # print(wavpath)
-
-            if self.use_cache and self.cache[idx] is not None:
-                audio, mel = self.cache[idx]
-            else:
-                audio = self.ap.load_wav(wavpath)
-                mel = self.ap.melspectrogram(audio)
-                audio, mel = self._pad_short_samples(audio, mel)
+            audio = self.ap.load_wav(wavpath)
+            mel = self.ap.melspectrogram(audio)
         else:
             # load precomputed features
             wavpath, feat_path = self.item_list[idx]
+            audio = self.ap.load_wav(wavpath)
+            mel = np.load(feat_path)
+        return self._pad_short_samples(audio, mel)
 
-            if self.use_cache and self.cache[idx] is not None:
-                audio, mel = self.cache[idx]
-            else:
-                audio = self.ap.load_wav(wavpath)
-                mel = np.load(feat_path)
-                audio, mel = self._pad_short_samples(audio, mel)
+    def load_item(self, idx):
+        """load (audio, feat) couple"""
+        if self.cache is not None:
+            audio, mel = self.cache[idx]
+        else:
+            audio, mel = self.compute_item(idx)
 
         # correct the audio length wrt padding applied in stft
         audio = np.pad(audio, (0, self.hop_len), mode="edge")
@@ -1,19 +1,24 @@
 import glob
 import os
 import random
-from multiprocessing import Manager
 from typing import List, Tuple
 
 import numpy as np
 import torch
 from torch.utils.data import Dataset
 
+from TTS.vocoder.datasets.feature_cache import FeatureCache
+
 
 class WaveGradDataset(Dataset):
     """
     WaveGrad Dataset searchs for all the wav files under root path
     and converts them to acoustic features on the fly and returns
     random segments of (audio, feature) couples.
+
+    If `use_cache` is True and a `cache_path` is given, the padded audio of all the items is loaded once and stored
+    in a memory-mapped `FeatureCache`, shared by the data loader workers and reused by the next runs. Otherwise it is
+    loaded on the fly.
     """
 
     def __init__(
@@ -29,6 +34,7 @@ class WaveGradDataset(Dataset):
         use_noise_augment=False,
         use_cache=False,
         verbose=False,
+        cache_path=None,
     ):
         super().__init__()
         self.ap = ap
@@ -40,6 +46,7 @@ class WaveGradDataset(Dataset):
         self.is_training = is_training
         self.return_segments = return_segments
         self.use_cache = use_cache
+        self.cache_path = cache_path
         self.use_noise_augment = use_noise_augment
         self.verbose = verbose
 
@@ -48,13 +55,25 @@ class WaveGradDataset(Dataset):
         self.feat_frame_len = seq_len // hop_len + (2 * conv_pad)
 
         # cache acoustic features
+        self.cache = None
         if use_cache:
             self.create_feature_cache()
 
     def create_feature_cache(self):
-        self.manager = Manager()
-        self.cache = self.manager.list()
-        self.cache += [None for _ in range(len(self.item_list))]
+        if self.cache_path is None:
+            # without a cache directory the features are computed on the fly, a cache in a manager process would
+            # pickle every item and grow with the dataset
+            return
+        key = FeatureCache.make_key(
+            self.item_list, self.ap, dataset="wavegrad", seq_len=self.seq_len, pad_short=self.pad_short
+        )
+        self.cache = FeatureCache.load_or_build(
+            self.cache_path,
+            key,
+            len(self.item_list),
+            lambda idx: (self.load_audio(idx),),
+            self.verbose,
+        )
 
     @staticmethod
     def find_wav_files(path):
@@ -89,32 +108,32 @@ class WaveGradDataset(Dataset):
         self.return_segments = return_segments
         return samples
 
-    def load_item(self, idx):
-        """load (audio, feat) couple"""
-        # compute features from wav
+    def load_audio(self, idx):
+        """load the audio padded to the segment length and the hop length"""
         wavpath = self.item_list[idx]
+        audio = self.ap.load_wav(wavpath)
 
-        if self.use_cache and self.cache[idx] is not None:
-            audio = self.cache[idx]
+        if self.return_segments:
+            # correct audio length wrt segment length
+            if audio.shape[-1] < self.seq_len + self.pad_short:
+                audio = np.pad(
+                    audio, (0, self.seq_len + self.pad_short - len(audio)), mode="constant", constant_values=0.0
+                )
+            assert (
+                audio.shape[-1] >= self.seq_len + self.pad_short
+            ), f"{audio.shape[-1]} vs {self.seq_len + self.pad_short}"
+
+        # correct the audio length wrt hop length
+        p = (audio.shape[-1] // self.hop_len + 1) * self.hop_len - audio.shape[-1]
+        audio = np.pad(audio, (0, p), mode="constant", constant_values=0.0)
+        return audio
+
+    def load_item(self, idx):
+        """load (audio, feat) couple"""
+        if self.cache is not None:
+            audio = self.cache[idx][0]
         else:
-            audio = self.ap.load_wav(wavpath)
-
-            if self.return_segments:
-                # correct audio length wrt segment length
-                if audio.shape[-1] < self.seq_len + self.pad_short:
-                    audio = np.pad(
-                        audio, (0, self.seq_len + self.pad_short - len(audio)), mode="constant", constant_values=0.0
-                    )
-                assert (
-                    audio.shape[-1] >= self.seq_len + self.pad_short
-                ), f"{audio.shape[-1]} vs {self.seq_len + self.pad_short}"
-
-            # correct the audio length wrt hop length
-            p = (audio.shape[-1] // self.hop_len + 1) * self.hop_len - audio.shape[-1]
-            audio = np.pad(audio, (0, p), mode="constant", constant_values=0.0)
-
-            if self.use_cache:
-                self.cache[idx] = audio
+            audio = self.load_audio(idx)
 
         if self.return_segments:
             max_start = len(audio) - self.seq_len
@@ -350,6 +350,7 @@ class GAN(BaseVocoder):
             use_noise_augment=config.use_noise_augment,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_path=config.feature_cache_path,
         )
         dataset.shuffle_mapping()
         sampler = DistributedSampler(dataset, shuffle=True) if num_gpus > 1 else None
@@ -322,6 +322,7 @@ class Wavegrad(BaseVocoder):
             use_noise_augment=False,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_path=config.feature_cache_path,
         )
         sampler = DistributedSampler(dataset) if num_gpus > 1 else None
         loader = DataLoader(
@@ -18,13 +18,126 @@ from TTS.utils.io import load_fsspec
 from TTS.vocoder.datasets.wavernn_dataset import WaveRNNDataset
 from TTS.vocoder.layers.losses import WaveRNNLoss
 from TTS.vocoder.models.base_vocoder import BaseVocoder
-from TTS.vocoder.utils.distribution import sample_from_discretized_mix_logistic, sample_from_gaussian
 
 
 def stream(string, variables):
     sys.stdout.write(f"\r{string}" % variables)
 
 
+@torch.jit.script
+def _gru_cell(gi: torch.Tensor, gh: torch.Tensor, h: torch.Tensor) -> torch.Tensor:
+    """`nn.GRUCell` with precomputed input and hidden gates."""
+    i_r, i_z, i_n = gi.chunk(3, 1)
+    h_r, h_z, h_n = gh.chunk(3, 1)
+    r = torch.sigmoid(i_r + h_r)
+    z = torch.sigmoid(i_z + h_z)
+    n = torch.tanh(i_n + r * h_n)
+    return n + z * (h - n)
+
+
+class WavernnSampler(nn.Module):
+    """Autoregressive loop of `Wavernn.inference()`, meant to be compiled with `torch.jit.script()`.
+
+    The contributions of the conditioning features to the input of each layer are computed for all the steps before
+    the loop and passed to `forward()`, so the loop only multiplies the hidden states and the previous sample. The
+    previous sample goes through the input layer and the input gates of the first GRU as a rank-1 update.
+
+    Args:
+        model (Wavernn): model to take the weights from.
+        int8 (bool): quantize the weights of the loop to int8 with dynamic quantization. It is several times faster
+            on CPU at the cost of some precision and is not supported on GPU. Defaults to False.
+    """
+
+    def __init__(self, model: "Wavernn", int8: bool = False):
+        super().__init__()
+        rnn_dims = model.args.rnn_dims
+        fc_dims = model.args.fc_dims
+        self.rnn1_hh = self._linear(model.rnn1.weight_hh_l0, model.rnn1.bias_hh_l0)
+        self.rnn2_ih = self._linear(model.rnn2.weight_ih_l0[:, :rnn_dims])
+        self.rnn2_hh = self._linear(model.rnn2.weight_hh_l0, model.rnn2.bias_hh_l0)
+        self.fc1 = self._linear(model.fc1.weight[:, :rnn_dims])
+        self.fc2 = self._linear(model.fc2.weight[:, :fc_dims])
+        self.fc3 = self._linear(model.fc3.weight, model.fc3.bias)
+        w_x = model.I.weight[:, 0]
+        self.register_buffer("w_x", w_x.detach().clone())
+        self.register_buffer("u_x", (model.rnn1.weight_ih_l0 @ w_x).detach())
+        if isinstance(model.args.mode, int):
+            self.mode = 0
+        elif model.args.mode == "gauss":
+            self.mode = 1
+        elif model.args.mode == "mold":
+            self.mode = 2
+        else:
+            raise RuntimeError("Unknown model mode value - ", model.args.mode)
+        self.n_classes = model.n_classes
+        if int8:
+            assert w_x.device.type == "cpu", " [!] int8 inference is only supported on CPU."
+            torch.ao.quantization.quantize_dynamic(self, {nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    @staticmethod
+    def _linear(weight, bias=None):
+        # skip the random init, it would change the random draws of the sampling
+        layer = nn.utils.skip_init(
+            nn.Linear, weight.shape[1], weight.shape[0], bias=bias is not None, device=weight.device
+        )
+        layer.weight.data.copy_(weight)
+        if bias is not None:
+            layer.bias.data.copy_(bias)
+        return layer
+
+    def forward(
+        self,
+        output: torch.Tensor,
+        start: int,
+        end: int,
+        x: torch.Tensor,
+        h1: torch.Tensor,
+        h2: torch.Tensor,
+        i_in: torch.Tensor,
+        gi1_in: torch.Tensor,
+        gi2_in: torch.Tensor,
+        fc1_in: torch.Tensor,
+        fc2_in: torch.Tensor,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Run the steps `[start, end)` and write the samples to `output`.
+
+        Returns:
+            Tuple[Tensor, Tensor, Tensor]: the last sample and the hidden states to continue from.
+        """
+        log_scale_min = -32.23619130191664  # log(1e-14)
+        for t in range(start, end):
+            x_in = i_in[:, t] + x * self.w_x
+            h1 = _gru_cell(gi1_in[:, t] + x * self.u_x, self.rnn1_hh(h1), h1)
+            x_in = x_in + h1
+            h2 = _gru_cell(self.rnn2_ih(x_in) + gi2_in[:, t], self.rnn2_hh(h2), h2)
+            x_in = x_in + h2
+            y = torch.relu(self.fc1(x_in) + fc1_in[:, t])
+            y = torch.relu(self.fc2(y) + fc2_in[:, t])
+            logits = self.fc3(y)
+            if self.mode == 0:
+                # same draws as `torch.distributions.Categorical(probs).sample()`
+                idx = torch.multinomial(torch.softmax(logits, dim=1), 1, True).squeeze(1)
+                sample = 2 * idx.float() / (self.n_classes - 1.0) - 1.0
+            elif self.mode == 1:
+                # same draws as `sample_from_gaussian()`
+                std = torch.exp(torch.clamp(logits[:, 1], min=-7.0))
+                sample = torch.clamp(torch.normal(logits[:, 0], std), min=-1.0, max=1.0)
+            else:
+                # same draws as `sample_from_discretized_mix_logistic()`
+                nr_mix = logits.size(1) // 3
+                logit_probs = logits[:, :nr_mix]
+                temp = torch.empty_like(logit_probs).uniform_(1e-5, 1.0 - 1e-5)
+                mix_idx = (logit_probs - torch.log(-torch.log(temp))).argmax(dim=1, keepdim=True)
+                means = logits[:, nr_mix : 2 * nr_mix].gather(1, mix_idx).squeeze(1)
+                log_scales = torch.clamp(logits[:, 2 * nr_mix :].gather(1, mix_idx).squeeze(1), min=log_scale_min)
+                u = torch.empty_like(means).uniform_(1e-5, 1.0 - 1e-5)
+                sample = means + torch.exp(log_scales) * (torch.log(u) - torch.log(1.0 - u))
+                sample = torch.clamp(sample, min=-1.0, max=1.0)
+            output[:, t] = sample
+            x = sample.unsqueeze(1)
+        return x, h1, h2
+
+
 # pylint: disable=abstract-method
 # relates https://github.com/pytorch/pytorch/issues/42305
 class ResBlock(nn.Module):
@@ -274,6 +387,8 @@ class Wavernn(BaseVocoder):
             self.fc1 = nn.Linear(self.args.rnn_dims, self.args.fc_dims)
             self.fc2 = nn.Linear(self.args.fc_dims, self.args.fc_dims)
             self.fc3 = nn.Linear(self.args.fc_dims, self.n_classes)
+        # scripted sampling loops by precision and device, see `get_sampler()`
+        self._samplers = {}
 
     def forward(self, x, mels):
         bsize = x.size(0)
@@ -312,12 +427,26 @@ class Wavernn(BaseVocoder):
         x = F.relu(self.fc2(x))
         return self.fc3(x)
 
-    def inference(self, mels, batched=None, target=None, overlap=None):
+    def inference(self, mels, batched=None, target=None, overlap=None, int8=None):
+        """Generate the waveform sample by sample.
+
+        Everything that does not depend on the previous sample is computed for all the steps before the loop and the
+        loop itself runs in TorchScript, see `WavernnSampler`.
+
+        Args:
+            mels (Tensor): Mel spectrogram. :math:`[C, T]` or :math:`[1, C, T]`.
+            batched (bool, optional): Fold the input into overlapping segments generated in parallel. Defaults to
+                `config.batched`.
+            target (int, optional): Samples in each segment. Defaults to `config.target_samples`.
+            overlap (int, optional): Samples crossfaded between segments. Defaults to `config.overlap_samples`.
+            int8 (bool, optional): Run the loop with int8 weights on CPU. Defaults to `config.int8_inference`.
+        """
         self.eval()
-        output = []
         start = time.time()
-        rnn1 = self.get_gru_cell(self.rnn1)
-        rnn2 = self.get_gru_cell(self.rnn2)
+        batched = self.config.get("batched", False) if batched is None else batched
+        target = self.config.get("target_samples", None) if target is None else target
+        overlap = self.config.get("overlap_samples", None) if overlap is None else overlap
+        int8 = self.config.get("int8_inference", False) if int8 is None else int8
 
         with torch.no_grad():
             if isinstance(mels, np.ndarray):
@@ -337,59 +466,34 @@ class Wavernn(BaseVocoder):
 
             b_size, seq_len, _ = mels.size()
 
-            h1 = torch.zeros(b_size, self.args.rnn_dims).type_as(mels)
-            h2 = torch.zeros(b_size, self.args.rnn_dims).type_as(mels)
-            x = torch.zeros(b_size, 1).type_as(mels)
-
             if self.args.use_aux_net:
                 d = self.aux_dims
-                aux_split = [aux[:, :, d * i : d * (i + 1)] for i in range(4)]
-
-            for i in range(seq_len):
-                m_t = mels[:, i, :]
-
-                if self.args.use_aux_net:
-                    a1_t, a2_t, a3_t, a4_t = (a[:, i, :] for a in aux_split)
-
-                x = torch.cat([x, m_t, a1_t], dim=1) if self.args.use_aux_net else torch.cat([x, m_t], dim=1)
-                x = self.I(x)
-                h1 = rnn1(x, h1)
-
-                x = x + h1
-                inp = torch.cat([x, a2_t], dim=1) if self.args.use_aux_net else x
-                h2 = rnn2(inp, h2)
-
-                x = x + h2
-                x = torch.cat([x, a3_t], dim=1) if self.args.use_aux_net else x
-                x = F.relu(self.fc1(x))
-
-                x = torch.cat([x, a4_t], dim=1) if self.args.use_aux_net else x
-                x = F.relu(self.fc2(x))
-
-                logits = self.fc3(x)
+                a1, a2, a3, a4 = [aux[:, :, d * i : d * (i + 1)] for i in range(4)]
+            rnn_dims = self.args.rnn_dims
 
-                if self.args.mode == "mold":
-                    sample = sample_from_discretized_mix_logistic(logits.unsqueeze(0).transpose(1, 2))
-                    output.append(sample.view(-1))
-                    x = sample.transpose(0, 1).type_as(mels)
-                elif self.args.mode == "gauss":
-                    sample = sample_from_gaussian(logits.unsqueeze(0).transpose(1, 2))
-                    output.append(sample.view(-1))
-                    x = sample.transpose(0, 1).type_as(mels)
-                elif isinstance(self.args.mode, int):
-                    posterior = F.softmax(logits, dim=1)
-                    distrib = torch.distributions.Categorical(posterior)
-
-                    sample = 2 * distrib.sample().float() / (self.n_classes - 1.0) - 1.0
-                    output.append(sample)
-                    x = sample.unsqueeze(-1)
-                else:
-                    raise RuntimeError("Unknown model mode value - ", self.args.mode)
-
-                if i % 100 == 0:
-                    self.gen_display(i, seq_len, b_size, start)
+            # contributions of the conditioning features to each layer for all the steps
+            i_in = F.linear(
+                torch.cat([mels, a1], dim=2) if self.args.use_aux_net else mels, self.I.weight[:, 1:], self.I.bias
+            )
+            gi1_in = F.linear(i_in, self.rnn1.weight_ih_l0, self.rnn1.bias_ih_l0)
+            if self.args.use_aux_net:
+                gi2_in = F.linear(a2, self.rnn2.weight_ih_l0[:, rnn_dims:], self.rnn2.bias_ih_l0)
+                fc1_in = F.linear(a3, self.fc1.weight[:, rnn_dims:], self.fc1.bias)
+                fc2_in = F.linear(a4, self.fc2.weight[:, self.args.fc_dims :], self.fc2.bias)
+            else:
+                gi2_in = self.rnn2.bias_ih_l0.expand(b_size, seq_len, -1)
+                fc1_in = self.fc1.bias.expand(b_size, seq_len, -1)
+                fc2_in = self.fc2.bias.expand(b_size, seq_len, -1)
+
+            sampler = self.get_sampler(int8=int8)
+            output = torch.zeros(b_size, seq_len).type_as(mels)
+            h1 = torch.zeros(b_size, rnn_dims).type_as(mels)
+            h2 = torch.zeros(b_size, rnn_dims).type_as(mels)
+            x = torch.zeros(b_size, 1).type_as(mels)
+            for i in range(0, seq_len, 100):
+                x, h1, h2 = sampler(output, i, min(i + 100, seq_len), x, h1, h2, i_in, gi1_in, gi2_in, fc1_in, fc2_in)
+                self.gen_display(i, seq_len, b_size, start)
 
-        output = torch.stack(output).transpose(0, 1)
         output = output.cpu()
         if batched:
             output = output.numpy()
@@ -412,6 +516,22 @@ class Wavernn(BaseVocoder):
         self.train()
         return output
 
+    def get_sampler(self, int8=False):
+        """Return the scripted `WavernnSampler` of the current weights.
+
+        The sampler is compiled, and quantized with `int8`, once per precision and device and reused by the next
+        `inference()` calls. It holds a copy of the weights, so it is dropped when new weights are loaded and at
+        every training step.
+        """
+        key = (int8, next(self.parameters()).device)
+        if key not in self._samplers:
+            self._samplers[key] = torch.jit.script(WavernnSampler(self, int8=int8))
+        return self._samplers[key]
+
+    def load_state_dict(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        self._samplers.clear()
+        return super().load_state_dict(*args, **kwargs)
+
     def gen_display(self, i, seq_len, b_size, start):
         gen_rate = (i + 1) / (time.time() - start) * b_size / 1000
         realtime_ratio = gen_rate * 1000 / self.config.audio.sample_rate
@@ -550,6 +670,8 @@ class Wavernn(BaseVocoder):
             assert not self.training
 
     def train_step(self, batch: Dict, criterion: Dict) -> Tuple[Dict, Dict]:
+        # the weights are about to change
+        self._samplers.clear()
         mels = batch["input"]
         waveform = batch["waveform"]
         waveform_coarse = batch["waveform_coarse"]
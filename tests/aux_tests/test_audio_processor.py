@@ -1,9 +1,13 @@
 import os
 import unittest
 
+import numpy as np
+import torch
+
 from tests import get_tests_input_path, get_tests_output_path, get_tests_path
 from TTS.config import BaseAudioConfig
 from TTS.utils.audio.processor import AudioProcessor
+from TTS.utils.audio.torch_transforms import BatchSpectrogram
 
 TESTS_PATH = get_tests_path()
 OUT_PATH = os.path.join(get_tests_output_path(), "audio_tests")
@@ -188,3 +192,41 @@ class TestAudio(unittest.TestCase):
         pitch = ap.compute_f0(wav)
         mel = ap.melspectrogram(wav)
         assert pitch.shape[0] == mel.shape[1]
+
+    def test_compute_f0_batch(self):  # pylint: disable=no-self-use
+        ap = AudioProcessor(**{**conf, "pitch_fmin": 65, "pitch_extractor": "yin"})
+        wav = ap.load_wav(WAV_FILE)
+        wavs = [wav, wav[: ap.hop_length * 50], wav[: ap.hop_length * 50 + 7]]
+        pitches = ap.compute_f0_batch(wavs)
+        for wav, pitch in zip(wavs, pitches):
+            assert pitch.shape[0] == ap.melspectrogram(wav).shape[1]
+            np.testing.assert_allclose(pitch, ap.compute_f0(wav), rtol=1e-5)
+
+    def test_torch_griffin_lim(self):  # pylint: disable=no-self-use
+        ap = AudioProcessor(
+            **{
+                **conf,
+                "stats_path": None,
+                "preemphasis": 0.97,
+                "griffin_lim_backend": "torch",
+                "griffin_lim_iters": 16,
+            }
+        )
+        wav = ap.load_wav(WAV_FILE)
+        wav_ = ap.inv_melspectrogram(ap.melspectrogram(wav))
+        assert wav_.shape[0] == (ap.melspectrogram(wav).shape[1] - 1) * ap.hop_length
+        assert np.isfinite(wav_).all() and np.abs(wav_).max() > 0
+
+        # a batch of different lengths matches the single waveforms up to the random initial phase
+        wavs = [wav, wav[: ap.hop_length * 50]]
+        mels = [ap.melspectrogram(w) for w in wavs]
+        lengths = torch.tensor([mel.shape[1] for mel in mels])
+        batch = torch.zeros(2, mels[0].shape[0], int(lengths.max()))
+        for i, mel in enumerate(mels):
+            batch[i, :, : mel.shape[1]] = torch.from_numpy(mel)
+        batch_wavs = BatchSpectrogram(ap).inv_melspectrogram(batch, lengths)
+        assert batch_wavs[1, (lengths[1] - 1) * ap.hop_length :].abs().max() == 0
+        for i, mel in enumerate(mels):
+            batch_wav = batch_wavs[i, : (lengths[i] - 1) * ap.hop_length].numpy()
+            mel_error = np.abs(ap.melspectrogram(batch_wav) - mel).mean()
+            assert mel_error < 2 * np.abs(ap.melspectrogram(ap.inv_melspectrogram(mel)) - mel).mean() + 0.05
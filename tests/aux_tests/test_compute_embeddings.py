@@ -0,0 +1,70 @@
+import os
+import shutil
+import unittest
+
+import torch
+from trainer.io import save_checkpoint
+
+from tests import get_tests_data_path, get_tests_input_path, get_tests_output_path
+from TTS.bin.compute_embeddings import compute_embeddings
+from TTS.config import load_config
+from TTS.encoder.utils.generic_utils import setup_encoder_model
+from TTS.tts.utils.managers import load_file, save_file
+from TTS.tts.utils.speakers import SpeakerManager
+
+encoder_config_path = os.path.join(get_tests_input_path(), "test_speaker_encoder_config.json")
+dataset_path = os.path.join(get_tests_data_path(), "ljspeech")
+output_path = os.path.join(get_tests_output_path(), "compute_embeddings")
+
+
+class TestComputeEmbeddings(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(output_path, exist_ok=True)
+        config = load_config(encoder_config_path)
+        torch.manual_seed(1)
+        model = setup_encoder_model(config)
+        save_checkpoint(config, model, None, None, 0, 0, output_path)
+        self.model_path = os.path.join(output_path, "checkpoint_0.pth")
+        self.mapping_file_path = os.path.join(output_path, "speakers.json")
+
+    def tearDown(self):
+        shutil.rmtree(output_path, ignore_errors=True)
+
+    def _compute(self, **kwargs):
+        compute_embeddings(
+            self.model_path,
+            encoder_config_path,
+            self.mapping_file_path,
+            formatter_name="ljspeech",
+            dataset_name="ljspeech",
+            dataset_path=dataset_path,
+            meta_file_train="metadata.csv",
+            disable_cuda=True,
+            no_eval=True,
+            **kwargs,
+        )
+        return load_file(self.mapping_file_path)
+
+    def test_compute_embeddings(self):
+        mapping = self._compute(batch_size=3, num_workers=2, checkpoint_interval=2)
+        self.assertEqual(len(mapping), 8)
+
+        # the batched embeddings match the embeddings of the single clips
+        manager = SpeakerManager(encoder_model_path=self.model_path, encoder_config_path=encoder_config_path)
+        for key, item in mapping.items():
+            audio_file = os.path.join(dataset_path, key.split("#")[1] + ".wav")
+            expected = manager.compute_embedding_from_clip(audio_file)
+            self.assertEqual(item["name"], "ljspeech")
+            self.assertTrue(torch.allclose(torch.tensor(item["embedding"]), torch.tensor(expected), atol=1e-5))
+
+        # only the missing embeddings are computed when resuming
+        keys = sorted(mapping)
+        partial = {key: mapping[key] for key in keys[:5]}
+        partial[keys[0]] = {"name": "ljspeech", "embedding": [0.0] * 256}
+        save_file(partial, self.mapping_file_path)
+        resumed = self._compute(resume=True)
+        self.assertEqual(resumed[keys[0]]["embedding"], [0.0] * 256)
+        for key in keys[1:]:
+            self.assertTrue(
+                torch.allclose(torch.tensor(resumed[key]["embedding"]), torch.tensor(mapping[key]["embedding"]))
+            )
@@ -99,6 +99,21 @@ class TestNumpyTransforms(unittest.TestCase):
         mel = np_transforms.wav_to_mel(wav=self.sample_wav, mel_basis=mel_basis, **self.config)
         assert pitch.shape[0] == mel.shape[1]
 
+    def test_compute_f0_yin(self):
+        config = {**self.config, "pitch_fmin": 65}
+        pitch = np_transforms.compute_f0_yin(x=self.sample_wav, **config)
+        mel_basis = np_transforms.build_mel_basis(**self.config)
+        mel = np_transforms.wav_to_mel(wav=self.sample_wav, mel_basis=mel_basis, **self.config)
+        assert pitch.shape[0] == mel.shape[1]
+        # a batch gives the same values
+        batch_pitch = np_transforms.compute_f0_yin(x=np.stack([self.sample_wav, self.sample_wav[::-1]]), **config)
+        np.testing.assert_allclose(batch_pitch[0], pitch, rtol=1e-5)
+        # close to pYIN on the voiced frames
+        reference = np_transforms.compute_f0(x=self.sample_wav, **config)
+        self.assertGreater(np.mean((pitch > 0) == (reference > 0)), 0.8)
+        voiced = (pitch > 0) & (reference > 0)
+        self.assertLess(np.mean(np.abs(pitch[voiced] / reference[voiced] - 1) > 0.2), 0.05)
+
     def test_load_wav(self):
         wav = np_transforms.load_wav(filename=WAV_FILE, resample=False, sample_rate=22050)
         wav_resample = np_transforms.load_wav(filename=WAV_FILE, resample=True, sample_rate=16000)
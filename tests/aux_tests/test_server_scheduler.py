@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from TTS.server.scheduler import QueueFullError, SynthesisScheduler
+
+
+class DummySynthesizer:
+    def __init__(self, release: threading.Event = None):
+        self.release = release
+
+    def tts(self, text: str = "", **kwargs):
+        if self.release is not None:
+            self.release.wait(timeout=10)
+        return [0.1] * len(text)
+
+    def tts_stream(self, text: str = "", **kwargs):
+        for sen in text.split(" "):
+            if sen == "fail":
+                raise RuntimeError("synthesis failed")
+            yield self.tts(sen)
+
+
+def wait_for_idle(scheduler):
+    # done callbacks update the counters after `Future.result()` returns
+    while scheduler.num_pending:
+        time.sleep(0.01)
+
+
+class TestSynthesisScheduler(unittest.TestCase):
+    def test_parallel_requests(self):
+        scheduler = SynthesisScheduler(DummySynthesizer, num_workers=2, max_queue_size=4)
+        futures = [scheduler.submit(text="a" * (i + 1)) for i in range(6)]
+        for i, future in enumerate(futures):
+            wav, timing = future.result()
+            self.assertIsInstance(wav, np.ndarray)
+            self.assertEqual(len(wav), i + 1)
+            self.assertGreaterEqual(timing.queue_time, 0)
+            self.assertGreaterEqual(timing.process_time, 0)
+        wait_for_idle(scheduler)
+        stats = scheduler.stats()
+        self.assertEqual(stats["completed"], 6)
+        self.assertEqual(stats["pending"], 0)
+        self.assertIsNotNone(stats["avg_total_time"])
+        scheduler.shutdown()
+
+    def test_backpressure(self):
+        release = threading.Event()
+        scheduler = SynthesisScheduler(lambda: DummySynthesizer(release), num_workers=1, max_queue_size=1)
+        futures = [scheduler.submit(text="a"), scheduler.submit(text="b")]
+        self.assertEqual(scheduler.queue_depth, 1)
+        with self.assertRaises(QueueFullError):
+            scheduler.submit(text="c")
+        self.assertEqual(scheduler.stats()["rejected"], 1)
+        release.set()
+        for future in futures:
+            future.result()
+        wait_for_idle(scheduler)
+        scheduler.submit(text="d").result()
+        scheduler.shutdown()
+
+    def test_stream(self):
+        for use_processes in [False, True]:
+            scheduler = SynthesisScheduler(DummySynthesizer, num_workers=1, use_processes=use_processes)
+            chunks, future = scheduler.submit_stream(text="a bb ccc")
+            self.assertEqual([len(chunk) for chunk in chunks], [1, 2, 3])
+            self.assertGreaterEqual(future.result()[1].total_time, 0)
+            chunks, _ = scheduler.submit_stream(text="a fail")
+            self.assertEqual(len(next(chunks)), 1)
+            with self.assertRaises(RuntimeError):
+                next(chunks)
+            scheduler.shutdown()
@@ -67,6 +67,25 @@ class ResNetSpeakerEncoderTests(unittest.TestCase):
         assert output.shape[1] == 256
         assert len(output.shape) == 2
 
+    def test_compute_embedding_batch(self):
+        audio_config = {
+            "preemphasis": 0.97,
+            "sample_rate": 16000,
+            "fft_size": 512,
+            "win_length": 400,
+            "hop_length": 160,
+            "num_mels": 64,
+        }
+        model = ResNetSpeakerEncoder(input_dim=64, proj_dim=256, use_torch_spec=True, audio_config=audio_config)
+        model.eval()
+        # two clips longer than the windows are batched together, the shorter ones on their own
+        dummy_inputs = [T.rand(1, length) for length in [30000, 12000, 40000, 9000]]
+        output = model.compute_embedding_batch(dummy_inputs, num_frames=100, num_eval=4)
+        assert output.shape == (4, 256)
+        for dummy_input, embedding in zip(dummy_inputs, output):
+            expected = model.compute_embedding(dummy_input, num_frames=100, num_eval=4)[0]
+            assert T.allclose(embedding, expected, atol=1e-5)
+
 
 class GE2ELossTests(unittest.TestCase):
     # pylint: disable=R0201
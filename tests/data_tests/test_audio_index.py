@@ -0,0 +1,48 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.datasets import audio_index
+from TTS.tts.datasets.audio_index import INDEX_FILE, AudioIndex, get_audio_headers
+
+DATA_PATH = os.path.join(get_tests_data_path(), "ljspeech", "wavs")
+INDEX_PATH = os.path.join(get_tests_output_path(), "audio_index")
+
+
+class TestAudioIndex(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree(INDEX_PATH, ignore_errors=True)
+        os.makedirs(INDEX_PATH)
+        for name in ["LJ001-0001.wav", "LJ001-0001.mp3", "LJ001-0001.flac", "LJ001-0002.wav"]:
+            shutil.copy(os.path.join(DATA_PATH, name), INDEX_PATH)
+        self.samples = [
+            {"audio_file": os.path.join(INDEX_PATH, name), "root_path": INDEX_PATH}
+            for name in sorted(os.listdir(INDEX_PATH))
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(INDEX_PATH, ignore_errors=True)
+
+    def test_audio_index(self):
+        headers = get_audio_headers(self.samples)
+        self.assertTrue(os.path.isfile(os.path.join(INDEX_PATH, INDEX_FILE)))
+        for sample, header in zip(self.samples, headers):
+            self.assertEqual(header, audio_index.read_audio_header(sample["audio_file"]))
+            self.assertEqual(header["sample_rate"], 22050)
+        self.assertIsNone(headers[1]["bits_per_sample"])  # mp3
+        self.assertEqual(headers[3]["bits_per_sample"], 16)
+
+        # the headers are read from the index
+        with mock.patch.object(audio_index, "read_audio_header", side_effect=AssertionError):
+            self.assertEqual(get_audio_headers(self.samples), headers)
+
+        # a modified file is read again
+        shutil.copy(os.path.join(DATA_PATH, "LJ001-0003.wav"), self.samples[3]["audio_file"])
+        with mock.patch.object(audio_index, "read_audio_header", wraps=audio_index.read_audio_header) as read:
+            new_headers = get_audio_headers(self.samples)
+            self.assertEqual(read.call_count, 1)
+        self.assertEqual(new_headers[:3], headers[:3])
+        self.assertNotEqual(new_headers[3]["num_samples"], headers[3]["num_samples"])
+        self.assertFalse(AudioIndex(INDEX_PATH).changed)
@@ -1,8 +1,12 @@
 import os
+import shutil
 import unittest
+from unittest import mock
 
-from tests import get_tests_input_path
-from TTS.tts.datasets.formatters import common_voice
+from tests import get_tests_data_path, get_tests_input_path, get_tests_output_path
+from TTS.config.shared_configs import BaseDatasetConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.formatters import common_voice, coqui
 
 
 class TestTTSFormatters(unittest.TestCase):
@@ -15,3 +19,40 @@ class TestTTSFormatters(unittest.TestCase):
 
         assert items[-1]["text"] == "Competition for limited resources has also resulted in some local conflicts."
         assert items[-1]["audio_file"] == os.path.join(get_tests_input_path(), "clips", "common_voice_en_19737074.wav")
+
+
+class TestLoadTTSSamples(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = os.path.join(get_tests_output_path(), "samples_cache")
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+        self.datasets = [
+            BaseDatasetConfig(
+                formatter="coqui",
+                dataset_name=name,
+                meta_file_train=f"metadata_{name}.csv",
+                path=os.path.join(get_tests_data_path(), "ljspeech"),
+            )
+            for name in ["wav", "mp3", "flac"]
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+    def test_parallel_and_cached_loading(self):
+        target, _ = load_tts_samples(self.datasets, eval_split=False)
+        samples, _ = load_tts_samples(self.datasets, eval_split=False, num_workers=2, cache_path=self.cache_path)
+        self.assertEqual(samples, target)
+        self.assertEqual(len(os.listdir(self.cache_path)), 3)
+        # the second run reads the caches only
+        with mock.patch("TTS.tts.datasets.load_metadata", side_effect=AssertionError):
+            samples, _ = load_tts_samples(self.datasets, eval_split=False, cache_path=self.cache_path)
+        self.assertEqual(samples, target)
+
+    def test_check_audio_files(self):
+        def formatter(root_path, meta_file, **kwargs):
+            items = coqui(root_path, meta_file, **kwargs)
+            return items + [{**items[0], "audio_file": os.path.join(root_path, "wavs", "missing.wav")}]
+
+        samples, _ = load_tts_samples(self.datasets[0], eval_split=False, formatter=formatter)
+        filtered, _ = load_tts_samples(self.datasets[0], eval_split=False, formatter=formatter, check_audio_files=True)
+        self.assertEqual(filtered, samples[:-1])
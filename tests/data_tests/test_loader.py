@@ -8,7 +8,9 @@ from torch.utils.data import DataLoader
 
 from tests import get_tests_data_path, get_tests_output_path
 from TTS.tts.configs.shared_configs import BaseDatasetConfig, BaseTTSConfig
+from TTS.tts.configs.tacotron_config import TacotronConfig
 from TTS.tts.datasets import TTSDataset, load_tts_samples
+from TTS.tts.models.tacotron import Tacotron
 from TTS.tts.utils.text.tokenizer import TTSTokenizer
 from TTS.utils.audio import AudioProcessor
 
@@ -59,7 +61,9 @@ class TestTTSDataset(unittest.TestCase):
         self.max_loader_iter = 4
         self.ap = AudioProcessor(**c.audio)
 
-    def _create_dataloader(self, batch_size, r, bgs, dataset_config, start_by_longest=False, preprocess_samples=False):
+    def _create_dataloader(
+        self, batch_size, r, bgs, dataset_config, start_by_longest=False, preprocess_samples=False, **kwargs
+    ):
         # load dataset
         meta_data_train, meta_data_eval = load_tts_samples(dataset_config, eval_split=True, eval_split_size=0.2)
         items = meta_data_train + meta_data_eval
@@ -77,6 +81,7 @@ class TestTTSDataset(unittest.TestCase):
             min_audio_len=c.min_audio_len,
             max_audio_len=c.max_audio_len,
             start_by_longest=start_by_longest,
+            **kwargs,
         )
 
         # add preprocess to force the length computation
@@ -253,3 +258,45 @@ class TestTTSDataset(unittest.TestCase):
             # check batch zero-frame conditions (zero-frame disabled)
             # assert (linear_input * stop_target.unsqueeze(2)).sum() == 0
             # assert (mel_input * stop_target.unsqueeze(2)).sum() == 0
+
+    def test_spectrogram_backends(self):
+        mel_cache_path = os.path.join(OUTPATH, "mel_cache")
+        shutil.rmtree(mel_cache_path, ignore_errors=True)
+        _, dataset = self._create_dataloader(2, c.r, 0, dataset_config_wav)
+        items = [dataset[0], dataset[1]]
+        target = dataset.collate_fn(items)
+
+        # batched torch spectrograms
+        dataset.spectrogram_backend = "torch"
+        batch = dataset.collate_fn(items)
+        self.assertIsNone(batch["spec_waveform"])
+        for key in ["mel", "linear", "stop_targets", "mel_lengths", "waveform"]:
+            self.assertEqual(batch[key].shape, target[key].shape)
+        self.assertLess((batch["mel"] - target["mel"]).abs().max(), 1e-3)
+        self.assertLess((batch["linear"] - target["linear"]).abs().max(), 5e-2)
+
+        # spectrograms left to the model
+        dataset.spectrogram_backend = "device"
+        batch = dataset.collate_fn(items)
+        self.assertIsNone(batch["mel"])
+        self.assertEqual(batch["spec_waveform"].shape[0], 2)
+        torch.testing.assert_close(batch["mel_lengths"], target["mel_lengths"])
+
+        # spectrograms computed by the model, `tacotron` also needs the linear spectrograms
+        config = TacotronConfig(r=c.r, audio=c.audio)
+        tokenizer, config = TTSTokenizer.init_from_config(config)
+        model = Tacotron(config, self.ap, tokenizer)
+        model_target = model.format_batch(target)
+        batch = model.format_batch_on_device(model.format_batch(batch))
+        for key in ["mel_input", "linear_input"]:
+            self.assertEqual(batch[key].shape, model_target[key].shape)
+        self.assertLess((batch["mel_input"] - model_target["mel_input"]).abs().max(), 1e-3)
+        self.assertLess((batch["linear_input"] - model_target["linear_input"]).abs().max(), 5e-2)
+
+        # cached melspectrograms
+        _, dataset = self._create_dataloader(2, c.r, 0, dataset_config_wav, mel_cache_path=mel_cache_path)
+        for _ in range(2):
+            batch = dataset.collate_fn([dataset[0], dataset[1]])
+            torch.testing.assert_close(batch["mel"], target["mel"])
+        self.assertEqual(len(os.listdir(mel_cache_path)), 2)
+        shutil.rmtree(mel_cache_path)
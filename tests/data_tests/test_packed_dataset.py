@@ -0,0 +1,71 @@
+import os
+import pickle
+import shutil
+import unittest
+
+import numpy as np
+import torch
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.configs.shared_configs import BaseDatasetConfig, BaseTTSConfig
+from TTS.tts.datasets import PackedTTSDataset, TTSDataset, load_tts_samples, pack_tts_dataset
+from TTS.tts.utils.text.tokenizer import TTSTokenizer
+from TTS.utils.audio import AudioProcessor
+
+PACK_PATH = os.path.join(get_tests_output_path(), "packed_dataset")
+ENERGY_CACHE_PATH = os.path.join(get_tests_output_path(), "packed_dataset_energy")
+
+c = BaseTTSConfig(text_cleaner="english_cleaners", use_noise_augment=False)
+
+dataset_config = BaseDatasetConfig(
+    formatter="ljspeech",
+    meta_file_train="metadata.csv",
+    path=os.path.join(get_tests_data_path(), "ljspeech"),
+    language="en",
+)
+
+
+class TestPackedDataset(unittest.TestCase):
+    def setUp(self):
+        self.ap = AudioProcessor(**c.audio)
+        self.tokenizer, _ = TTSTokenizer.init_from_config(c)
+        self.samples, _ = load_tts_samples(dataset_config, eval_split=False)
+        self.samples = self.samples[:8]
+        self.dataset = TTSDataset(
+            ap=self.ap,
+            samples=self.samples,
+            tokenizer=self.tokenizer,
+            compute_energy=True,
+            energy_cache_path=ENERGY_CACHE_PATH,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(PACK_PATH, ignore_errors=True)
+        shutil.rmtree(ENERGY_CACHE_PATH, ignore_errors=True)
+
+    def test_packed_dataset(self):
+        # small shards to test reading from several files
+        index = pack_tts_dataset(self.dataset, PACK_PATH, shard_size=2**18, verbose=False)
+        self.assertGreater(len(index["shards"]), 1)
+        packed_dataset = PackedTTSDataset(
+            PACK_PATH, ap=self.ap, samples=self.samples[::-1], tokenizer=self.tokenizer, compute_energy=True
+        )
+        packed_dataset = pickle.loads(pickle.dumps(packed_dataset))
+        self.assertEqual(packed_dataset.lengths, [len(self.ap.load_wav(s["audio_file"])) for s in self.samples[::-1]])
+        for idx in range(len(self.samples)):
+            target = self.dataset[len(self.samples) - 1 - idx]
+            packed = packed_dataset[idx]
+            self.assertEqual(packed["audio_unique_name"], target["audio_unique_name"])
+            for key in ["wav", "token_ids", "energy"]:
+                np.testing.assert_array_equal(packed[key], target[key])
+
+        packed_dataset.preprocess_samples()
+        batch = packed_dataset.collate_fn([packed_dataset[0], packed_dataset[1]])
+        self.assertEqual(batch["energy"].shape[-1], batch["mel"].shape[1])
+        self.assertIsInstance(batch["token_id"], torch.Tensor)
+
+    def test_missing_features(self):
+        self.dataset.compute_energy = False
+        pack_tts_dataset(self.dataset, PACK_PATH, verbose=False)
+        with self.assertRaises(ValueError):
+            PackedTTSDataset(PACK_PATH, ap=self.ap, tokenizer=self.tokenizer, compute_energy=True)
@@ -1,11 +1,16 @@
 import os
+import threading
 import unittest
 
+import torch
 from trainer.io import save_checkpoint
 
 from tests import get_tests_input_path
 from TTS.config import load_config
+from TTS.tts.configs.fast_pitch_config import FastPitchConfig
 from TTS.tts.models import setup_model
+from TTS.tts.models.forward_tts import ForwardTTS
+from TTS.tts.utils.synthesis import synthesis, synthesis_batch
 from TTS.utils.synthesizer import Synthesizer
 
 
@@ -26,6 +31,50 @@ class SynthesizerTest(unittest.TestCase):
         synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
         synthesizer.tts("Better this test works!!")
 
+    def test_batched_in_out(self):
+        self._create_random_model()
+        tts_root_path = get_tests_input_path()
+        tts_checkpoint = os.path.join(tts_root_path, "checkpoint_10.pth")
+        tts_config = os.path.join(tts_root_path, "dummy_model_config.json")
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None, max_batch_size=4)
+        self.assertTrue(synthesizer.supports_batching)
+        wavs = [None] * 3
+
+        def _tts(idx):
+            wavs[idx] = synthesizer.tts("Better this test works!! And this one too.")
+
+        threads = [threading.Thread(target=_tts, args=(idx,)) for idx in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for wav in wavs:
+            self.assertGreater(len(wav), 0)
+
+    def test_synthesis_batch(self):
+        """Check that batched synthesis gives the same outputs as synthesizing each text separately"""
+        config = FastPitchConfig()
+        model = ForwardTTS.init_from_config(config)
+        model.eval()
+        texts = ["Better this test works!!", "Hi.", "This is a slightly longer sentence."]
+        outputs = synthesis_batch(model, texts, config, use_cuda=False)
+        for text, output in zip(texts, outputs):
+            target = synthesis(model, text, config, use_cuda=False)["outputs"]["model_outputs"][0]
+            self.assertEqual(target.shape, output["model_outputs"].shape)
+            torch.testing.assert_close(target, torch.from_numpy(output["model_outputs"]), atol=1e-4, rtol=1e-4)
+
+    def test_synthesis_batch_griffin_lim(self):
+        config = FastPitchConfig()
+        config.audio.griffin_lim_backend = "torch"
+        config.audio.griffin_lim_iters = 2
+        model = ForwardTTS.init_from_config(config)
+        model.eval()
+        texts = ["Better this test works!!", "Hi."]
+        outputs = synthesis_batch(model, texts, config, use_cuda=False, use_griffin_lim=True, do_trim_silence=False)
+        for output in outputs:
+            num_frames = output["model_outputs"].shape[0]
+            self.assertEqual(output["wav"].shape[0], (num_frames - 1) * config.audio.hop_length)
+
     def test_split_into_sentences(self):
         """Check demo server sentences split as expected"""
         print("\n > Testing demo server sentence splitting")
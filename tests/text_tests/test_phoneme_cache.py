@@ -0,0 +1,68 @@
+import os
+import pickle
+import shutil
+import unittest
+
+from tests import get_tests_output_path
+from TTS.tts.utils.text.phonemizers.base import BasePhonemizer
+from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
+
+CACHE_PATH = os.path.join(get_tests_output_path(), "phoneme_cache", "phonemes.db")
+
+
+class CountingPhonemizer(BasePhonemizer):
+    """Upper-cases the text and counts the calls to the backend."""
+
+    num_calls = 0
+
+    @staticmethod
+    def name():
+        return "counting"
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    @classmethod
+    def version(cls):
+        return "0.0.1"
+
+    @staticmethod
+    def supported_languages():
+        return {"en": "English"}
+
+    def _phonemize(self, text, separator):
+        self.num_calls += 1
+        return separator.join(text.upper())
+
+
+class TestPhonemeCache(unittest.TestCase):
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(CACHE_PATH), ignore_errors=True)
+
+    def test_lru(self):
+        cache = PhonemeCache(max_size=2)
+        for key in ["a", "b", "c"]:
+            cache.put(key, key.upper())
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "C")
+        self.assertEqual(cache.stats(), {"size": 2, "max_size": 2, "hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_persistence(self):
+        cache = PhonemeCache(cache_path=CACHE_PATH)
+        cache.put("hello", "həlˈoʊ")
+        new_cache = pickle.loads(pickle.dumps(PhonemeCache(cache_path=CACHE_PATH)))
+        self.assertEqual(new_cache.get("hello"), "həlˈoʊ")
+        self.assertIsNone(new_cache.get("world"))
+
+    def test_phonemizer(self):
+        phonemizer = CountingPhonemizer("en", keep_puncs=True)
+        target = phonemizer.phonemize("hello, world! hello", separator="|")
+        phonemizer.set_cache(PhonemeCache())
+        phonemizer.num_calls = 0
+        self.assertEqual(phonemizer.phonemize("hello, world! hello", separator="|"), target)
+        self.assertEqual(phonemizer.phonemize("hello, world! hello", separator="|"), target)
+        self.assertEqual(phonemizer.num_calls, 2)
+        # the separator is part of the key
+        self.assertEqual(phonemizer.phonemize("hello", separator=""), "HELLO")
+        self.assertEqual(phonemizer.phoneme_cache.stats()["hits"], 4)
@@ -4,6 +4,7 @@ from packaging.version import Version
 
 from TTS.tts.utils.text.phonemizers import ESpeak, Gruut, JA_JP_Phonemizer, ZH_CN_Phonemizer
 from TTS.tts.utils.text.phonemizers.bangla_phonemizer import BN_Phonemizer
+from TTS.tts.utils.text.phonemizers.espeak_wrapper import get_espeak_library
 from TTS.tts.utils.text.phonemizers.multi_phonemizer import MultiPhonemizer
 
 EXAMPLE_TEXTs = [
@@ -128,6 +129,15 @@ class TestEspeakNgPhonemizer(unittest.TestCase):
     def test_is_available(self):
         self.assertTrue(self.phonemizer.is_available())
 
+    @unittest.skipIf(get_espeak_library() is None, "libespeak-ng not found")
+    def test_library_matches_command_line(self):
+        texts = EXAMPLE_TEXTs + ["Be a voice, not an! echo?", "or", "Hello."]
+        for language in ["en-us", "fr-fr"]:
+            library_phonemizer = ESpeak(language=language, backend="espeak-ng", use_library=True)
+            command_phonemizer = ESpeak(language=language, backend="espeak-ng", use_library=False)
+            for text in texts:
+                self.assertEqual(library_phonemizer.phonemize(text), command_phonemizer.phonemize(text))
+
 
 class TestGruutPhonemizer(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+from TTS.tts.layers.bark.inference_funcs import (
+    generate_coarse,
+    generate_coarse_batch,
+    generate_fine,
+    generate_fine_batch,
+    generate_text_semantic,
+    generate_text_semantic_batch,
+)
+from TTS.tts.layers.bark.model import GPT, GPTConfig
+from TTS.tts.layers.bark.model_fine import FineGPT, FineGPTConfig
+
+
+class CharTokenizer:
+    def encode(self, text, add_special_tokens=False):  # pylint: disable=unused-argument
+        return [ord(c) % 100 for c in text]
+
+
+def _tiny_bark_model():
+    config = SimpleNamespace(
+        SEMANTIC_RATE_HZ=49.9,
+        SEMANTIC_VOCAB_SIZE=10_000,
+        CODEBOOK_SIZE=1024,
+        N_COARSE_CODEBOOKS=2,
+        N_FINE_CODEBOOKS=8,
+        COARSE_RATE_HZ=75,
+        TEXT_ENCODING_OFFSET=10_048,
+        SEMANTIC_PAD_TOKEN=10_000,
+        TEXT_PAD_TOKEN=129_595,
+        SEMANTIC_INFER_TOKEN=129_599,
+        COARSE_SEMANTIC_PAD_TOKEN=12_048,
+        COARSE_INFER_TOKEN=12_050,
+    )
+    kwargs = {"n_layer": 2, "n_head": 2, "n_embd": 16}
+    return SimpleNamespace(
+        config=config,
+        tokenizer=CharTokenizer(),
+        device=torch.device("cpu"),
+        semantic_model=GPT(GPTConfig(input_vocab_size=129_600, output_vocab_size=10_048, **kwargs)).eval(),
+        coarse_model=GPT(GPTConfig(input_vocab_size=12_096, output_vocab_size=12_096, **kwargs)).eval(),
+        fine_model=FineGPT(FineGPTConfig(input_vocab_size=1_056, output_vocab_size=1_056, **kwargs)).eval(),
+    )
+
+
+def test_static_kv_cache():
+    torch.manual_seed(0)
+    config = GPTConfig(block_size=600, input_vocab_size=100, output_vocab_size=100, n_layer=2, n_head=2, n_embd=16)
+    model = GPT(config).eval()
+    idx = torch.randint(0, 100, (2, 513))
+    new_tokens = torch.randint(0, 100, (2, 8))
+    kv_cache = model.new_kv_cache(batch_size=2)
+    with torch.no_grad():
+        for _ in range(2):
+            # the cache is reused after a reset
+            kv_cache.reset()
+            target, past_kv = model(idx, merge_context=True, use_cache=True)
+            logits, kv_cache = model(idx, merge_context=True, use_cache=True, past_kv=kv_cache)
+            torch.testing.assert_close(logits, target)
+            for step in range(new_tokens.shape[1]):
+                target, past_kv = model(new_tokens[:, [step]], use_cache=True, past_kv=past_kv)
+                logits, kv_cache = model(new_tokens[:, [step]], use_cache=True, past_kv=kv_cache)
+                torch.testing.assert_close(logits, target)
+            assert len(kv_cache) == 257 + new_tokens.shape[1] == past_kv[0][0].shape[-2]
+
+
+def test_batched_generation():
+    """The batched stages give the same tokens as one by one with greedy decoding, with and without a voice prompt."""
+    torch.manual_seed(0)
+    model = _tiny_bark_model()
+    rng = np.random.RandomState(0)
+    history_prompts = [
+        (None, None, None),
+        (rng.randint(0, 10_000, 300), rng.randint(0, 1024, (2, 451)), rng.randint(0, 1024, (8, 451))),
+    ]
+
+    texts = ["hello world", "a longer sentence to say"]
+    kwargs = {"top_k": 1, "min_eos_p": None, "max_gen_duration_s": 1.0, "silent": True}
+    targets = [generate_text_semantic(t, model, history_prompt=h, **kwargs) for t, h in zip(texts, history_prompts)]
+    outputs = generate_text_semantic_batch(texts, model, history_prompts=history_prompts, **kwargs)
+    for target, output in zip(targets, outputs):
+        np.testing.assert_array_equal(output, target)
+
+    x_semantics = [targets[0], targets[1][:30]]
+    kwargs = {"top_k": 1, "max_coarse_history": 120, "sliding_window_len": 20, "silent": True}
+    targets = [generate_coarse(x, model, history_prompt=h, **kwargs) for x, h in zip(x_semantics, history_prompts)]
+    outputs = generate_coarse_batch(x_semantics, model, history_prompts=history_prompts, **kwargs)
+    for target, output in zip(targets, outputs):
+        np.testing.assert_array_equal(output, target)
+
+    # the first sequence needs several windows of the fine model
+    x_coarse_gens = [np.tile(targets[0], 20), targets[1]]
+    targets = [generate_fine(x, model, history_prompt=h, temp=None) for x, h in zip(x_coarse_gens, history_prompts)]
+    outputs = generate_fine_batch(x_coarse_gens, model, history_prompts=history_prompts, temp=None)
+    for target, output in zip(targets, outputs):
+        np.testing.assert_array_equal(output, target)
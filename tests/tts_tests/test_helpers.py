@@ -1,6 +1,24 @@
-import torch as T
+import os
+import shutil
+import unittest
 
-from TTS.tts.utils.helpers import average_over_durations, generate_path, rand_segments, segment, sequence_mask
+import numpy as np
+import torch as T
+from scipy.stats import betabinom
+
+from tests import get_tests_output_path
+from TTS.tts.utils.helpers import (
+    CYTHON,
+    average_over_durations,
+    beta_binomial_prior_distribution,
+    compute_attn_prior,
+    generate_path,
+    maximum_path_cython,
+    maximum_path_torch,
+    rand_segments,
+    segment,
+    sequence_mask,
+)
 
 
 def average_over_durations_test():  # pylint: disable=no-self-use
@@ -86,3 +104,45 @@ def generate_path_test():
             assert all(path[b, t, :current_idx] == 0.0)
             assert all(path[b, t, current_idx + durations[b, t].item() :] == 0.0)
             current_idx += durations[b, t].item()
+
+
+@unittest.skipIf(not CYTHON, "Cython extension is not built")
+def test_maximum_path():
+    for _ in range(10):
+        x_length = T.randint(1, 30, (4,))
+        y_length = x_length + T.randint(0, 60, (4,))
+        x_mask = sequence_mask(x_length).unsqueeze(1).float()
+        y_mask = sequence_mask(y_length).unsqueeze(1).float()
+        attn_mask = (T.unsqueeze(x_mask, -1) * T.unsqueeze(y_mask, 2)).squeeze(1)
+        # rounded values to have ties
+        value = T.randn(attn_mask.shape).round()
+        path = maximum_path_torch(value, attn_mask)
+        assert T.equal(path, maximum_path_cython(value, attn_mask))
+        assert T.equal(path.sum(2), x_mask.squeeze(1) * path.sum(2))
+        assert T.equal(path.sum(1), y_mask.squeeze(1))
+
+
+def test_attn_prior():
+    for phoneme_count, mel_count, scaling_factor in [(1, 1, 1.0), (12, 50, 1.0), (30, 120, 0.05)]:
+        target = np.array(
+            [
+                betabinom(phoneme_count, scaling_factor * i, scaling_factor * (mel_count + 1 - i)).pmf(
+                    np.arange(phoneme_count)
+                )
+                for i in range(1, mel_count + 1)
+            ]
+        )
+        np.testing.assert_allclose(beta_binomial_prior_distribution(phoneme_count, mel_count, scaling_factor), target)
+
+    cache_path = os.path.join(get_tests_output_path(), "attn_prior_cache")
+    shutil.rmtree(cache_path, ignore_errors=True)
+    attn_prior = compute_attn_prior(12, 50, cache_path=cache_path)
+    assert attn_prior.shape == (50, 12)
+    assert attn_prior.dtype == np.float32
+    assert os.listdir(cache_path) == ["12_50_1.0.npy"]
+    # cached priors are returned as copies
+    attn_prior[:] = 0
+    np.testing.assert_array_equal(
+        compute_attn_prior(12, 50, cache_path=cache_path), np.load(os.path.join(cache_path, "12_50_1.0.npy"))
+    )
+    shutil.rmtree(cache_path)
@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+
+import torch
+import torch.nn.functional as F
+
+from TTS.tts.layers.tortoise.autoregressive import UnifiedVoice
+from TTS.tts.layers.tortoise.diffusion_decoder import DiffusionTts
+from TTS.tts.models.tortoise import Tortoise, latent_length, load_discrete_vocoder_diffuser
+
+
+def test_inference_speech_latents():
+    """The latents collected during generation match the ones of a second forward pass up to the stop token."""
+    torch.manual_seed(0)
+    model = UnifiedVoice(
+        layers=2,
+        model_dim=64,
+        heads=4,
+        max_text_tokens=40,
+        max_mel_tokens=60,
+        number_mel_codes=100,
+        start_mel_token=98,
+        stop_mel_token=99,
+        checkpointing=False,
+    ).eval()
+    model.post_init_gpt2_config(kv_cache=True)
+    cond = torch.randn(1, 64)
+    text = F.pad(torch.randint(1, 200, (1, 12)), (0, 1))
+    with torch.no_grad():
+        codes, latents = model.inference_speech(
+            cond, text, do_sample=True, num_return_sequences=4, max_generate_length=50, return_latent=True
+        )
+        assert latents.shape[:2] == codes.shape
+        target = model(
+            cond.repeat(4, 1),
+            text.repeat(4, 1),
+            torch.tensor([text.shape[-1]]),
+            codes,
+            torch.tensor([codes.shape[-1] * model.mel_length_compression]),
+            return_latent=True,
+            clip_inputs=False,
+        )
+    for b in range(codes.shape[0]):
+        stop_tokens = (codes[b] == model.stop_mel_token).nonzero()
+        length = stop_tokens[0].item() + 1 if len(stop_tokens) > 0 else codes.shape[1]
+        torch.testing.assert_close(latents[b, :length], target[b, :length])
+
+
+def test_latent_length():
+    def loop_latent_length(codes, calm_token=83):
+        # trim loop of the single candidate decoding
+        ctokens = 0
+        for code in range(codes.shape[-1]):
+            if codes[code] == calm_token:
+                ctokens += 1
+            else:
+                ctokens = 0
+            if ctokens > 8:
+                return code
+        return codes.shape[-1]
+
+    torch.manual_seed(0)
+    cases = [
+        torch.randint(0, 82, (40,)),  # no calm run
+        torch.full((5,), 83),  # fewer than 9 codes
+        torch.full((9,), 83),  # a single run at the start
+        torch.cat([torch.randint(0, 82, (10,)), torch.full((8,), 83), torch.randint(0, 82, (10,))]),  # run too short
+        torch.cat([torch.randint(0, 82, (10,)), torch.full((20,), 83)]),
+        torch.cat(
+            [torch.randint(0, 82, (10,)), torch.full((9,), 83), torch.randint(0, 82, (3,)), torch.full((12,), 83)]
+        ),
+    ]
+    # random codes with many calm tokens
+    cases += [torch.where(torch.rand(60) < 0.8, 83, torch.randint(0, 82, (60,))) for _ in range(20)]
+    for codes in cases:
+        assert latent_length(codes) == loop_latent_length(codes), codes
+
+
+class DiffusionDecoder:
+    """`Tortoise` with only the models used by `candidates_to_wav()`."""
+
+    candidates_to_wav = Tortoise.candidates_to_wav
+
+    def __init__(self, diffusion, vocoder):
+        self.diffusion = diffusion
+        self.vocoder = vocoder
+
+    @contextmanager
+    def temporary_cuda(self, model):
+        yield model
+
+
+class VocoderStub:
+    """Repeat the first mel channel `hop_length` times."""
+
+    hop_length = 256
+
+    def inference(self, mel):
+        return mel[:, :1].repeat_interleave(self.hop_length, dim=-1)
+
+
+def test_candidates_to_wav_batch():
+    torch.manual_seed(0)
+    diffusion = DiffusionTts(
+        model_channels=32, num_layers=1, in_latent_channels=16, num_heads=2, layer_drop=0, unconditioned_percentage=0
+    ).eval()
+    decoder = DiffusionDecoder(diffusion, VocoderStub())
+    diffuser = load_discrete_vocoder_diffuser(desired_diffusion_steps=2)
+    # candidates that end with calm runs at different steps and one without any
+    codes = torch.randint(0, 82, (3, 30))
+    codes[0, 10:] = 83
+    codes[1, 20:] = 83
+    latents = torch.randn(3, 30, 16)
+    conditioning = torch.randn(3, 64)
+    with torch.no_grad():
+        targets = decoder.candidates_to_wav(codes, latents, conditioning, diffuser, verbose=False)
+        outputs = decoder.candidates_to_wav(
+            codes, latents, conditioning, diffuser, diffusion_batch_size=3, verbose=False
+        )
+    assert len(outputs) == len(targets) == 3
+    for codes_b, target, output in zip(codes, targets, outputs):
+        assert output.shape == target.shape
+        assert output.shape[-1] == latent_length(codes_b) * 4 * 24000 // 22050 * VocoderStub.hop_length
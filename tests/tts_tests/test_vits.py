@@ -66,6 +66,12 @@ class TestVits(unittest.TestCase):
         """TODO:"""
         ...
 
+    def test_packed_dataset_path(self):
+        config = VitsConfig(packed_dataset_path="pack")
+        model = Vits.init_from_config(config, verbose=False)
+        with self.assertRaises(ValueError):
+            model.get_data_loader(config, {}, False, [], False, 1)
+
     def test_init_multispeaker(self):
         num_speakers = 10
         args = VitsArgs(num_speakers=num_speakers, use_speaker_embedding=True)
@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import numpy as np
+import torch
+
+from tests import get_tests_output_path, get_tests_path
+from TTS.utils.audio import AudioProcessor
+from TTS.vocoder.configs import BaseGANVocoderConfig, MelganConfig
+from TTS.vocoder.datasets.feature_cache import FeatureCache
+from TTS.vocoder.datasets.gan_dataset import GANDataset
+from TTS.vocoder.datasets.preprocess import load_wav_data
+from TTS.vocoder.datasets.wavegrad_dataset import WaveGradDataset
+
+CACHE_PATH = os.path.join(get_tests_output_path(), "vocoder_feature_cache")
+
+C = BaseGANVocoderConfig()
+
+test_data_path = os.path.join(get_tests_path(), "data/ljspeech/")
+
+
+def test_feature_cache():
+    shutil.rmtree(CACHE_PATH, ignore_errors=True)
+    arrays = [(np.random.rand(10).astype(np.float32), np.random.rand(2, 3)) for _ in range(3)]
+    cache = FeatureCache.load_or_build(CACHE_PATH, "test", len(arrays), lambda idx: arrays[idx])
+    # the second call loads the saved files
+    cache = FeatureCache.load_or_build(CACHE_PATH, "test", len(arrays), None)
+    assert len(cache) == 3
+    for idx, (audio, mel) in enumerate(arrays):
+        np.testing.assert_array_equal(cache[idx][0], audio)
+        np.testing.assert_allclose(cache[idx][1], mel, rtol=1e-6)
+    # the views are copy-on-write, changing them must not change the file
+    cache[0][0][:] = 0
+    assert FeatureCache(CACHE_PATH, "test")[0][0].max() > 0
+    shutil.rmtree(CACHE_PATH)
+
+
+def test_cached_datasets():
+    shutil.rmtree(CACHE_PATH, ignore_errors=True)
+    ap = AudioProcessor(**C.audio)
+    _, items = load_wav_data(test_data_path, 10)
+    hop_len = C.audio["hop_length"]
+    for dataset_class in [GANDataset, WaveGradDataset]:
+        datasets = [
+            dataset_class(
+                ap,
+                items,
+                seq_len=hop_len * 10,
+                hop_len=hop_len,
+                pad_short=2000,
+                return_segments=False,
+                use_cache=use_cache,
+                cache_path=CACHE_PATH,
+            )
+            for use_cache in [False, True]
+        ]
+        for idx in range(len(items)):
+            for target, cached in zip(datasets[0].load_item(idx), datasets[1].load_item(idx)):
+                torch.testing.assert_close(target, cached)
+    shutil.rmtree(CACHE_PATH)
+
+
+def test_default_config_without_cache():
+    # the default configs set `use_cache` without a cache directory, the features are then computed on the fly
+    # instead of being pickled into a manager process
+    ap = AudioProcessor(**C.audio)
+    _, items = load_wav_data(test_data_path, 10)
+    config = MelganConfig()
+    assert config.use_cache and config.feature_cache_path is None
+    hop_len = C.audio["hop_length"]
+    for dataset_class in [GANDataset, WaveGradDataset]:
+        dataset = dataset_class(
+            ap,
+            items,
+            seq_len=hop_len * 10,
+            hop_len=hop_len,
+            pad_short=2000,
+            return_segments=False,
+            use_cache=config.use_cache,
+            cache_path=config.feature_cache_path,
+        )
+        dataset.load_item(0)
+        assert dataset.cache is None
+        assert not hasattr(dataset, "manager")
@@ -2,9 +2,11 @@ import random
 
 import numpy as np
 import torch
+import torch.nn.functional as F
 
 from TTS.vocoder.configs import WavernnConfig
 from TTS.vocoder.models.wavernn import Wavernn, WavernnArgs
+from TTS.vocoder.utils.distribution import sample_from_discretized_mix_logistic, sample_from_gaussian
 
 
 def test_wavernn():
@@ -35,12 +37,16 @@ def test_wavernn():
     model = Wavernn(config)
     output = model(dummy_x, dummy_m)
     assert np.all(output.shape == (2, 1280, 30)), output.shape
+    output = model.inference(dummy_y, True, 5500, 550)
+    assert np.all(output.shape == (256 * (y_size - 1),))
 
     # mode: gauss
     config.model_args.mode = "gauss"
     model = Wavernn(config)
     output = model(dummy_x, dummy_m)
     assert np.all(output.shape == (2, 1280, 2)), output.shape
+    output = model.inference(dummy_y, False)
+    assert np.all(output.shape == (256 * (y_size - 1),))
 
     # mode: quantized
     config.model_args.mode = 4
@@ -49,3 +55,78 @@ def test_wavernn():
     assert np.all(output.shape == (2, 1280, 2**4)), output.shape
     output = model.inference(dummy_y, True, 5500, 550)
     assert np.all(output.shape == (256 * (y_size - 1),))
+    output = model.inference(dummy_y, True, 5500, 550, int8=True)
+    assert np.all(output.shape == (256 * (y_size - 1),))
+
+
+def eager_inference(model, mels, seed):
+    """Unbatched sampling loop with the layers of the model, one step at a time."""
+    rnn1 = model.get_gru_cell(model.rnn1)
+    rnn2 = model.get_gru_cell(model.rnn2)
+    # seed after the random init of the cells
+    torch.manual_seed(seed)
+    mels = model.pad_tensor(mels.unsqueeze(0).transpose(1, 2), pad=model.args.pad, side="both")
+    mels, aux = model.upsample(mels.transpose(1, 2))
+    d = model.aux_dims
+    a1, a2, a3, a4 = [aux[:, :, d * i : d * (i + 1)] for i in range(4)]
+    h1 = torch.zeros(1, model.args.rnn_dims)
+    h2 = torch.zeros(1, model.args.rnn_dims)
+    x = torch.zeros(1, 1)
+    output = []
+    for i in range(mels.size(1)):
+        x = model.I(torch.cat([x, mels[:, i], a1[:, i]], dim=1))
+        h1 = rnn1(x, h1)
+        x = x + h1
+        h2 = rnn2(torch.cat([x, a2[:, i]], dim=1), h2)
+        x = x + h2
+        x = F.relu(model.fc1(torch.cat([x, a3[:, i]], dim=1)))
+        x = F.relu(model.fc2(torch.cat([x, a4[:, i]], dim=1)))
+        logits = model.fc3(x)
+        if model.args.mode == "mold":
+            sample = sample_from_discretized_mix_logistic(logits.unsqueeze(0).transpose(1, 2)).view(-1)
+        elif model.args.mode == "gauss":
+            sample = sample_from_gaussian(logits.unsqueeze(1)).view(-1)
+        else:
+            sample = torch.distributions.Categorical(F.softmax(logits, dim=1)).sample().float()
+            sample = 2 * sample / (model.n_classes - 1.0) - 1.0
+        output.append(sample)
+        x = sample.view(1, 1)
+    return torch.cat(output)
+
+
+@torch.no_grad()
+def test_wavernn_sampler_parity():
+    config = WavernnConfig()
+    config.model_args = WavernnArgs(
+        rnn_dims=32,
+        fc_dims=32,
+        mulaw=False,
+        pad=2,
+        use_aux_net=True,
+        use_upsample_net=True,
+        upsample_factors=[2, 2, 2],
+        feat_dims=80,
+        compute_dims=16,
+        res_out_dims=16,
+        num_res_blocks=1,
+    )
+    config.audio.hop_length = 8
+    mels = torch.rand((80, 30))
+    for mode in ["mold", "gauss", 9]:
+        config.model_args.mode = mode
+        torch.manual_seed(1)
+        model = Wavernn(config).eval()
+        target = eager_inference(model, mels, seed=2)
+        torch.manual_seed(2)
+        output = model.inference(mels, batched=False)
+        # the inference output is cut to the length of the mels and faded out
+        fade_out = np.linspace(1, 0, 20 * config.audio.hop_length)
+        target = target[: len(output)].numpy()
+        target[-len(fade_out) :] *= fade_out
+        np.testing.assert_allclose(output, target, atol=1e-4)
+
+        # the compiled sampler is reused until new weights are loaded
+        sampler = model.get_sampler()
+        assert model.get_sampler() is sampler
+        model.load_state_dict(model.state_dict())
+        assert model.get_sampler() is not sampler
@@ -0,0 +1,77 @@
+import os
+import unittest
+
+import numpy as np
+import torch
+from transformers import LogitsProcessor, LogitsProcessorList
+
+from tests import get_tests_input_path
+from TTS.tts.configs.xtts_config import XttsConfig
+from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer
+from TTS.tts.models.xtts import Xtts, XttsArgs
+
+SENTENCES = ["Hello world.", "This is a somewhat longer sentence to synthesize.", "A short test sentence."]
+# number of audio tokens generated before the stop token of each sentence
+STOP_STEPS = [5, 12, 8]
+
+
+class ForceStop(LogitsProcessor):
+    """Force the stop token of each row at a fixed step and forbid it before, so that the sentences of the random
+    model stop after different numbers of steps whatever its weights."""
+
+    def __init__(self, stop_token, stop_steps):
+        self.stop_token = stop_token
+        self.stop_steps = torch.tensor(stop_steps)
+        self.prompt_len = None
+
+    def __call__(self, input_ids, scores):
+        if self.prompt_len is None:
+            self.prompt_len = input_ids.shape[1]
+        stop = (input_ids.shape[1] - self.prompt_len) >= self.stop_steps.to(scores.device)
+        scores[~stop, self.stop_token] = -float("inf")
+        scores[stop] = -float("inf")
+        scores[stop, self.stop_token] = 0.0
+        return scores
+
+
+class TestXttsBatchInference(unittest.TestCase):
+    @torch.inference_mode()
+    def test_inference_batch(self):
+        torch.manual_seed(1)
+        args = XttsArgs(
+            gpt_layers=1, gpt_n_model_channels=64, gpt_n_heads=2, gpt_max_audio_tokens=24, decoder_input_dim=64
+        )
+        model = Xtts(XttsConfig(model_args=args))
+        model.tokenizer = VoiceBpeTokenizer(os.path.join(get_tests_input_path(), "xtts_vocab.json"))
+        model.init_models()
+        model.gpt.init_gpt_for_inference()
+        model.gpt.eval()
+        model.hifigan_decoder.eval()
+        settings = {
+            "language": "en",
+            "gpt_cond_latent": torch.randn(1, 32, 64),
+            "speaker_embedding": torch.randn(1, 512, 1),
+            "do_sample": False,
+            "repetition_penalty": 1.0,
+        }
+        stop_token = model.gpt.stop_audio_token
+        targets = [
+            model.inference(
+                sentence, logits_processor=LogitsProcessorList([ForceStop(stop_token, [steps])]), **settings
+            )
+            for sentence, steps in zip(SENTENCES, STOP_STEPS)
+        ]
+        # the sentences stop at different steps
+        self.assertEqual(len({target["gpt_latents"].shape[1] for target in targets}), len(SENTENCES))
+
+        # the rows of the batch are the sentences sorted by their number of text tokens
+        lengths = [len(model.tokenizer.encode(sentence, lang="en")) for sentence in SENTENCES]
+        order = sorted(range(len(SENTENCES)), key=lambda idx: lengths[idx])
+        self.assertEqual(len(set(lengths)), len(SENTENCES))
+        settings["logits_processor"] = LogitsProcessorList([ForceStop(stop_token, [STOP_STEPS[idx] for idx in order])])
+        outputs = model.inference_batch(SENTENCES, **settings)
+        for target, wav, gpt_latents in zip(targets, outputs["wav"], outputs["gpt_latents"]):
+            np.testing.assert_allclose(gpt_latents, target["gpt_latents"], atol=1e-4)
+            self.assertEqual(wav.shape, target["wav"].shape)
+            # only the end of the shorter sentences sees the padding
+            np.testing.assert_allclose(wav[:-2048], target["wav"][:-2048], atol=1e-4)
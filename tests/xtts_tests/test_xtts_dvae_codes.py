@@ -0,0 +1,83 @@
+import os
+import shutil
+import unittest
+
+import torch
+
+from tests import get_tests_data_path, get_tests_input_path, get_tests_output_path
+from TTS.config.shared_configs import BaseDatasetConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.layers.xtts.dvae import DiscreteVAE
+from TTS.tts.layers.xtts.trainer.code_store import DVAECodeStore, extract_dvae_codes
+from TTS.tts.layers.xtts.trainer.dataset import XTTSDataset
+from TTS.tts.layers.xtts.trainer.gpt_trainer import GPTArgs, GPTTrainer, GPTTrainerConfig, XttsAudioConfig
+from TTS.tts.models.xtts import load_audio
+
+OUT_PATH = os.path.join(get_tests_output_path(), "xtts_dvae_codes")
+STORE_PATH = os.path.join(OUT_PATH, "codes")
+
+torch.manual_seed(1)
+
+
+class TestDVAECodeStore(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(OUT_PATH, exist_ok=True)
+        dvae_checkpoint = os.path.join(OUT_PATH, "dvae.pth")
+        mel_norm_file = os.path.join(OUT_PATH, "mel_stats.pth")
+        dvae = DiscreteVAE(
+            channels=80,
+            normalization=None,
+            positional_dims=1,
+            num_tokens=8192,
+            codebook_dim=512,
+            hidden_dim=512,
+            num_resnet_blocks=3,
+            kernel_size=3,
+            num_layers=2,
+            use_transposed_convs=False,
+        )
+        torch.save(dvae.state_dict(), dvae_checkpoint)
+        torch.save(torch.ones(80), mel_norm_file)
+        model_args = GPTArgs(
+            gpt_layers=1,
+            gpt_n_model_channels=64,
+            gpt_n_heads=2,
+            decoder_input_dim=64,
+            mel_norm_file=mel_norm_file,
+            dvae_checkpoint=dvae_checkpoint,
+            tokenizer_file=os.path.join(get_tests_input_path(), "xtts_vocab.json"),
+        )
+        self.config = GPTTrainerConfig(model_args=model_args, audio=XttsAudioConfig(dvae_sample_rate=22050))
+        self.model = GPTTrainer.init_from_config(self.config)
+        dataset_config = BaseDatasetConfig(
+            formatter="ljspeech",
+            meta_file_train="metadata.csv",
+            path=os.path.join(get_tests_data_path(), "ljspeech"),
+            language="en",
+        )
+        self.samples, _ = load_tts_samples(dataset_config, eval_split=False)
+        self.samples = self.samples[:4]
+
+    def tearDown(self):
+        shutil.rmtree(OUT_PATH, ignore_errors=True)
+
+    def test_code_store(self):
+        index = extract_dvae_codes(self.model, self.samples, STORE_PATH, shard_size=1024, verbose=False)
+        self.assertGreater(len(index["shards"]), 1)
+        store = DVAECodeStore(STORE_PATH)
+        for sample in self.samples:
+            wav = load_audio(sample["audio_file"], self.config.audio.sample_rate)
+            item = store.load(sample)
+            self.assertEqual(item["audio_length"], wav.shape[-1])
+            self.assertTrue(torch.equal(item["codes"], self.model.compute_dvae_codes(wav.unsqueeze(0))[0]))
+            self.assertEqual(item["text_tokens"].tolist(), self.model.xtts.tokenizer.encode(sample["text"], "en"))
+
+        dataset = XTTSDataset(
+            self.config, self.samples, self.model.xtts.tokenizer, 22050, is_eval=True, code_store=store
+        )
+        batch = dataset.collate_fn([dataset[0], dataset[1]])
+        self.assertNotIn("wav", batch)
+        self.assertEqual(batch["audio_codes"].shape[0], 2)
+        batch = self.model.format_batch_on_device(batch)
+        self.assertIn("audio_codes", batch)
+        self.assertIn("cond_mels", batch)
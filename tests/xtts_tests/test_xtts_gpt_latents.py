@@ -0,0 +1,43 @@
+import unittest
+
+import torch
+
+from TTS.tts.layers.xtts.gpt import GPT
+
+torch.manual_seed(1)
+
+
+class TestXttsGptLatents(unittest.TestCase):
+    @torch.inference_mode()
+    def test_generate_return_latent(self):
+        gpt = GPT(
+            layers=2,
+            model_dim=64,
+            heads=4,
+            start_text_token=255,
+            max_text_tokens=20,
+            max_mel_tokens=30,
+            max_prompt_tokens=8,
+        )
+        gpt.init_gpt_for_inference(kv_cache=True)
+        gpt.eval()
+        cond_latents = torch.randn(1, 8, 64)
+        text_tokens = torch.randint(1, 255, (1, 12))
+        codes, latents = gpt.generate(cond_latents, text_tokens, return_latent=True, do_sample=False)
+        self.assertIsNone(gpt.gpt_inference.latents)
+        self.assertEqual(latents.shape, (1, codes.shape[1], 64))
+        self.assertTrue(torch.equal(gpt.generate(cond_latents, text_tokens, do_sample=False), codes))
+
+        # same latents as a teacher forced pass over the generated codes
+        target = gpt(
+            text_tokens,
+            torch.tensor([text_tokens.shape[1]]),
+            codes,
+            torch.tensor([codes.shape[1] * gpt.code_stride_len]),
+            cond_latents=cond_latents,
+            return_latent=True,
+        )
+        torch.testing.assert_close(latents, target, atol=1e-4, rtol=1e-4)
+
+        with self.assertRaises(ValueError):
+            gpt.generate(cond_latents, text_tokens, return_latent=True, num_beams=2)
@@ -0,0 +1,45 @@
+import unittest
+
+import torch
+
+from TTS.tts.layers.xtts.gpt import GPT
+
+torch.manual_seed(1)
+
+
+class TestXttsGptPrefixCache(unittest.TestCase):
+    def _generate(self, gpt, cond_latents, text_tokens, prefix_cache_size, **kwargs):
+        gpt.prefix_cache_size = prefix_cache_size
+        torch.manual_seed(0)
+        return gpt.generate(cond_latents, text_tokens, return_latent=kwargs.get("num_beams", 1) == 1, **kwargs)
+
+    @torch.inference_mode()
+    def test_prefix_cache(self):
+        gpt = GPT(
+            layers=2,
+            model_dim=64,
+            heads=4,
+            start_text_token=255,
+            max_text_tokens=20,
+            max_mel_tokens=30,
+            max_prompt_tokens=8,
+        )
+        gpt.init_gpt_for_inference(kv_cache=True)
+        gpt.eval()
+        cond_latents = [torch.randn(1, 8, 64), torch.randn(1, 8, 64)]
+        text_tokens = torch.randint(1, 255, (1, 12))
+        for kwargs in [{"do_sample": False}, {"do_sample": True, "num_return_sequences": 2}, {"num_beams": 2}]:
+            for latents in cond_latents:
+                target = self._generate(gpt, latents, text_tokens, 0, **kwargs)
+                output = self._generate(gpt, latents, text_tokens, 1, **kwargs)
+                if isinstance(target, tuple):
+                    self.assertTrue(torch.equal(output[0], target[0]))
+                    torch.testing.assert_close(output[1], target[1], atol=1e-4, rtol=1e-4)
+                else:
+                    self.assertTrue(torch.equal(output, target))
+        self.assertEqual(len(gpt.prefix_cache), 1)
+
+        # a cache hit gives the same past key/values
+        past_key_values = gpt.get_prefix_key_values(cond_latents[1], batch_size=2)
+        self.assertEqual(past_key_values[0][0].shape, (2, 4, 8, 16))
+        self.assertIs(gpt.get_prefix_key_values(cond_latents[1].clone()), gpt.prefix_cache.popitem()[1])
@@ -0,0 +1,60 @@
+import os
+import shutil
+import unittest
+
+import torch
+
+from tests import get_tests_input_path, get_tests_output_path
+from TTS.tts.configs.xtts_config import XttsConfig
+from TTS.tts.layers.xtts.latent_cache import ConditioningLatentCache
+from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer
+from TTS.tts.models.xtts import Xtts, XttsArgs
+
+WAV_FILE = os.path.join(get_tests_input_path(), "example_1.wav")
+CACHE_DIR = os.path.join(get_tests_output_path(), "xtts_latent_cache")
+
+torch.manual_seed(1)
+
+
+class TestConditioningLatentCache(unittest.TestCase):
+    def tearDown(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def test_lru(self):
+        cache = ConditioningLatentCache(max_size=2)
+        keys = [cache.make_key(WAV_FILE, gpt_cond_len=length) for length in range(3)]
+        self.assertEqual(len(set(keys)), 3)
+        self.assertEqual(keys[0], cache.make_key(WAV_FILE, gpt_cond_len=0))
+        for key in keys:
+            cache.put(key, torch.randn(1, 32, 8), torch.randn(1, 512, 1))
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(cache.stats(), {"size": 2, "max_size": 2, "hits": 1, "misses": 1})
+
+    def test_persistence(self):
+        cache = ConditioningLatentCache(cache_dir=CACHE_DIR, namespace="model_a")
+        key = cache.make_key(WAV_FILE, gpt_cond_len=6)
+        gpt_cond_latent, speaker_embedding = torch.randn(1, 32, 8), torch.randn(1, 512, 1)
+        cache.put(key, gpt_cond_latent, speaker_embedding)
+        new_cache = ConditioningLatentCache(cache_dir=CACHE_DIR, namespace="model_a")
+        latents = new_cache.get(key)
+        torch.testing.assert_close(latents[0], gpt_cond_latent)
+        torch.testing.assert_close(latents[1], speaker_embedding)
+        other_cache = ConditioningLatentCache(cache_dir=CACHE_DIR, namespace="model_b")
+        self.assertIsNone(other_cache.get(other_cache.make_key(WAV_FILE, gpt_cond_len=6)))
+
+    @torch.inference_mode()
+    def test_xtts_cached_latents(self):
+        args = XttsArgs(gpt_layers=1, gpt_n_model_channels=64, gpt_n_heads=2, decoder_input_dim=64)
+        model = Xtts(XttsConfig(model_args=args, latent_cache_dir=CACHE_DIR))
+        model.tokenizer = VoiceBpeTokenizer(os.path.join(get_tests_input_path(), "xtts_vocab.json"))
+        model.init_models()
+        model.gpt.eval()
+        model.hifigan_decoder.eval()
+        target = model.get_conditioning_latents(WAV_FILE, gpt_cond_len=3, gpt_cond_chunk_len=3)
+        for _ in range(2):
+            latents = model.get_cached_conditioning_latents(WAV_FILE, gpt_cond_len=3, gpt_cond_chunk_len=3)
+            torch.testing.assert_close(latents[0], target[0])
+            torch.testing.assert_close(latents[1], target[1])
+        self.assertEqual(model.latent_cache.stats()["hits"], 1)
+        self.assertEqual(len(os.listdir(CACHE_DIR)), 1)
@@ -0,0 +1,40 @@
+import unittest
+
+import torch
+
+from TTS.tts.configs.xtts_config import XttsConfig
+from TTS.tts.models.xtts import Xtts, XttsArgs
+
+torch.manual_seed(1)
+
+
+class TestXttsStream(unittest.TestCase):
+    def _stream(self, model, latents, speaker_embedding, chunk_size, context_len, overlap_len=1024):
+        """Replicate the vocoder part of `Xtts.inference_stream()` on precomputed GPT latents."""
+        chunks = []
+        wav_gen_prev = None
+        wav_gen_prev_start = 0
+        wav_overlap = None
+        for end in list(range(chunk_size, latents.shape[1], chunk_size)) + [latents.shape[1]]:
+            if context_len is None:
+                wav_gen = model.hifigan_decoder(latents[:, :end], g=speaker_embedding)
+            else:
+                wav_gen, wav_gen_prev, wav_gen_prev_start = model.decode_stream_window(
+                    latents[:, :end], speaker_embedding, wav_gen_prev, wav_gen_prev_start, overlap_len, context_len
+                )
+            wav_chunk, wav_gen_prev, wav_overlap = model.handle_chunks(
+                wav_gen.squeeze(), wav_gen_prev, wav_overlap, overlap_len
+            )
+            chunks.append(wav_chunk)
+        return chunks
+
+    @torch.inference_mode()
+    def test_decode_stream_window(self):
+        model = Xtts(XttsConfig(model_args=XttsArgs(decoder_input_dim=64)))
+        model.hifigan_decoder.eval()
+        latents = torch.randn(1, 40, 64)
+        speaker_embedding = torch.randn(1, 512, 1)
+        target = self._stream(model, latents, speaker_embedding, chunk_size=8, context_len=None)
+        chunks = self._stream(model, latents, speaker_embedding, chunk_size=8, context_len=4)
+        self.assertEqual([len(chunk) for chunk in target], [len(chunk) for chunk in chunks])
+        torch.testing.assert_close(torch.cat(target), torch.cat(chunks), atol=1e-5, rtol=1e-5)